@@ -0,0 +1,164 @@
+import math
+import random
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from models.chromosome import Chromosome
+from models.resources import Room, Professor, Subject, Section
+from algorithm.genetic import GeneticAlgorithm
+from algorithm.local_search import MOVES, LocalSearch, Neighbourhood, apply_move
+
+SEARCH_METHODS = ('annealing', 'tabu')
+COOLING_SCHEDULES = ('geometric', 'linear', 'lundy_mees')
+
+# Iterations of annealing between two searches for the genes in conflict
+HOT_REFRESH_INTERVAL = 200
+
+# Moves sampled to estimate the initial temperature, and the share of worsening moves it accepts
+TEMPERATURE_SAMPLES = 200
+INITIAL_ACCEPTANCE = 0.5
+
+
+class AnnealingSolver:
+    """
+    Improves a single schedule instead of a population, by simulated annealing or by tabu
+    search (see LocalSearch). It takes the same problem as GeneticAlgorithm, whose lookup
+    tables, construction and repair it shares, and scores moves by delta evaluation.
+
+    The annealing temperature falls from `initial_temperature` to `final_temperature` over
+    `iterations` iterations along the cooling schedule:
+      'geometric'   T0 * (Tf / T0) ** (k / n)
+      'linear'      T0 - (T0 - Tf) * k / n
+      'lundy_mees'  T / (1 + beta * T) at every iteration
+    Without an initial temperature, one accepting about half of the worsening moves is estimated.
+    """
+
+    def __init__(self,
+                 sections: List[Section],
+                 subjects: List[Subject],
+                 professors: List[Professor],
+                 rooms: List[Room],
+                 method: str = 'annealing',  # 'annealing' or 'tabu'
+                 iterations: int = 20000,
+                 cooling: str = 'geometric',  # 'geometric', 'linear' or 'lundy_mees'
+                 initial_temperature: Optional[float] = None,  # Estimated from the first schedule by default
+                 final_temperature: float = 1.0,
+                 moves: Sequence[str] = MOVES,  # Neighbourhood moves to draw from
+                 neighbourhood_size: int = 20,  # Moves compared per tabu search iteration
+                 tabu_tenure: int = 10,
+                 time_limit: Optional[float] = None,  # Seconds; makes results depend on machine speed
+                 seed: Optional[int] = None,
+                 rng: Optional[random.Random] = None):
+        if method not in SEARCH_METHODS:
+            raise ValueError(f"Unknown search method '{method}', expected one of {SEARCH_METHODS}")
+        if cooling not in COOLING_SCHEDULES:
+            raise ValueError(f"Unknown cooling schedule '{cooling}', expected one of {COOLING_SCHEDULES}")
+        if iterations < 1:
+            raise ValueError(f"iterations must be at least 1, got {iterations}")
+        if final_temperature <= 0:
+            raise ValueError(f"final_temperature must be positive, got {final_temperature}")
+        if initial_temperature is not None and initial_temperature <= 0:
+            raise ValueError(f"initial_temperature must be positive, got {initial_temperature}")
+
+        self.method = method
+        self.iterations = iterations
+        self.cooling = cooling
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.moves = moves
+        self.time_limit = time_limit
+
+        # The problem model: lookup tables, construction and repair, and the random generator
+        self.algorithm = GeneticAlgorithm(sections, subjects, professors, rooms,
+                                          population_size=1, elite_size=0, seed=seed, rng=rng)
+        self.tabu_search = LocalSearch(self.algorithm, iterations, time_limit,
+                                       tabu_tenure, neighbourhood_size, moves)
+
+    def evolve(self, initial: Optional[Chromosome] = None) -> Tuple[Chromosome, List[float]]:
+        """
+        Searches from `initial`, or from a constructed and repaired schedule, and returns
+        the best schedule found with the best fitness after every iteration
+        """
+        if initial is None:
+            print("Constructing initial schedule...")
+            initial = self.algorithm.create_candidate(intelligent=True)
+        initial.calculate_fitness(None)
+        print(f"Initial fitness: {initial.fitness:.4f}")
+
+        history = []
+        if self.method == 'tabu':
+            best = self.tabu_search.improve(initial, history)
+        else:
+            best = self._anneal(initial, history)
+
+        print(f"Search finished after {len(history)} iterations")
+        print(f"Final fitness: {best.fitness:.4f}")
+        return best, history
+
+    def _anneal(self, initial: Chromosome, history: List[float]) -> Chromosome:
+        rng = self.algorithm.rng
+        current = initial.clone()
+        penalty = current.calculate_fitness(None)[1]
+        best, best_penalty = current.clone(), penalty
+        best.calculate_fitness(None)
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        neighbourhood = Neighbourhood(self.algorithm, current, self.moves)
+
+        final_temperature = self.final_temperature
+        initial_temperature = self.initial_temperature
+        if initial_temperature is None:
+            neighbourhood.refresh()
+            initial_temperature = self._estimate_temperature(current, neighbourhood)
+        initial_temperature = max(initial_temperature, final_temperature)
+        temperature = initial_temperature
+        steps = max(1, self.iterations - 1)
+        if self.cooling == 'lundy_mees':
+            # Reaches the final temperature after `steps` iterations
+            beta = (initial_temperature - final_temperature) / (steps * initial_temperature * final_temperature)
+
+        for iteration in range(self.iterations):
+            if best_penalty == 0 or (deadline is not None and time.perf_counter() > deadline):
+                break
+            if iteration % HOT_REFRESH_INTERVAL == 0:
+                neighbourhood.refresh()
+
+            moves = neighbourhood.random_move()
+            if moves:
+                delta = current.penalty_delta(moves)
+                if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                    apply_move(current, moves)
+                    penalty += delta
+                    if penalty < best_penalty:
+                        best, best_penalty = current.clone(), penalty
+                        best.calculate_fitness(None)
+            history.append(best.fitness)
+
+            if iteration % 1000 == 0:
+                print(f"Iteration {iteration}: Best={best.fitness:.4f}, "
+                      f"Current={1000.0 / (1000.0 + penalty):.4f}, Temperature={temperature:.2f}")
+
+            # Cool down for the next iteration
+            progress = (iteration + 1) / steps
+            if self.cooling == 'geometric':
+                temperature = initial_temperature * (final_temperature / initial_temperature) ** progress
+            elif self.cooling == 'linear':
+                temperature = initial_temperature - (initial_temperature - final_temperature) * progress
+            else:
+                temperature = temperature / (1 + beta * temperature)
+            temperature = max(temperature, final_temperature)
+
+        return best
+
+    @staticmethod
+    def _estimate_temperature(chromosome: Chromosome, neighbourhood: Neighbourhood) -> float:
+        """Temperature at which the average worsening move is accepted with INITIAL_ACCEPTANCE"""
+        worsening = []
+        for _ in range(TEMPERATURE_SAMPLES):
+            moves = neighbourhood.random_move()
+            if moves:
+                delta = chromosome.penalty_delta(moves)
+                if delta > 0:
+                    worsening.append(delta)
+        if not worsening:
+            return 1.0
+        return -(sum(worsening) / len(worsening)) / math.log(INITIAL_ACCEPTANCE)
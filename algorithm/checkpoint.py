@@ -0,0 +1,54 @@
+import os
+import pickle
+import tempfile
+import zlib
+from typing import Any, Dict
+
+from models.encoding import ProblemEncoding
+
+# File header: magic bytes followed by the format version
+MAGIC = b'GSCHK'
+VERSION = 1
+
+
+def problem_signature(encoding: ProblemEncoding) -> tuple:
+    """Identifies a problem instance, so a checkpoint is only resumed on the same data"""
+    return (tuple(encoding.section_ids), tuple(encoding.subject_ids),
+            tuple(encoding.professor_ids), tuple(encoding.room_ids))
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """
+    Writes the evolution state as a zlib-compressed pickle. The file is written next to
+    its destination and moved into place, so an interrupted write never leaves a
+    truncated checkpoint behind.
+    """
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix='.checkpoint-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC + bytes([VERSION]))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Reads a checkpoint written by save_checkpoint(); raises ValueError if it is not one or is corrupt"""
+    with open(path, 'rb') as f:
+        header = f.read(len(MAGIC) + 1)
+        if len(header) < len(MAGIC) + 1 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a checkpoint file")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"Unsupported checkpoint version {header[len(MAGIC)]} in {path}")
+        payload = f.read()
+    try:
+        return pickle.loads(zlib.decompress(payload))
+    except (zlib.error, pickle.UnpicklingError, EOFError) as e:
+        raise ValueError(f"Corrupt checkpoint {path}: {e}") from e
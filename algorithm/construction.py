@@ -0,0 +1,269 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from models.chromosome import Chromosome
+from models.gene import Gene, PROFESSORS, ROOMS
+from models.resources import Day, SessionTemplate
+from algorithm.repair import slot_mask
+
+DAYS = list(Day)
+WED_SAT = (Day.WEDNESDAY.value, Day.SATURDAY.value)
+
+# Memoized free-start bitsets are dropped beyond this many entries
+FREE_STARTS_CACHE_SIZE = 100000
+
+# Penalties used to order the candidate days of a session (see models.constraints)
+WED_SAT_PENALTY = 40
+CONSECUTIVE_DAY_PENALTY = 50
+TBA_OVERLAP_PENALTY = 100
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+class _Session:
+    """A session still to be placed, with the resources it needs"""
+
+    __slots__ = ('index', 'section_id', 'subject_id', 'template', 'professor', 'professor_id',
+                 'rooms', 'starts', 'masks', 'bottleneck', 'domains', 'size', 'placement')
+
+    def __init__(self, index: int, section_id: str, subject_id: str, template: SessionTemplate,
+                 professor_id: str, rooms: Tuple[int, ...], starts: Tuple[float, ...], bottleneck: bool):
+        self.index = index
+        self.section_id = section_id
+        self.subject_id = subject_id
+        self.template = template
+        self.professor_id = professor_id
+        self.professor = PROFESSORS.intern(professor_id)
+        self.rooms = rooms                # Candidate room handles, (0,) when no room is needed
+        self.starts = starts              # Valid start times; bit i of a domain is starts[i]
+        self.masks = tuple(slot_mask(start, template.duration_hours) for start in starts)
+        self.bottleneck = bottleneck
+        self.domains = [0] * len(DAYS)    # Bitset of the free start times on each day
+        self.size = 0                     # Number of free (day, start time) pairs
+        self.placement: Optional[Tuple[Day, float, int]] = None
+
+
+class ConstructionEngine:
+    """
+    Builds chromosomes by constraint propagation. The free start times of every session on every
+    day are kept as bitsets over its valid start times, intersected from the busy slots of its
+    section, professor and candidate rooms. The session with the fewest free (day, start time)
+    pairs is placed first (bottleneck subjects win ties), and placing it immediately shrinks the
+    domains of the sessions sharing its section or professor.
+    """
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        # (busy slots, start masks) -> bitset of the start times that are free
+        self._free_starts: Dict[Tuple[int, tuple], int] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        """Empties the busy slots and placements of the previous build (days are Day values)"""
+        self.sections: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.professors: Dict[Tuple[int, int], int] = defaultdict(int)
+        self.rooms: Dict[Tuple[int, int], int] = defaultdict(int)
+        self.subject_days: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self.subject_rooms: Dict[tuple, int] = {}
+        self.room_load: Dict[int, int] = defaultdict(int)
+        if len(self._free_starts) > FREE_STARTS_CACHE_SIZE:
+            self._free_starts.clear()
+
+    def build(self) -> Chromosome:
+        algorithm = self.algorithm
+        rng = algorithm.rng
+        sessions = self._plan_sessions()
+        self._reset()
+
+        by_section = defaultdict(list)
+        by_professor = defaultdict(list)
+        for session in sessions:
+            by_section[session.section_id].append(session)
+            if session.professor_id != "TBA":
+                by_professor[session.professor].append(session)
+
+        heap = []
+        for session in sessions:
+            self._refresh(session)
+            heapq.heappush(heap, self._heap_entry(session, rng))
+
+        while heap:
+            size, _, _, index = heapq.heappop(heap)
+            session = sessions[index]
+            if session.placement is not None or size != session.size:
+                continue  # Stale entry
+            # Room bookings are not propagated eagerly, so re-check before committing to a session
+            self._refresh(session)
+            if session.size != size:
+                heapq.heappush(heap, self._heap_entry(session, rng))
+                continue
+
+            day = self._place(session, rng)
+
+            # Propagate to the unplaced sessions sharing the section or professor; only the
+            # domain on the day just booked can have changed
+            neighbours = by_section[session.section_id]
+            if session.professor_id != "TBA":
+                neighbours = neighbours + by_professor[session.professor]
+            for other in neighbours:
+                if other.placement is None:
+                    domain = self._day_domain(other, day)
+                    if domain != other.domains[day]:
+                        other.size += _popcount(domain) - _popcount(other.domains[day])
+                        other.domains[day] = domain
+                        heapq.heappush(heap, self._heap_entry(other, rng))
+
+        genes = []
+        for session in sessions:
+            day, start_time, room = session.placement
+            genes.append(Gene(
+                section_id=session.section_id,
+                subject_id=session.subject_id,
+                session_number=session.template.session_number,
+                session_type=session.template.session_type,
+                professor_id=session.professor_id,
+                room_id=ROOMS.ids[room],
+                day=day,
+                start_time=start_time,
+                duration=session.template.duration_hours
+            ))
+        return Chromosome(genes, self.algorithm.active_constraints)
+
+    def _plan_sessions(self) -> List[_Session]:
+        """
+        Lists the required sessions in section, subject and session order and assigns a professor
+        to every (section, subject), least planned hours first with ties broken at random
+        """
+        algorithm = self.algorithm
+        rng = algorithm.rng
+        bottlenecks = set(algorithm.bottleneck_subjects)
+        planned_hours = defaultdict(float)
+
+        required = []
+        for section in algorithm.sections:
+            for subject_id in section.subjects:
+                required.append((section, algorithm.subject_dict[subject_id]))
+
+        # Bottleneck subjects pick their professors first
+        professors = {}
+        for section, subject in sorted(required, key=lambda item: item[1].id not in bottlenecks):
+            qualified = list(algorithm._get_qualified_professors(subject.id, section.id))
+            if not qualified:
+                professors[(section.id, subject.id)] = "TBA"
+                continue
+            rng.shuffle(qualified)
+            professor = min(qualified, key=lambda p: planned_hours[p.id])
+            planned_hours[professor.id] += sum(session.duration_hours for session in subject.sessions)
+            professors[(section.id, subject.id)] = professor.id
+
+        sessions = []
+        for section, subject in required:
+            for template in subject.sessions:
+                rooms = (0,)
+                if subject.requires_room:
+                    course_rooms = algorithm.suitable_room_handles(template.session_type, section.course)
+                    if course_rooms:
+                        rooms = course_rooms
+                duration = template.duration_hours
+                starts = algorithm.valid_start_times.get(duration) or tuple(algorithm._scan_valid_start_times(duration))
+                sessions.append(_Session(len(sessions), section.id, subject.id, template,
+                                         professors[(section.id, subject.id)], rooms, starts,
+                                         subject.id in bottlenecks))
+        return sessions
+
+    @staticmethod
+    def _heap_entry(session: _Session, rng) -> tuple:
+        return session.size, not session.bottleneck, rng.random(), session.index
+
+    def _free(self, busy: int, masks: tuple) -> int:
+        """Bitset of the start times whose slots do not intersect `busy`"""
+        key = (busy, masks)
+        free = self._free_starts.get(key)
+        if free is None:
+            free = 0
+            for bit, mask in enumerate(masks):
+                if not busy & mask:
+                    free |= 1 << bit
+            self._free_starts[key] = free
+        return free
+
+    def _day_domain(self, session: _Session, day: int) -> int:
+        """Bitset of the start times on `day` where the session fits"""
+        if day in self.subject_days[(session.section_id, session.subject_id)]:
+            return 0  # Same subject twice on one day
+        masks = session.masks
+        domain = self._free(self.sections[(session.section_id, day)], masks)
+        if domain and session.professor_id != "TBA":
+            domain &= self._free(self.professors[(session.professor, day)], masks)
+        if domain and session.rooms[0]:
+            in_some_room = 0
+            for room in session.rooms:
+                in_some_room |= self._free(self.rooms[(room, day)], masks)
+            domain &= in_some_room
+        return domain
+
+    def _refresh(self, session: _Session) -> None:
+        """Recomputes the domains of a session on every day"""
+        session.domains = [self._day_domain(session, day) for day in range(len(DAYS))]
+        session.size = sum(_popcount(domain) for domain in session.domains)
+
+    def _place(self, session: _Session, rng) -> int:
+        """
+        Picks a free (day, start time, room) for the session, preferring soft-feasible days,
+        books it and returns the day
+        """
+        siblings = self.subject_days[(session.section_id, session.subject_id)]
+        tba = session.professor_id == "TBA"
+        candidates = []
+        for day, domain in enumerate(session.domains):
+            if domain:
+                penalty = WED_SAT_PENALTY if day in WED_SAT else 0
+                if tba:
+                    # Sessions without a professor all count as the same professor in the fitness,
+                    # so keep them apart where the day allows it
+                    apart = domain & self._free(self.professors[(session.professor, day)], session.masks)
+                    if apart:
+                        domain = apart
+                    else:
+                        penalty += TBA_OVERLAP_PENALTY
+                if any(abs(day - sibling) == 1 for sibling in siblings):
+                    penalty += CONSECUTIVE_DAY_PENALTY
+                candidates.append((penalty, day, domain))
+
+        if candidates:
+            best = min(penalty for penalty, _, _ in candidates)
+            _, day, domain = rng.choice([c for c in candidates if c[0] == best])
+            bits = [bit for bit in range(len(session.starts)) if domain >> bit & 1]
+            bit = rng.choice(bits)
+            start_time, mask = session.starts[bit], session.masks[bit]
+            room = self._pick_room(session, day, mask, rng)
+        else:
+            # No conflict-free slot is left; leave the conflict to the repair engine
+            day = rng.randrange(len(DAYS))
+            start_time = self.algorithm._find_valid_start_time(session.template.duration_hours)
+            mask = slot_mask(start_time, session.template.duration_hours)
+            room = rng.choice(session.rooms)
+
+        session.placement = (DAYS[day], start_time, room)
+        self.sections[(session.section_id, day)] |= mask
+        self.professors[(session.professor, day)] |= mask
+        if room:
+            self.rooms[(room, day)] |= mask
+            self.room_load[room] += 1
+            self.subject_rooms[(session.section_id, session.subject_id, session.template.session_type)] = room
+        siblings.append(day)
+        return day
+
+    def _pick_room(self, session: _Session, day: int, mask: int, rng) -> int:
+        """The room of the subject's other sessions of this type if free, else the least used free room"""
+        if not session.rooms[0]:
+            return 0
+        free = [room for room in session.rooms if not self.rooms[(room, day)] & mask]
+        previous = self.subject_rooms.get((session.section_id, session.subject_id, session.template.session_type))
+        if previous in free:
+            return previous
+        least = min(self.room_load[room] for room in free)
+        return rng.choice([room for room in free if self.room_load[room] == least])
@@ -1,12 +1,22 @@
 import random
-import copy
-from typing import List, Tuple, Dict, Set, Optional
-from collections import defaultdict
+from typing import List, Tuple, Dict, Set, Optional, Mapping, Iterator
+from collections import defaultdict, OrderedDict, deque
 import math
 
-from models.gene import Gene
+from models.gene import Gene, ROOMS, register_resources
+from models import constraints
 from models.chromosome import Chromosome
+from models.encoding import ProblemEncoding
 from models.resources import Day, SessionType, Room, Professor, Subject, Section, SessionTemplate
+from algorithm.parallel import ParallelEvaluator, OffspringBreeder, CandidateBuilder
+from algorithm.repair import RepairEngine
+from algorithm.construction import ConstructionEngine
+from algorithm.local_search import LocalSearch
+from algorithm.checkpoint import save_checkpoint, load_checkpoint, problem_signature
+from algorithm.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+
+
+DIVERSITY_METHODS = ('exact', 'sampled', 'frequency')
 
 
 class GeneticAlgorithm:
@@ -21,7 +31,27 @@ class GeneticAlgorithm:
                  crossover_rate: float = 0.8,
                  elite_size: int = 20,
                  diversity_threshold: float = 0.01,
-                 stagnation_limit: int = 500):  # Reduced stagnation limit
+                 stagnation_limit: int = 500,  # Reduced stagnation limit
+                 fitness_cache_size: int = 4096,
+                 workers: int = 1,  # Worker processes used for fitness evaluation
+                 vectorized_evaluation: bool = False,  # Score never-evaluated chromosomes in NumPy batches
+                 parallel_offspring: bool = False,  # Also build offspring in the worker processes
+                 offspring_batch_size: int = 10,
+                 parallel_initialization: bool = False,  # Build new chromosomes in the worker processes
+                 prewarm_size: Optional[int] = None,  # Fresh chromosomes kept ready for restarts (default: half the population)
+                 diversity_method: str = 'frequency',  # 'exact', 'sampled' or 'frequency'
+                 diversity_interval: int = 1,  # Re-estimate diversity every this many generations
+                 diversity_samples: int = 256,  # Maximum pairs compared by the 'sampled' method
+                 diversity_confidence: float = 0.01,  # Stop sampling once the 95% interval is this narrow
+                 checkpoint_path: Optional[str] = None,  # Save the evolution state to this file
+                 checkpoint_interval: int = 100,  # Generations between checkpoints
+                 local_search_elites: int = 0,  # Elite chromosomes improved by tabu search each generation
+                 local_search_iterations: int = 100,  # Moves applied per improved chromosome
+                 local_search_time: Optional[float] = None,  # Seconds per improved chromosome (machine dependent)
+                 constraint_weights: Optional[Dict[str, int]] = None,  # Weight per constraint name, 0 disables it
+                 instrumentation: Optional[Instrumentation] = None,  # e.g. PhaseRecorder() to time phases
+                 seed: Optional[int] = None,  # Seed of the random generator; same seed, same schedule
+                 rng: Optional[random.Random] = None):  # Or a generator to draw from instead
 
         self.sections = sections
         self.subjects = subjects
@@ -45,12 +75,65 @@ class GeneticAlgorithm:
 
 
         # Population diversity tracking
+        if diversity_method not in DIVERSITY_METHODS:
+            raise ValueError(f"Unknown diversity method '{diversity_method}', expected one of {DIVERSITY_METHODS}")
+        self.diversity_method = diversity_method
+        self.diversity_interval = max(1, diversity_interval)
+        self.diversity_samples = diversity_samples
+        self.diversity_confidence = diversity_confidence
         self.diversity_history = []
         self.fitness_plateau_count = 0
 
         # Multi-objective tracking
         self.pareto_front = []
 
+        # LRU cache of (genes, (fitness, penalty)) keyed on the content digest of the genes
+        self.fitness_cache_size = fitness_cache_size
+        self.fitness_cache: OrderedDict = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Batched NumPy scoring of chromosomes without fitness counters (optional dependency)
+        self.vectorized_evaluation = vectorized_evaluation
+
+        # Parallel evaluation (started on first use when workers > 1)
+        self.workers = workers
+        self.encoding = ProblemEncoding(sections, subjects, professors, rooms)
+        self._evaluator: Optional[ParallelEvaluator] = None
+        self.parallel_offspring = parallel_offspring
+        self.offspring_batch_size = offspring_batch_size
+        self._breeder: Optional[OffspringBreeder] = None
+
+        # Fresh chromosomes for initialization, restarts and diversity injection. Each is built
+        # from its own seed, in the background when parallel_initialization is on.
+        self.parallel_initialization = parallel_initialization
+        self.prewarm_size = population_size // 2 if prewarm_size is None else prewarm_size
+        self._builder: Optional[CandidateBuilder] = None
+        # intelligent? -> queue of [seed, pending build or None]
+        self._fresh_candidates: Dict[bool, deque] = {True: deque(), False: deque()}
+
+        # Periodic checkpoints of the evolution state (see evolve(resume_from=...))
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = max(1, checkpoint_interval)
+
+        # Every random decision is drawn from self.rng
+        self.reseed(seed, rng)
+
+        # Per-phase timing and counters; the default records nothing
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+
+        # Intern resource IDs so genes can refer to them by integer handle
+        register_resources(sections, subjects, professors, rooms)
+
+        # Fitness constraints of this algorithm (see models.constraints). Other algorithms in the
+        # process keep their own weights; chromosomes built here carry these constraints.
+        self.active_constraints = constraints.compile_constraints(constraint_weights)
+        if vectorized_evaluation:
+            from models.vectorized import VECTORIZED_CONSTRAINTS
+            missing = set(self.active_constraints.weights) - set(VECTORIZED_CONSTRAINTS)
+            if missing:
+                raise ValueError(f"Constraints {sorted(missing)} have no vectorized evaluation")
+
         # Create lookup dictionaries
         self.subject_dict = {s.id: s for s in subjects}
         self.professor_dict = {p.id: p for p in professors}
@@ -60,9 +143,70 @@ class GeneticAlgorithm:
         # Available time slots
         self.time_slots = self._generate_time_slots()
 
+        # Lookup tables resolved once: qualified professors per (subject, course),
+        # suitable rooms per (session type, course) and valid start times per duration.
+        # Read-only; plain dicts so that worker processes can be sent a pickled copy.
+        self.qualified_professors = self._build_qualified_professors()
+        self.suitable_rooms = self._build_suitable_rooms()
+        self.valid_start_times = self._build_valid_start_times()
+        # Interned handles of the suitable rooms, resolved on first use in each process
+        self._suitable_room_handles: Dict[Tuple[SessionType, str], Tuple[int, ...]] = {}
+
+        # Single-pass repair of hard constraints over a shared occupancy grid
+        self.repair_engine = RepairEngine(self)
+
+        # Constraint-propagation construction of near-feasible chromosomes
+        self.construction_engine = ConstructionEngine(self)
+
+        # Memetic step: tabu search on the best chromosomes of every generation
+        self.local_search_elites = local_search_elites
+        self.local_search = LocalSearch(self, local_search_iterations, local_search_time)
+
         # Analyze scheduling constraints
         self._analyze_constraints()
 
+    def __getstate__(self):
+        # Worker pools can not be pickled; a copy of the algorithm starts its own on demand
+        state = self.__dict__.copy()
+        state['_evaluator'] = None
+        state['_breeder'] = None
+        state['_builder'] = None
+        state['_fresh_candidates'] = {True: deque(), False: deque()}
+        state['fitness_cache'] = OrderedDict()
+        # Room handles are only meaningful in this process; a copy elsewhere resolves its own
+        state['_suitable_room_handles'] = {}
+        # Copies in worker processes do not report to the recorder of this process
+        state['instrumentation'] = NULL_INSTRUMENTATION
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # A copy in a new process (spawn, forkserver) interns the problem's IDs up front as here
+        register_resources(self.sections, self.subjects, self.professors, self.rooms)
+
+    def reseed(self, seed: Optional[int] = None, rng: Optional[random.Random] = None) -> None:
+        """Draw all further random decisions from `rng`, or from a new generator seeded with `seed`"""
+        self.rng = rng if rng is not None else random.Random(seed)
+        # Pair sampling has its own substream so the choice of diversity method does not change the evolution
+        self._diversity_rng = random.Random(self.rng.getrandbits(64))
+
+    def close(self) -> None:
+        """Shut down worker processes started for parallel evaluation, breeding or initialization"""
+        self.instrumentation.finish()
+        if self._evaluator is not None:
+            self._evaluator.close()
+            self._evaluator = None
+        if self._breeder is not None:
+            self._breeder.close()
+            self._breeder = None
+        if self._builder is not None:
+            self._builder.close()
+            self._builder = None
+            # Background builds died with the workers; they are rebuilt from their seeds on demand
+            for queue in self._fresh_candidates.values():
+                for entry in queue:
+                    entry[1] = None
+
     def _generate_time_slots(self) -> List[float]:
         """Generate available time slots"""
         slots = []
@@ -76,6 +220,29 @@ class GeneticAlgorithm:
 
         return slots
 
+    def _build_qualified_professors(self) -> Mapping[Tuple[str, str], Tuple[Professor, ...]]:
+        """Index qualified professors by (subject, course), keeping professor order"""
+        table = defaultdict(list)
+        for prof in self.professors:
+            for subject_id in set(prof.subjects):
+                for course in set(prof.course):
+                    table[(subject_id, course)].append(prof)
+        return {key: tuple(profs) for key, profs in table.items()}
+
+    def _build_suitable_rooms(self) -> Mapping[Tuple[SessionType, str], Tuple[Room, ...]]:
+        """Index suitable rooms by (session type, course) for every course that has sections"""
+        courses = {section.course for section in self.sections}
+        return {
+            (session_type, course): tuple(self._scan_suitable_rooms(session_type, course))
+            for session_type in SessionType
+            for course in courses
+        }
+
+    def _build_valid_start_times(self) -> Mapping[float, Tuple[float, ...]]:
+        """Start times avoiding the lunch break and ending by 21:00, for every session duration"""
+        durations = {session.duration_hours for subject in self.subjects for session in subject.sessions}
+        return {duration: tuple(self._scan_valid_start_times(duration)) for duration in durations}
+
     def _analyze_constraints(self):
         """Analyze scheduling constraints and bottlenecks"""
         print("\n=== CONSTRAINT ANALYSIS ===")
@@ -147,10 +314,17 @@ class GeneticAlgorithm:
         self.professor_workload = professor_required_hours
 
     def _calculate_population_diversity(self, population: List[Chromosome]) -> float:
-        """Calculate population diversity using hamming distance"""
+        """Calculate population diversity as the mean hamming distance over all pairs"""
         if len(population) < 2:
             return 0.0
-
+        if self.diversity_method == 'sampled':
+            return self._sampled_diversity(population)
+        if self.diversity_method == 'frequency':
+            return self._frequency_diversity(population)
+        return self._exact_diversity(population)
+
+    def _exact_diversity(self, population: List[Chromosome]) -> float:
+        """Compare every pair of chromosomes, O(P^2 * G)"""
         total_distance = 0
         comparisons = 0
 
@@ -162,6 +336,77 @@ class GeneticAlgorithm:
 
         return total_distance / comparisons if comparisons > 0 else 0.0
 
+    def _sampled_diversity(self, population: List[Chromosome]) -> float:
+        """
+        Estimate the mean distance from random pairs, sampling in batches until the 95%
+        confidence interval is narrower than diversity_confidence or diversity_samples is reached
+        """
+        size = len(population)
+        max_samples = min(self.diversity_samples, size * (size - 1) // 2)
+        rng = self._diversity_rng
+        total = total_squares = 0.0
+        samples = 0
+        while samples < max_samples:
+            for _ in range(min(32, max_samples - samples)):
+                i, j = rng.sample(range(size), 2)
+                distance = self._chromosome_distance(population[i], population[j])
+                total += distance
+                total_squares += distance * distance
+                samples += 1
+            mean = total / samples
+            variance = max(0.0, total_squares / samples - mean * mean)
+            if 1.96 * math.sqrt(variance / samples) < self.diversity_confidence:
+                break
+        return total / samples
+
+    def _frequency_diversity(self, population: List[Chromosome]) -> float:
+        """
+        Same value as the exact method in O(P * G): at every gene position, count the pairs of
+        chromosomes whose genes match (same professor, room and day, start times at most 0.5h
+        apart) from the allele counts instead of comparing the pairs one by one
+        """
+        size = len(population)
+        pairs = size * (size - 1) // 2
+
+        # Chromosomes of different lengths are at distance 1.0 from each other
+        by_length = defaultdict(list)
+        for chromosome in population:
+            by_length[len(chromosome.genes)].append(chromosome)
+
+        total_distance = float(pairs)
+        for length, group in by_length.items():
+            group_pairs = len(group) * (len(group) - 1) // 2
+            if not group_pairs:
+                continue
+            if not length:
+                total_distance -= group_pairs  # Chromosomes without genes are identical
+                continue
+            matching = 0
+            for position in range(length):
+                alleles = defaultdict(list)
+                for chromosome in group:
+                    gene = chromosome.genes[position]
+                    alleles[(gene.professor, gene.room, gene.day)].append(gene.start_time)
+                for start_times in alleles.values():
+                    if len(start_times) > 1:
+                        matching += self._count_close_pairs(start_times)
+            # Each pair contributes its share of differing genes instead of a full 1.0
+            total_distance -= group_pairs - (group_pairs * length - matching) / length
+
+        return total_distance / pairs
+
+    @staticmethod
+    def _count_close_pairs(start_times: List[float]) -> int:
+        """Number of pairs of start times at most half an hour apart"""
+        start_times.sort()
+        count = 0
+        first = 0
+        for last, start_time in enumerate(start_times):
+            while start_time - start_times[first] > 0.5:
+                first += 1
+            count += last - first
+        return count
+
     def _chromosome_distance(self, chrom1: Chromosome, chrom2: Chromosome) -> float:
         """Calculate normalized hamming distance between two chromosomes"""
         if len(chrom1.genes) != len(chrom2.genes):
@@ -171,8 +416,8 @@ class GeneticAlgorithm:
         total_genes = len(chrom1.genes)
 
         for g1, g2 in zip(chrom1.genes, chrom2.genes):
-            if (g1.professor_id != g2.professor_id or
-                    g1.room_id != g2.room_id or
+            if (g1.professor != g2.professor or
+                    g1.room != g2.room or
                     g1.day != g2.day or
                     abs(g1.start_time - g2.start_time) > 0.5):
                 differences += 1
@@ -194,15 +439,11 @@ class GeneticAlgorithm:
 
         # Add new random chromosomes
         for _ in range(replace_count):
-            if random.random() < 0.5:
-                new_chromosome = self.create_intelligent_chromosome()
-            else:
-                new_chromosome = self.create_random_chromosome()
-            new_population.append(new_chromosome)
+            new_population.append(self._take_fresh(self.rng.random() < 0.5))
 
         # Add some heavily mutated versions of good chromosomes
         for i in range(min(5, len(population) // 4)):
-            mutated = copy.deepcopy(population[i])
+            mutated = population[i].clone()
             # Apply heavy mutation
             old_mutation_rate = self.mutation_rate
             self.mutation_rate = 0.8  # High mutation rate
@@ -215,8 +456,11 @@ class GeneticAlgorithm:
 
     def _adaptive_parameters(self, generation: int, population: List[Chromosome]):
         """Adapt parameters based on generation and population state"""
-        # Adaptive mutation rate
-        diversity = self._calculate_population_diversity(population)
+        # Adaptive mutation rate; between estimates the last measured diversity is reused
+        if generation % self.diversity_interval == 0 or not self.diversity_history:
+            diversity = self._calculate_population_diversity(population)
+        else:
+            diversity = self.diversity_history[-1]
         self.diversity_history.append(diversity)
 
         # Increase mutation rate if diversity is low
@@ -225,13 +469,28 @@ class GeneticAlgorithm:
         else:
             self.mutation_rate = max(0.05, self.initial_mutation_rate * 0.8)
 
-    def _get_qualified_professors(self, subject_id: str, section_id: str) -> List[Professor]:
+    def _get_qualified_professors(self, subject_id: str, section_id: str) -> Tuple[Professor, ...]:
         """Get professors qualified to teach a specific subject"""
+        return self.qualified_professors.get((subject_id, self.section_dict[section_id].course), ())
 
-        return [p for p in self.professors if subject_id in p.subjects and self.section_dict[section_id].course in p.course]
-
-    def _get_suitable_rooms(self, session_type: SessionType, course: str) -> List[Room]:
+    def _get_suitable_rooms(self, session_type: SessionType, course: str) -> Tuple[Room, ...]:
         """Get rooms suitable for a specific session type and course"""
+        suitable_rooms = self.suitable_rooms.get((session_type, course))
+        if suitable_rooms is None:
+            suitable_rooms = tuple(self._scan_suitable_rooms(session_type, course))
+        return suitable_rooms
+
+    def suitable_room_handles(self, session_type: SessionType, course: str) -> Tuple[int, ...]:
+        """Interned handles (see models.gene.ROOMS) of the rooms suitable for a session type and course"""
+        key = (session_type, course)
+        handles = self._suitable_room_handles.get(key)
+        if handles is None:
+            handles = tuple(ROOMS.intern(room.id) for room in self._get_suitable_rooms(session_type, course))
+            self._suitable_room_handles[key] = handles
+        return handles
+
+    def _scan_suitable_rooms(self, session_type: SessionType, course: str) -> List[Room]:
+        """Find rooms suitable for a specific session type and course"""
         suitable_rooms = []
 
         for room in self.rooms:
@@ -241,8 +500,8 @@ class GeneticAlgorithm:
                     suitable_rooms.append(room)
         return suitable_rooms
 
-    def _find_valid_start_time(self, duration: float, exclude_times: Set[Tuple[Day, float]] = None) -> float:
-        """Find a valid start time avoiding conflicts"""
+    def _scan_valid_start_times(self, duration: float) -> List[float]:
+        """Find start times that avoid the lunch break and end by 21:00"""
         valid_times = []
 
         for start_time in self.time_slots:
@@ -253,19 +512,23 @@ class GeneticAlgorithm:
             if end_time > 21.0:
                 continue
 
-            # Check excluded times if provided
-            if exclude_times:
-                conflict = False
-                for day, excluded_time in exclude_times:
-                    if abs(start_time - excluded_time) < duration:
-                        conflict = True
-                        break
-                if conflict:
-                    continue
-
             valid_times.append(start_time)
 
-        return random.choice(valid_times) if valid_times else 7.0
+        return valid_times
+
+    def _find_valid_start_time(self, duration: float, exclude_times: Set[Tuple[Day, float]] = None) -> float:
+        """Find a valid start time avoiding conflicts"""
+        valid_times = self.valid_start_times.get(duration)
+        if valid_times is None:
+            valid_times = self._scan_valid_start_times(duration)
+
+        # Check excluded times if provided
+        if exclude_times:
+            valid_times = [start_time for start_time in valid_times
+                           if not any(abs(start_time - excluded_time) < duration
+                                      for day, excluded_time in exclude_times)]
+
+        return self.rng.choice(valid_times) if valid_times else 7.0
 
     def _check_professor_conflicts(self, genes: List[Gene]) -> Dict[str, List[Tuple[Gene, Gene]]]:
         """Check for professor time conflicts (skip genes with None/TBA professors)"""
@@ -296,14 +559,17 @@ class GeneticAlgorithm:
         if not conflicts:
             return chromosome
 
+        positions = {id(gene): idx for idx, gene in enumerate(chromosome.genes)}
+
         # Resolve conflicts by adjusting times or reassigning professors
         for prof_id, conflict_pairs in conflicts.items():
             for gene1, gene2 in conflict_pairs:
                 # Try to reschedule one of the conflicting genes
-                if random.random() < 0.5:
-                    target_gene = gene1
+                if self.rng.random() < 0.5:
+                    target_idx = positions[id(gene1)]
                 else:
-                    target_gene = gene2
+                    target_idx = positions[id(gene2)]
+                target_gene = chromosome.genes[target_idx]  # Current version of the gene
 
                 # Get other genes for this professor on same day
                 same_day_genes = [g for g in chromosome.genes
@@ -313,214 +579,13 @@ class GeneticAlgorithm:
 
                 # Try to find new time
                 new_start_time = self._find_valid_start_time(target_gene.duration, occupied_times)
-                target_gene.start_time = new_start_time
+                chromosome.update_gene(target_idx, start_time=new_start_time)
 
         return chromosome
 
     def create_intelligent_chromosome(self) -> Chromosome:
-        """Create chromosome with conflict-aware scheduling and professor consistency"""
-        genes = []
-        professor_schedule = defaultdict(list)  # Track professor assignments
-        room_schedule = defaultdict(list)  # Track room assignments
-        section_subject_professor = {}  # Track professor assignments per subject per section
-
-        # Group required sessions by section
-        section_sessions = defaultdict(list)
-        for section in self.sections:
-            for subject_id in section.subjects:
-                subject = self.subject_dict[subject_id]
-                for session_template in subject.sessions:
-                    section_sessions[section.id].append((subject_id, session_template))
-
-        # Schedule sessions with conflict awareness
-        for section in self.sections:
-            sessions = section_sessions[section.id]
-
-            # Prioritize bottleneck subjects first
-            bottleneck_sessions = []
-            regular_sessions = []
-
-            for subject_id, session_template in sessions:
-                if subject_id in self.bottleneck_subjects:
-                    bottleneck_sessions.append((subject_id, session_template))
-                else:
-                    regular_sessions.append((subject_id, session_template))
-
-            # Schedule bottleneck subjects first
-            all_sessions = bottleneck_sessions + regular_sessions
-
-            for subject_id, session_template in all_sessions:
-                # Check if we already assigned a professor for this subject in this section
-                key = (section.id, subject_id)
-                if key in section_subject_professor:
-                    professor_id = section_subject_professor[key]
-                else:
-                    # Get qualified professors
-                    qualified_profs = self._get_qualified_professors(subject_id, section.id)
-
-                    # Select professor (or TBA if none available)
-                    if qualified_profs:
-                        best_prof = self._select_best_professor(qualified_profs, professor_schedule)
-                        professor_id = best_prof.id
-                        section_subject_professor[key] = professor_id
-                    else:
-                        professor_id = "TBA"  # No qualified professor found
-
-                # Select room if needed
-                room_id = None
-                if self.subject_dict[subject_id].requires_room:
-                    suitable_rooms = self._get_suitable_rooms(
-                        session_template.session_type, section.course)
-                    if suitable_rooms:
-                        room_id = self._select_best_room(suitable_rooms, room_schedule)
-
-                # Select best time slot
-                if professor_id != "TBA":
-                    day, start_time = self._select_best_time_slot(
-                        professor_id, room_id, session_template.duration_hours,
-                        professor_schedule, room_schedule
-                    )
-                else:
-                    # For TBA professors, just find any valid time slot
-                    day, start_time = self._select_any_valid_time_slot(
-                        room_id, session_template.duration_hours, room_schedule
-                    )
-
-                gene = Gene(
-                    section_id=section.id,
-                    subject_id=subject_id,
-                    session_number=session_template.session_number,
-                    session_type=session_template.session_type,
-                    professor_id=professor_id,
-                    room_id=room_id,
-                    day=day,
-                    start_time=start_time,
-                    duration=session_template.duration_hours
-                )
-
-                genes.append(gene)
-
-                # Update schedules (only track actual professors, not TBA)
-                if professor_id != "TBA":
-                    professor_schedule[professor_id].append(
-                        (day, start_time, start_time + session_template.duration_hours))
-                if room_id:
-                    room_schedule[room_id].append((day, start_time, start_time + session_template.duration_hours))
-
-        return Chromosome(genes)
-
-    def _select_any_valid_time_slot(self, room_id: Optional[str], duration: float,
-                                    room_schedule: Dict) -> Tuple[Day, float]:
-        """Select any valid time slot (used for TBA professors)"""
-        room_occupied = set()
-
-        if room_id:
-            for day, start, end in room_schedule.get(room_id, []):
-                for t in self.time_slots:
-                    if start <= t < end:
-                        room_occupied.add((day, t))
-
-        # Find free slots
-        free_slots = []
-        for day in Day:
-            for start_time in self.time_slots:
-                end_time = start_time + duration
-
-                # Check basic validity
-                if start_time < 13.0 and end_time > 12.0:  # Lunch conflict
-                    continue
-                if end_time > 21.0:  # Too late
-                    continue
-
-                # Check room conflicts only
-                conflict = False
-                if room_id:
-                    for t in self.time_slots:
-                        if start_time <= t < end_time:
-                            if (day, t) in room_occupied:
-                                conflict = True
-                                break
-
-                if not conflict:
-                    free_slots.append((day, start_time))
-
-        if free_slots:
-            return random.choice(free_slots)
-        else:
-            # Fallback to any valid time
-            return random.choice(list(Day)), self._find_valid_start_time(duration)
-
-    def _select_best_professor(self, qualified_profs: List[Professor], professor_schedule: Dict) -> Professor:
-        """Select professor with least scheduling conflicts"""
-        prof_loads = []
-        for prof in qualified_profs:
-            current_load = len(professor_schedule.get(prof.id, []))
-            prof_loads.append((current_load, prof))
-
-        # Select professor with lightest load (with some randomness)
-        prof_loads.sort(key=lambda x: x[0])
-
-        # Choose from top 50% least loaded professors
-        top_half = prof_loads[:max(1, len(prof_loads) // 2)]
-        return random.choice(top_half)[1]
-
-    def _select_best_room(self, suitable_rooms: List[Room], room_schedule: Dict) -> str:
-        """Select room with least conflicts"""
-        room_loads = []
-        for room in suitable_rooms:
-            current_load = len(room_schedule.get(room.id, []))
-            room_loads.append((current_load, room.id))
-
-        room_loads.sort(key=lambda x: x[0])
-        top_half = room_loads[:max(1, len(room_loads) // 2)]
-        return random.choice(top_half)[1]
-
-    def _select_best_time_slot(self, prof_id: str, room_id: str, duration: float,
-                               professor_schedule: Dict, room_schedule: Dict) -> Tuple[Day, float]:
-        """Select best time slot avoiding conflicts"""
-        prof_occupied = set()
-        room_occupied = set()
-
-        # Get occupied times
-        for day, start, end in professor_schedule.get(prof_id, []):
-            for t in self.time_slots:
-                if start <= t < end:
-                    prof_occupied.add((day, t))
-
-        if room_id:
-            for day, start, end in room_schedule.get(room_id, []):
-                for t in self.time_slots:
-                    if start <= t < end:
-                        room_occupied.add((day, t))
-
-        # Find free slots
-        free_slots = []
-        for day in Day:
-            for start_time in self.time_slots:
-                end_time = start_time + duration
-
-                # Check basic validity
-                if start_time < 13.0 and end_time > 12.0:  # Lunch conflict
-                    continue
-                if end_time > 21.0:  # Too late
-                    continue
-
-                # Check conflicts
-                conflict = False
-                for t in self.time_slots:
-                    if start_time <= t < end_time:
-                        if (day, t) in prof_occupied or (day, t) in room_occupied:
-                            conflict = True
-                            break
-
-                if not conflict:
-                    free_slots.append((day, start_time))
-
-        if free_slots:
-            return random.choice(free_slots)
-        else:
-            # Fallback to any valid time
-            return random.choice(list(Day)), self._find_valid_start_time(duration)
+        """Create chromosome with conflict-aware scheduling and professor consistency (see ConstructionEngine)"""
+        return self.construction_engine.build()
 
     def create_random_chromosome(self) -> Chromosome:
         """Create a random chromosome with professor consistency"""
@@ -539,7 +604,7 @@ class GeneticAlgorithm:
                     qualified_profs = self._get_qualified_professors(subject_id, section.id)
                     # Use TBA if no qualified professors found
                     if qualified_profs:
-                        professor_id = random.choice(qualified_profs).id
+                        professor_id = self.rng.choice(qualified_profs).id
                         section_subject_professor[key] = professor_id
                     else:
                         professor_id = "TBA"
@@ -550,9 +615,9 @@ class GeneticAlgorithm:
                         suitable_rooms = self._get_suitable_rooms(
                             session_template.session_type, section.course)
                         if suitable_rooms:
-                            room_id = random.choice(suitable_rooms).id
+                            room_id = self.rng.choice(suitable_rooms).id
 
-                    day = random.choice(list(Day))
+                    day = self.rng.choice(list(Day))
                     start_time = self._find_valid_start_time(session_template.duration_hours)
 
                     gene = Gene(
@@ -568,45 +633,99 @@ class GeneticAlgorithm:
                     )
                     genes.append(gene)
 
-        return Chromosome(genes)
-
-    def initialize_population(self) -> List[Chromosome]:
-        """Initialize population with mix of intelligent and random chromosomes"""
-        population = []
-
-        # 70% intelligent chromosomes, 30% random for diversity
-        intelligent_count = int(0.7 * self.population_size)
-
-        print(f"Creating {intelligent_count} intelligent chromosomes...")
-        for i in range(intelligent_count):
+        return Chromosome(genes, self.active_constraints)
+
+    def create_candidate(self, intelligent: bool, seed: Optional[int] = None) -> Chromosome:
+        """
+        Create a fresh chromosome, repaired if intelligent. With a seed, it is drawn from
+        its own generator, so it is the same whichever process builds it.
+        """
+        rng = self.rng
+        if seed is not None:
+            self.rng = random.Random(seed)
+        try:
+            if not intelligent:
+                return self.create_random_chromosome()
             try:
-                chromosome = self.create_intelligent_chromosome()
-                chromosome = self._repair_chromosome(chromosome)
-                population.append(chromosome)
+                return self._repair_chromosome(self.create_intelligent_chromosome())
             except Exception as e:
-                print(f"Failed to create intelligent chromosome {i}: {e}")
-                population.append(self.create_random_chromosome())
+                print(f"Failed to create intelligent chromosome: {e}")
+                return self.create_random_chromosome()
+        finally:
+            self.rng = rng
+
+    def _use_builder(self) -> bool:
+        if self.parallel_initialization and self.workers > 1:
+            if self._builder is None:
+                self._builder = CandidateBuilder(self, self.workers)
+            return True
+        return False
+
+    def iter_initial_population(self) -> Iterator[Chromosome]:
+        """
+        Yield the initial population chromosome by chromosome. With parallel_initialization
+        they are built and scored in the worker processes and arrive as they finish.
+        """
+        # 70% intelligent chromosomes, 30% random for diversity
+        intelligent_count = int(0.7 * self.population_size)
+        print(f"Creating {intelligent_count} intelligent chromosomes and "
+              f"{self.population_size - intelligent_count} random chromosomes...")
+        tasks = [(index < intelligent_count, self.rng.getrandbits(64)) for index in range(self.population_size)]
+
+        if self._use_builder():
+            for chromosome in self._builder.imap(tasks):
+                self._cache_fitness(chromosome, (chromosome.fitness, chromosome.penalty))
+                yield chromosome
+        else:
+            for intelligent, seed in tasks:
+                yield self.create_candidate(intelligent, seed)
 
-        print(f"Creating {self.population_size - intelligent_count} random chromosomes...")
-        for _ in range(self.population_size - intelligent_count):
-            population.append(self.create_random_chromosome())
+    def initialize_population(self) -> List[Chromosome]:
+        """Initialize population with mix of intelligent and random chromosomes"""
+        return list(self.iter_initial_population())
+
+    def _prewarm(self) -> None:
+        """Top up the queues of fresh chromosomes, 70% intelligent, starting their builds"""
+        targets = {True: math.ceil(0.7 * self.prewarm_size)}
+        targets[False] = self.prewarm_size - targets[True]
+        for intelligent, target in targets.items():
+            queue = self._fresh_candidates[intelligent]
+            while len(queue) < target:
+                queue.append(self._fresh_entry(intelligent, self.rng.getrandbits(64)))
+
+    def _fresh_entry(self, intelligent: bool, seed: int) -> list:
+        pending = self._builder.submit((intelligent, seed)) if self._use_builder() else None
+        return [seed, pending]
+
+    def _take_fresh(self, intelligent: bool) -> Chromosome:
+        """A fresh chromosome from the pre-warmed queue (built now if it is not ready)"""
+        queue = self._fresh_candidates[intelligent]
+        if queue:
+            seed, pending = queue.popleft()
+        else:
+            seed, pending = self.rng.getrandbits(64), None
+        self._prewarm()
 
-        return population
+        if pending is None:
+            return self.create_candidate(intelligent, seed)
+        chromosome = self._builder.result(pending)
+        self._cache_fitness(chromosome, (chromosome.fitness, chromosome.penalty))
+        return chromosome
 
     def tournament_selection(self, population: List[Chromosome], tournament_size: int = 7) -> Chromosome:
         """Standard tournament selection without temperature-based pressure"""
-        tournament = random.sample(population, min(tournament_size, len(population)))
+        tournament = self.rng.sample(population, min(tournament_size, len(population)))
         return max(tournament, key=lambda x: x.fitness)
 
     def crossover(self, parent1: Chromosome, parent2: Chromosome) -> Tuple[Chromosome, Chromosome]:
         """Multi-point crossover with conflict resolution"""
-        if random.random() > self.crossover_rate:
-            return copy.deepcopy(parent1), copy.deepcopy(parent2)
+        if self.rng.random() > self.crossover_rate:
+            return parent1.clone(), parent2.clone()
 
         # Use multiple crossover points for better mixing
         gene_count = min(len(parent1.genes), len(parent2.genes))
-        num_points = random.randint(2, min(5, gene_count // 10 + 1))
-        crossover_points = sorted(random.sample(range(1, gene_count), num_points))
+        num_points = self.rng.randint(2, min(5, gene_count // 10 + 1))
+        crossover_points = sorted(self.rng.sample(range(1, gene_count), num_points))
 
         child1_genes = []
         child2_genes = []
@@ -621,8 +740,8 @@ class GeneticAlgorithm:
                 child2_genes.extend(parent1.genes[start_idx:point])
             start_idx = point
 
-        child1 = self._repair_chromosome(Chromosome(child1_genes))
-        child2 = self._repair_chromosome(Chromosome(child2_genes))
+        child1 = self._repair_chromosome(Chromosome(child1_genes, self.active_constraints))
+        child2 = self._repair_chromosome(Chromosome(child2_genes, self.active_constraints))
 
         # Resolve conflicts
         child1 = self._resolve_professor_conflicts(child1)
@@ -630,49 +749,15 @@ class GeneticAlgorithm:
 
         return child1, child2
 
-    def _repair_chromosome(self, chromosome: Chromosome) -> Chromosome:
-        """Comprehensive chromosome repair ensuring all hard constraints are met"""
-        # Make a copy to work on
-        repaired = copy.deepcopy(chromosome)
-
-        # Repair in multiple passes with increasingly aggressive repairs
-        for attempt in range(3):  # Try up to 3 times
-            # First ensure all required sessions exist
-            repaired = self._ensure_all_sessions_exist(repaired)
-
-            # Repair hard constraints in order of importance
-            repaired = self._repair_professor_conflicts(repaired)
-            repaired = self._repair_room_conflicts(repaired)
-            repaired = self._repair_section_conflicts(repaired)
-            repaired = self._repair_time_window_violations(repaired)
-            repaired = self._repair_same_subject_same_day(repaired)
-
-            # Early exit if we have a valid chromosome
-            if self._is_valid_chromosome(repaired):
-                break
-
-        return repaired
-
-    def _is_valid_chromosome(self, chromosome: Chromosome) -> bool:
-        """Check if chromosome meets all hard constraints"""
-        temp_chrom = Chromosome(chromosome.genes)
-        penalty = 0
-        penalty += 100 * temp_chrom._check_professor_conflicts()
-        penalty += 100 * temp_chrom._check_room_conflicts()
-        penalty += 100 * temp_chrom._check_section_conflicts()
-        penalty += 100 * temp_chrom._check_time_window()
-        penalty += 100 * temp_chrom._check_same_subject_same_day()
-        return penalty == 0
-
     def _create_gene_for_session(self, section_id: str, subject_id: str, session_template: SessionTemplate) -> Gene:
         """Create a gene for a specific session"""
-        section = next(s for s in self.sections if s.id == section_id)
+        section = self.section_dict[section_id]
 
         qualified_profs = self._get_qualified_professors(subject_id, section.id)
 
         # Use TBA if no qualified professors found
         if qualified_profs:
-            professor_id = random.choice(qualified_profs).id
+            professor_id = self.rng.choice(qualified_profs).id
         else:
             professor_id = "TBA"
 
@@ -680,9 +765,9 @@ class GeneticAlgorithm:
         if self.subject_dict[subject_id].requires_room:
             suitable_rooms = self._get_suitable_rooms(session_template.session_type, section.course)
             if suitable_rooms:
-                room_id = random.choice(suitable_rooms).id
+                room_id = self.rng.choice(suitable_rooms).id
 
-        day = random.choice(list(Day))
+        day = self.rng.choice(list(Day))
         start_time = self._find_valid_start_time(session_template.duration_hours)
 
         return Gene(
@@ -699,16 +784,16 @@ class GeneticAlgorithm:
 
     def mutate(self, chromosome: Chromosome) -> Chromosome:
         """Enhanced mutation with conflict resolution and professor consistency"""
-        if random.random() > self.mutation_rate:
+        if self.rng.random() > self.mutation_rate:
             return chromosome
 
-        mutated_chromosome = copy.deepcopy(chromosome)
+        mutated_chromosome = chromosome.clone()
 
         if mutated_chromosome.genes:
-            gene_idx = random.randint(0, len(mutated_chromosome.genes) - 1)
+            gene_idx = self.rng.randint(0, len(mutated_chromosome.genes) - 1)
             gene = mutated_chromosome.genes[gene_idx]
 
-            mutation_type = random.choice(['professor', 'room', 'time', 'day'])
+            mutation_type = self.rng.choice(['professor', 'room', 'time', 'day'])
 
             if mutation_type == 'professor' and gene.professor_id != "TBA":
                 qualified_profs = self._get_qualified_professors(gene.subject_id, gene.section_id)
@@ -716,52 +801,258 @@ class GeneticAlgorithm:
                     current_prof = gene.professor_id
                     alternatives = [p for p in qualified_profs if p.id != current_prof]
                     if alternatives:
-                        new_professor = random.choice(alternatives).id
+                        new_professor = self.rng.choice(alternatives).id
 
                         # Update all genes for this subject in this section
-                        for g in mutated_chromosome.genes:
-                            if (g.section_id == gene.section_id and
-                                    g.subject_id == gene.subject_id):
-                                g.professor_id = new_professor
+                        subject_genes = [i for i, g in enumerate(mutated_chromosome.genes)
+                                         if g.section_id == gene.section_id and
+                                         g.subject_id == gene.subject_id]
+                        mutated_chromosome.update_genes(subject_genes, professor_id=new_professor)
 
             elif mutation_type == 'room' and gene.room_id:
-                section = next(s for s in self.sections if s.id == gene.section_id)
+                section = self.section_dict[gene.section_id]
                 suitable_rooms = self._get_suitable_rooms(gene.session_type, section.course)
                 if len(suitable_rooms) > 1:
                     alternatives = [r for r in suitable_rooms if r.id != gene.room_id]
                     if alternatives:
-                        gene.room_id = random.choice(alternatives).id
+                        mutated_chromosome.update_gene(gene_idx, room_id=self.rng.choice(alternatives).id)
 
             elif mutation_type == 'time':
-                gene.start_time = self._find_valid_start_time(gene.duration)
+                mutated_chromosome.update_gene(gene_idx, start_time=self._find_valid_start_time(gene.duration))
 
             elif mutation_type == 'day':
-                gene.day = random.choice(list(Day))
+                mutated_chromosome.update_gene(gene_idx, day=self.rng.choice(list(Day)))
 
         # Resolve conflicts after mutation
         mutated_chromosome = self._resolve_professor_conflicts(mutated_chromosome)
         return self._repair_chromosome(mutated_chromosome)
 
     def evaluate_population(self, population: List[Chromosome]) -> None:
-        """Evaluate fitness for all chromosomes"""
+        """Evaluate fitness for all chromosomes, reusing cached scores of identical schedules"""
+        cache = self.fitness_cache
+        pending = []  # Chromosomes sharing a schedule, one list per schedule to score
+        pending_by_digest = {}  # content digest -> its list in pending
         for chromosome in population:
-            chromosome.calculate_fitness(None)
+            # Equal digests are confirmed by comparing the genes; shared genes compare by identity
+            digest = chromosome.content_digest()
+            cached = cache.get(digest)
+            if cached is not None and cached[0] == chromosome.genes:
+                cache.move_to_end(digest)
+                chromosome.fitness, chromosome.penalty = cached[1]
+                self.cache_hits += 1
+                continue
+            same = pending_by_digest.get(digest)
+            if same is not None and same[0].genes == chromosome.genes:
+                same.append(chromosome)
+                self.cache_hits += 1
+            else:
+                # A new schedule (or, very rarely, a different one with the same digest)
+                pending.append([chromosome])
+                pending_by_digest.setdefault(digest, pending[-1])
+                self.cache_misses += 1
+
+        # Chromosomes with fitness counters re-score from them at no cost; only the others
+        # are worth scoring on the workers or in NumPy batches
+        chromosomes = [same[0] for same in pending]
+        untracked = [chromosome for chromosome in chromosomes if not chromosome.tracked]
+        scored = {}
+        if self.workers > 1 and len(untracked) > 1:
+            if self._evaluator is None:
+                self._evaluator = ParallelEvaluator(self.encoding, self.workers, self.active_constraints)
+            scored = dict(zip(map(id, untracked), self._evaluator.evaluate(untracked)))
+        elif self.vectorized_evaluation and untracked:
+            scored = dict(zip(map(id, untracked), self._evaluate_vectorized(untracked)))
+        scores = [scored.get(id(chromosome)) or chromosome.calculate_fitness(None) for chromosome in chromosomes]
+
+        for same, score in zip(pending, scores):
+            for chromosome in same:
+                chromosome.fitness, chromosome.penalty = score
+            self._cache_fitness(same[0], score)
+
+    def _evaluate_vectorized(self, chromosomes: List[Chromosome]) -> List[Tuple[float, float]]:
+        """
+        Scores chromosomes in NumPy batches, one per gene count, and returns the (fitness, penalty)
+        of each. They get no fitness counters, so use it for chromosomes that have none yet.
+        """
+        from models.vectorized import PopulationArrays, population_penalties
+
+        scores = [None] * len(chromosomes)
+        batches = defaultdict(list)
+        for index, chromosome in enumerate(chromosomes):
+            batches[len(chromosome.genes)].append(index)
+
+        for indices in batches.values():
+            arrays = PopulationArrays(self.encoding, [chromosomes[index] for index in indices])
+            penalties = population_penalties(arrays, active=self.active_constraints)
+            for index, penalty in zip(indices, penalties.tolist()):
+                chromosome = chromosomes[index]
+                chromosome.penalty = penalty
+                chromosome.fitness = 1000.0 / (1000.0 + penalty)
+                scores[index] = (chromosome.fitness, chromosome.penalty)
+        return scores
+
+    def _cache_fitness(self, chromosome: Chromosome, score: Tuple[float, float]) -> None:
+        """Store the score of a schedule in the LRU fitness cache, evicting the least recently used entry"""
+        cache = self.fitness_cache
+        # A copy of the gene list, as the chromosome's own list changes with its genes
+        cache[chromosome.content_digest()] = (list(chromosome.genes), score)
+        if len(cache) > self.fitness_cache_size:
+            cache.popitem(last=False)
+
+    def breed(self, population: List[Chromosome], count: int) -> List[Chromosome]:
+        """Create offspring by selection, crossover and mutation until there are at least `count`"""
+        instrumentation = self.instrumentation
+        offspring = []
+        while len(offspring) < count:
+            with instrumentation.phase('tournament_selection'):
+                parent1 = self.tournament_selection(population)
+            with instrumentation.phase('tournament_selection'):
+                parent2 = self.tournament_selection(population)
+            with instrumentation.phase('crossover'):
+                child1, child2 = self.crossover(parent1, parent2)
+            with instrumentation.phase('mutate'):
+                child1 = self.mutate(child1)
+            with instrumentation.phase('mutate'):
+                child2 = self.mutate(child2)
+            offspring.extend([child1, child2])
+        return offspring
+
+    def _breed_in_workers(self, population: List[Chromosome], count: int) -> List[Chromosome]:
+        """
+        Create offspring in batches on the worker processes. Each batch gets its own seed drawn
+        here, so the offspring only depend on the seed, not on the number of workers.
+        """
+        if self._breeder is None:
+            self._breeder = OffspringBreeder(self, self.workers)
+
+        batch_sizes = []
+        while count > 0:
+            batch_sizes.append(min(self.offspring_batch_size, count))
+            count -= batch_sizes[-1]
+        seeds = [self.rng.getrandbits(64) for _ in batch_sizes]
+
+        offspring = self._breeder.breed(population, self.mutation_rate, batch_sizes, seeds)
+        for chromosome in offspring:
+            self._cache_fitness(chromosome, (chromosome.fitness, chromosome.penalty))
+        return offspring
 
     def get_elite(self, population: List[Chromosome]) -> List[Chromosome]:
         """Get elite chromosomes"""
         sorted_population = sorted(population, key=lambda x: x.fitness, reverse=True)
         return sorted_population[:self.elite_size]
 
-    def evolve(self) -> Tuple[Chromosome, List[float]]:
-        """Main evolution loop with 5000 generation termination only"""
-        print("Initializing conflict-aware population...")
-        population = self.initialize_population()
+    def next_generation(self, population: List[Chromosome], generation: int) -> List[Chromosome]:
+        """Create the next population from an evaluated one by elitism and breeding"""
+        instrumentation = self.instrumentation
 
-        print("Starting evolution...")
-        fitness_history = []
+        # Adaptive parameters
+        with instrumentation.phase('adaptive_parameters'):
+            self._adaptive_parameters(generation, population)
+
+        # Create new population
+        new_population = []
+        with instrumentation.phase('get_elite'):
+            elite = self.get_elite(population)
+        new_population.extend(chromosome.clone() for chromosome in elite)
+
+        # Improve the best of them by local search
+        if self.local_search_elites:
+            with instrumentation.phase('local_search'):
+                for i in range(min(self.local_search_elites, len(new_population))):
+                    new_population[i] = self.local_search.improve(new_population[i])
+
+        # Generate offspring
+        offspring_count = self.population_size - len(new_population)
+        if self.parallel_offspring and self.workers > 1:
+            with instrumentation.phase('breed_in_workers'):
+                new_population.extend(self._breed_in_workers(population, offspring_count))
+        else:
+            new_population.extend(self.breed(population, offspring_count))
+
+        return new_population[:self.population_size]
+
+    def evolve(self, resume_from: Optional[str] = None) -> Tuple[Chromosome, List[float]]:
+        """
+        Main evolution loop with 5000 generation termination only.
+        With resume_from, continues from a checkpoint file written by an earlier run.
+        """
+        try:
+            return self._evolve(resume_from)
+        finally:
+            self.close()
+
+    def _checkpoint_state(self, generation: int, population: List[Chromosome],
+                          best_chromosome: Optional[Chromosome], best_fitness: float,
+                          generation_of_last_improvement: int, fitness_history: List[float]) -> Dict:
+        """Everything needed to continue evolution at the start of `generation`"""
+        return {
+            'problem': problem_signature(self.encoding),
+            'generation': generation,
+            'population': [self.encoding.pack(chromosome) for chromosome in population],
+            'best_chromosome': self.encoding.pack(best_chromosome) if best_chromosome else None,
+            'best_fitness': best_fitness,
+            'generation_of_last_improvement': generation_of_last_improvement,
+            'fitness_history': fitness_history,
+            'mutation_rate': self.mutation_rate,
+            'stagnation_counter': self.stagnation_counter,
+            'last_best_fitness': self.last_best_fitness,
+            'restart_count': self.restart_count,
+            'fitness_plateau_count': self.fitness_plateau_count,
+            'diversity_history': self.diversity_history,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'random_state': self.rng.getstate(),
+            'diversity_random_state': self._diversity_rng.getstate(),
+            'fresh_candidates': {intelligent: [seed for seed, _ in queue]
+                                 for intelligent, queue in self._fresh_candidates.items()},
+        }
+
+    def _restore_checkpoint(self, state: Dict) -> Tuple[int, List[Chromosome], Optional[Chromosome],
+                                                        float, int, List[float]]:
+        """Restores the algorithm attributes and random state saved by _checkpoint_state"""
+        if state['problem'] != problem_signature(self.encoding):
+            raise ValueError("Checkpoint was written for a different problem instance")
+
+        self.mutation_rate = state['mutation_rate']
+        self.stagnation_counter = state['stagnation_counter']
+        self.last_best_fitness = state['last_best_fitness']
+        self.restart_count = state['restart_count']
+        self.fitness_plateau_count = state['fitness_plateau_count']
+        self.diversity_history = state['diversity_history']
+        self.cache_hits = state['cache_hits']
+        self.cache_misses = state['cache_misses']
+        self.rng.setstate(state['random_state'])
+        self._diversity_rng.setstate(state['diversity_random_state'])
+        for intelligent, seeds in state.get('fresh_candidates', {}).items():
+            self._fresh_candidates[intelligent] = deque(self._fresh_entry(intelligent, seed) for seed in seeds)
+
+        population = [self.encoding.unpack(packed, self.active_constraints) for packed in state['population']]
         best_chromosome = None
-        best_fitness = 0.0
-        generation_of_last_improvement = 0
+        if state['best_chromosome'] is not None:
+            best_chromosome = self.encoding.unpack(state['best_chromosome'], self.active_constraints)
+            best_chromosome.calculate_fitness(None)
+        return (state['generation'], population, best_chromosome, state['best_fitness'],
+                state['generation_of_last_improvement'], state['fitness_history'])
+
+    def _evolve(self, resume_from: Optional[str] = None) -> Tuple[Chromosome, List[float]]:
+        if resume_from is not None:
+            print(f"Resuming evolution from {resume_from}...")
+            (start_generation, population, best_chromosome, best_fitness,
+             generation_of_last_improvement, fitness_history) = self._restore_checkpoint(
+                load_checkpoint(resume_from))
+        else:
+            print("Initializing conflict-aware population...")
+            population = self.initialize_population()
+            start_generation = 0
+            fitness_history = []
+            best_chromosome = None
+            best_fitness = 0.0
+            generation_of_last_improvement = 0
+
+        # Start building candidates for restarts and diversity injection in the background
+        self._prewarm()
+
+        print("Starting evolution...")
 
         # New variables for fitness improvement tracking
         fitness_improvement_window = 100  # Check improvement over last 100 generations
@@ -770,8 +1061,20 @@ class GeneticAlgorithm:
         # Set generations to 5000
         max_generations = 10000
 
-        for generation in range(max_generations):
-            self.evaluate_population(population)
+        instrumentation = self.instrumentation
+        for generation in range(start_generation, max_generations):
+            instrumentation.start_generation(generation)
+            if (self.checkpoint_path and generation > start_generation
+                    and generation % self.checkpoint_interval == 0):
+                save_checkpoint(self.checkpoint_path, self._checkpoint_state(
+                    generation, population, best_chromosome, best_fitness,
+                    generation_of_last_improvement, fitness_history))
+
+            hits_before, misses_before = self.cache_hits, self.cache_misses
+            with instrumentation.phase('evaluate_population'):
+                self.evaluate_population(population)
+            instrumentation.record(cache_hits=self.cache_hits - hits_before,
+                                   cache_misses=self.cache_misses - misses_before)
 
             current_best = max(population, key=lambda x: x.fitness)
             current_best_fitness = current_best.fitness
@@ -779,7 +1082,7 @@ class GeneticAlgorithm:
             # Update best if we found a better solution
             if current_best_fitness > best_fitness:
                 best_fitness = current_best_fitness
-                best_chromosome = copy.deepcopy(current_best)
+                best_chromosome = current_best.clone()
                 generation_of_last_improvement = generation
                 self.stagnation_counter = 0
                 print(f"  -> New best fitness: {best_fitness:.4f} at generation {generation}")
@@ -787,6 +1090,7 @@ class GeneticAlgorithm:
                 self.stagnation_counter += 1
 
             fitness_history.append(best_fitness)
+            instrumentation.record(best_fitness=best_fitness, current_best_fitness=current_best_fitness)
 
             if best_fitness > 0.9:
                 print(f"Evolution terminated: Maximum generations ({max_generations}) reached")
@@ -796,7 +1100,8 @@ class GeneticAlgorithm:
             if generation % 50 == 0:
                 avg_fitness = sum(c.fitness for c in population) / len(population)
                 print(f"Gen {generation}: Best={best_fitness:.4f}, Avg={avg_fitness:.4f}, "
-                      f"Current={current_best_fitness:.4f}")
+                      f"Current={current_best_fitness:.4f}, "
+                      f"Cache hits/misses={self.cache_hits}/{self.cache_misses}")
 
             # Check for fitness improvement termination condition
             if generation >= fitness_improvement_window:
@@ -828,17 +1133,18 @@ class GeneticAlgorithm:
 
                 else:
                     print(f"  -> Restart {self.restart_count}/{self.max_restarts} due to stagnation")
+                    instrumentation.count('restarts')
 
                     # Create new population but keep some elite from the best ever found
                     new_population = []
 
                     # Keep the absolute best chromosome
                     if best_chromosome:
-                        new_population.append(copy.deepcopy(best_chromosome))
+                        new_population.append(best_chromosome.clone())
 
                         # Add some mutated versions of the best chromosome
                         for _ in range(min(5, self.elite_size)):
-                            mutated_best = copy.deepcopy(best_chromosome)
+                            mutated_best = best_chromosome.clone()
                             old_mutation_rate = self.mutation_rate
                             self.mutation_rate = 0.3  # Higher mutation for diversity
                             for _ in range(2):  # Multiple mutations
@@ -848,10 +1154,7 @@ class GeneticAlgorithm:
 
                     # Fill the rest with new chromosomes
                     while len(new_population) < self.population_size:
-                        if random.random() < 0.7:
-                            new_population.append(self.create_intelligent_chromosome())
-                        else:
-                            new_population.append(self.create_random_chromosome())
+                        new_population.append(self._take_fresh(self.rng.random() < 0.7))
 
                     population = new_population
                     self.stagnation_counter = 0
@@ -863,26 +1166,10 @@ class GeneticAlgorithm:
 
             # Inject diversity if stagnating but not ready for full restart
             if self.stagnation_counter > 0 and self.stagnation_counter % self.diversity_injection_threshold == 0:
-                population = self._inject_diversity(population)
-
-            # Adaptive parameters
-            self._adaptive_parameters(generation, population)
-
-            # Create new population
-            new_population = []
-            elite = self.get_elite(population)
-            new_population.extend(copy.deepcopy(elite))
+                with instrumentation.phase('inject_diversity'):
+                    population = self._inject_diversity(population)
 
-            # Generate offspring
-            while len(new_population) < self.population_size:
-                parent1 = self.tournament_selection(population)
-                parent2 = self.tournament_selection(population)
-                child1, child2 = self.crossover(parent1, parent2)
-                child1 = self.mutate(child1)
-                child2 = self.mutate(child2)
-                new_population.extend([child1, child2])
-
-            population = new_population[:self.population_size]
+            population = self.next_generation(population, generation)
 
         print(f"Evolution completed. Best fitness: {best_fitness:.4f}")
         print(f"Best solution found at generation: {generation_of_last_improvement}")
@@ -891,21 +1178,9 @@ class GeneticAlgorithm:
         return best_chromosome, fitness_history
 
     def _repair_chromosome(self, chromosome: Chromosome) -> Chromosome:
-        """Repair chromosome ensuring all hard constraints are met"""
-        # Make a copy to work on
-        repaired = copy.deepcopy(chromosome)
-
-        # First ensure all required sessions exist
-        repaired = self._ensure_all_sessions_exist(repaired)
-
-        # Repair hard constraints in order of importance
-        repaired = self._repair_professor_conflicts(repaired)
-        repaired = self._repair_room_conflicts(repaired)
-        repaired = self._repair_section_conflicts(repaired)
-        repaired = self._repair_time_window_violations(repaired)
-        repaired = self._repair_same_subject_same_day(repaired)
-
-        return repaired
+        """Repair chromosome ensuring all hard constraints are met (see RepairEngine)"""
+        with self.instrumentation.phase('repair'):
+            return self.repair_engine.repair(chromosome)
 
     def _ensure_all_sessions_exist(self, chromosome: Chromosome) -> Chromosome:
         """Ensure all required sessions exist in the chromosome"""
@@ -936,239 +1211,12 @@ class GeneticAlgorithm:
                             section.id, subject_id, session_template)
                         repaired_genes.append(new_gene)
 
-        return Chromosome(repaired_genes)
-
-    def _repair_professor_conflicts(self, chromosome: Chromosome) -> Chromosome:
-        """Resolve professor scheduling conflicts while handling None/TBA cases"""
-        # Create a copy to modify
-        repaired = copy.deepcopy(chromosome)
-
-        # First filter out genes we shouldn't process
-        processable_genes = [
-            gene for gene in repaired.genes
-            if gene.professor_id and gene.professor_id != "TBA"
-        ]
-
-        # Track professor schedules only for processable genes
-        prof_schedule = defaultdict(list)
-        for gene in processable_genes:
-            prof_schedule[gene.professor_id].append(gene)
-
-        # Find all conflicts among processable genes
-        conflicts = defaultdict(list)
-        for i, gene1 in enumerate(processable_genes):
-            for gene2 in processable_genes[i + 1:]:
-                if (gene1.professor_id == gene2.professor_id and
-                        gene1.day == gene2.day and
-                        gene1.overlaps_with(gene2)):
-                    conflicts[gene1.professor_id].append((gene1, gene2))
-
-        # Resolve each conflict
-        for prof_id, conflict_pairs in conflicts.items():
-            for gene1, gene2 in conflict_pairs:
-                # Skip if genes were already modified
-                if gene1 not in repaired.genes or gene2 not in repaired.genes:
-                    continue
-
-                # We'll modify gene2 (arbitrary choice)
-                idx = repaired.genes.index(gene2)
-
-                # Find occupied times for this professor (excluding gene2)
-                occupied_times = {
-                    (g.day, g.start_time)
-                    for g in prof_schedule[prof_id]
-                    if g != gene2 and g in repaired.genes
-                }
-
-                # Try to find a new time
-                try:
-                    new_day = random.choice(list(Day))
-                    new_start = self._find_valid_start_time(
-                        gene2.duration, occupied_times)
-
-                    # Update the gene
-                    repaired.genes[idx].day = new_day
-                    repaired.genes[idx].start_time = new_start
-
-                    # Update the professor's schedule tracking
-                    if gene2 in prof_schedule[prof_id]:
-                        prof_schedule[prof_id].remove(gene2)
-                    gene_copy = copy.copy(repaired.genes[idx])
-                    prof_schedule[prof_id].append(gene_copy)
-
-                except (ValueError, IndexError):
-                    # Fallback 1: Try assigning a different professor
-                    qualified_profs = self._get_qualified_professors(gene2.subject_id, gene2.section_id)
-                    if qualified_profs and len(qualified_profs) > 1:
-                        alternatives = [
-                            p for p in qualified_profs
-                            if p.id != gene2.professor_id
-                        ]
-                        if alternatives:
-                            repaired.genes[idx].professor_id = random.choice(alternatives).id
-                            continue
-
-                    # Fallback 2: Mark as TBA if no alternatives
-                    repaired.genes[idx].professor_id = "TBA"
-
-        return repaired
-
-    def _repair_room_conflicts(self, chromosome: Chromosome) -> Chromosome:
-        """Resolve room scheduling conflicts"""
-        # Group genes by room and day
-        room_day_genes = defaultdict(list)
-        for gene in chromosome.genes:
-            if gene.room_id:
-                key = (gene.room_id, gene.day)
-                room_day_genes[key].append(gene)
-
-        # Check for conflicts
-        repaired = copy.deepcopy(chromosome)
-        for (room_id, day), genes in room_day_genes.items():
-            # Sort by start time
-            genes_sorted = sorted(genes, key=lambda g: g.start_time)
-
-            for i in range(len(genes_sorted) - 1):
-                gene1 = genes_sorted[i]
-                gene2 = genes_sorted[i + 1]
-
-                if gene1.overlaps_with(gene2):
-                    # Conflict found - try to move gene2
-                    idx = repaired.genes.index(gene2)
-
-                    # Find alternative room if possible
-                    section = next(s for s in self.sections if s.id == gene2.section_id)
-                    suitable_rooms = self._get_suitable_rooms(
-                        gene2.session_type, section.course)
-
-                    if suitable_rooms:
-                        # Try to find a room without conflict at this time
-                        for room in suitable_rooms:
-                            if room.id == room_id:
-                                continue
-
-                            # Check if room is available
-                            conflicting = False
-                            for other_gene in repaired.genes:
-                                if (other_gene.room_id == room.id and
-                                        other_gene.day == day and
-                                        other_gene.overlaps_with(gene2)):
-                                    conflicting = True
-                                    break
-
-                            if not conflicting:
-                                repaired.genes[idx].room_id = room.id
-                                break
-
-                    # If couldn't find alternative room, move the time
-                    if repaired.genes[idx].room_id == room_id:
-                        occupied_times = {(g.day, g.start_time)
-                                          for g in repaired.genes
-                                          if g.room_id == room_id and g != gene2}
-                        new_start = self._find_valid_start_time(
-                            gene2.duration, occupied_times)
-                        repaired.genes[idx].start_time = new_start
-
-        return repaired
-
-    def _repair_section_conflicts(self, chromosome: Chromosome) -> Chromosome:
-        """Resolve section scheduling conflicts (same section having overlapping classes)"""
-        # Group genes by section and day
-        section_day_genes = defaultdict(list)
-        for gene in chromosome.genes:
-            key = (gene.section_id, gene.day)
-            section_day_genes[key].append(gene)
-
-        repaired = copy.deepcopy(chromosome)
-
-        for (section_id, day), genes in section_day_genes.items():
-            # Sort by start time
-            genes_sorted = sorted(genes, key=lambda g: g.start_time)
-
-            for i in range(len(genes_sorted) - 1):
-                gene1 = genes_sorted[i]
-                gene2 = genes_sorted[i + 1]
-
-                if gene1.overlaps_with(gene2):
-                    # Conflict found - try to move gene2 to a different time
-                    idx = repaired.genes.index(gene2)
-
-                    # Find all times already taken by this section on this day
-                    occupied_times = {(g.day, g.start_time)
-                                      for g in section_day_genes[(section_id, day)]
-                                      if g != gene2}
-
-                    new_start = self._find_valid_start_time(
-                        gene2.duration, occupied_times)
-                    repaired.genes[idx].start_time = new_start
-
-        return repaired
-
-    def _repair_time_window_violations(self, chromosome: Chromosome) -> Chromosome:
-        """Ensure all classes are within allowed time window (7:00-21:00)"""
-        repaired = copy.deepcopy(chromosome)
-
-        for i, gene in enumerate(repaired.genes):
-            if gene.start_time < 7.0 or gene.start_time > 21.0:
-                # Find a valid time
-                occupied_times = {(g.day, g.start_time)
-                                  for g in repaired.genes
-                                  if g != gene and g.professor_id == gene.professor_id}
-                new_start = self._find_valid_start_time(gene.duration, occupied_times)
-                repaired.genes[i].start_time = new_start
-
-        return repaired
-
-    def _repair_same_subject_same_day(self, chromosome: Chromosome) -> Chromosome:
-        """Ensure same subject isn't scheduled multiple times on same day for a section"""
-        repaired = copy.deepcopy(chromosome)
-
-        # Track subjects per section per day
-        section_day_subjects = defaultdict(set)
-        to_reschedule = []
-
-        # First pass: identify conflicts
-        for i, gene in enumerate(repaired.genes):
-            key = (gene.section_id, gene.day)
-            if gene.subject_id in section_day_subjects[key]:
-                to_reschedule.append(i)
-            else:
-                section_day_subjects[key].add(gene.subject_id)
-
-        # Second pass: reschedule conflicting genes
-        for idx in to_reschedule:
-            gene = repaired.genes[idx]
-
-            # Find a different day that doesn't have this subject for this section
-            possible_days = []
-            for day in Day:
-                if day == gene.day:
-                    continue
-                if gene.subject_id not in section_day_subjects[(gene.section_id, day)]:
-                    possible_days.append(day)
-
-            if possible_days:
-                # Choose a random valid day
-                new_day = random.choice(possible_days)
-
-                # Find a valid time on the new day
-                occupied_times = {(g.day, g.start_time)
-                                  for g in repaired.genes
-                                  if g.day == new_day and
-                                  (g.professor_id == gene.professor_id or
-                                   g.room_id == gene.room_id)}
-
-                new_start = self._find_valid_start_time(
-                    gene.duration, occupied_times)
-
-                # Update the gene
-                repaired.genes[idx].day = new_day
-                repaired.genes[idx].start_time = new_start
-
-                # Update our tracking
-                section_day_subjects[(gene.section_id, new_day)].add(gene.subject_id)
+        # Keep the chromosome (and its fitness counters) when nothing had to change
+        if len(repaired_genes) == len(chromosome.genes) and all(
+                new is old for new, old in zip(repaired_genes, chromosome.genes)):
+            return chromosome
 
-        return repaired
+        return Chromosome(repaired_genes, self.active_constraints)
 
     def print_schedule(self, chromosome: Chromosome) -> None:
         """Print the schedule organized by section in a readable format, including penalty breakdown"""
@@ -1176,19 +1224,8 @@ class GeneticAlgorithm:
             print("No valid schedule found")
             return
 
-        # Calculate penalty breakdown
-        penalty = 0
-        penalty_breakdown = {
-            'professor_conflicts': 100 * chromosome._check_professor_conflicts(),
-            'room_conflicts': 100 * chromosome._check_room_conflicts(),
-            'time_window': 100 * chromosome._check_time_window(),
-            'same_subject_same_day': 100 * chromosome._check_same_subject_same_day(),
-            'break_constraints': 50 * chromosome._check_break_constraints(),
-            'subject_spacing': 50 * chromosome.check_subject_spacing_violations(),
-            'subject_room': 20 * chromosome._check_subject_room(),
-            'professor_breaks': 50 * chromosome._check_professor_breaks(),
-            'wed_sat_constraints': 40 * chromosome._check_wednesday_saturday_constraints()
-        }
+        # Penalty breakdown from the fitness counters
+        penalty_breakdown = chromosome.penalty_breakdown()
         total_penalty = sum(penalty_breakdown.values())
 
         print(f"\n=== SCHEDULE SUMMARY ===")
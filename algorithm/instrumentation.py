@@ -0,0 +1,152 @@
+import csv
+import json
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Union
+
+_NULL_PHASE = nullcontext()
+
+# Generation of the record of everything reported before the first generation starts
+INITIALIZATION = 'initialization'
+
+
+class Instrumentation:
+    """
+    Hooks the genetic algorithm calls to report what it spends its time on.
+    This base class ignores everything, so instrumentation costs one method call per hook
+    when it is not enabled; PhaseRecorder records it.
+    """
+
+    def phase(self, name: str):
+        """Context manager timing one call of a phase (e.g. 'crossover')"""
+        return _NULL_PHASE
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Adds to a counter of the current generation (e.g. 'repair.relocated')"""
+
+    def record(self, **values) -> None:
+        """Sets values of the current generation (e.g. best_fitness)"""
+
+    def start_generation(self, generation: int) -> None:
+        """Closes the record of the previous generation and opens one for `generation`"""
+
+    def finish(self) -> None:
+        """Closes the last generation record and writes the output, if any"""
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+class _Phase:
+    """Timer of a single phase; nested and repeated calls add up their wall time"""
+
+    __slots__ = ('recorder', 'name', 'starts')
+
+    def __init__(self, recorder: 'PhaseRecorder', name: str):
+        self.recorder = recorder
+        self.name = name
+        self.starts: List[float] = []
+
+    def __enter__(self):
+        self.starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.starts.pop()
+        totals = self.recorder.phase_totals[self.name]
+        totals[0] += elapsed
+        totals[1] += 1
+        return False
+
+
+class PhaseRecorder(Instrumentation):
+    """
+    Records, for every generation, the wall time and number of calls of each phase, the
+    counters and values reported by the algorithm, and the time of the whole generation.
+    Phase times include nested phases (e.g. 'crossover' includes the 'repair' it calls).
+    Work reported before the first generation (e.g. building and repairing the initial
+    population) gets a record of its own, with generation INITIALIZATION.
+
+    Rows are kept in `rows`; with `path` they are also written when the run finishes,
+    as CSV if the path ends in '.csv' and as JSON lines otherwise.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.rows: List[Dict] = []
+        self.phase_totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.values: Dict[str, object] = {}
+        self._phases: Dict[str, _Phase] = {}
+        self._generation: Optional[Union[int, str]] = INITIALIZATION
+        self._generation_start = time.perf_counter()
+
+    def phase(self, name: str):
+        timer = self._phases.get(name)
+        if timer is None:
+            timer = self._phases[name] = _Phase(self, name)
+        return timer
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def record(self, **values) -> None:
+        self.values.update(values)
+
+    def start_generation(self, generation: int) -> None:
+        self._close_generation()
+        self._generation = generation
+        self._generation_start = time.perf_counter()
+
+    def finish(self) -> None:
+        self._close_generation()
+        if self.path:
+            self.export(self.path)
+
+    def _close_generation(self) -> None:
+        if self._generation is None:
+            return
+        if self._generation == INITIALIZATION and not (self.phase_totals or self.counters or self.values):
+            self._generation = None  # Nothing happened before the first generation
+            return
+
+        row = {'generation': self._generation,
+               'seconds': time.perf_counter() - self._generation_start}
+        for name, (seconds, calls) in sorted(self.phase_totals.items()):
+            row[f'{name}_seconds'] = seconds
+            row[f'{name}_calls'] = calls
+        row.update(sorted(self.counters.items()))
+        row.update(self.values)
+        self.rows.append(row)
+
+        self.phase_totals.clear()
+        self.counters.clear()
+        self.values = {}
+        self._generation = None
+
+    def summary(self) -> Dict[str, List[float]]:
+        """Total [seconds, calls] of every phase over all recorded generations"""
+        totals = defaultdict(lambda: [0.0, 0])
+        for row in self.rows:
+            for column, value in row.items():
+                if column.endswith('_seconds') and column != 'seconds':
+                    name = column[:-len('_seconds')]
+                    totals[name][0] += value
+                    totals[name][1] += row[f'{name}_calls']
+        return dict(totals)
+
+    def export(self, path: str) -> None:
+        """Writes the rows as CSV (for a '.csv' path) or as JSON lines"""
+        if path.endswith('.csv'):
+            columns = []
+            for row in self.rows:
+                columns.extend(column for column in row if column not in columns)
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(self.rows)
+        else:
+            with open(path, 'w') as f:
+                for row in self.rows:
+                    f.write(json.dumps(row) + '\n')
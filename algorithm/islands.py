@@ -0,0 +1,196 @@
+import multiprocessing
+import queue
+import random
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+from models.chromosome import Chromosome
+from models.resources import Room, Professor, Subject, Section
+from algorithm.genetic import GeneticAlgorithm
+
+TOPOLOGIES = ('ring', 'full')
+
+# Seconds the driver waits for an island's message before checking that the island is still running
+ISLAND_POLL_INTERVAL = 1.0
+
+
+class _IslandFailure:
+    """Sent in place of an island's next message when it raised an exception"""
+
+    def __init__(self, details: str):
+        self.details = details
+
+
+def _run_island(algorithm: GeneticAlgorithm, seed: int, epoch_generations: List[int], migrants: int,
+                inbox: multiprocessing.Queue, outbox: multiprocessing.Queue) -> None:
+    """
+    Evolves one island. After every epoch (epoch_generations[epoch] generations) it sends its
+    best chromosomes to the driver and replaces its worst ones with the migrants it receives.
+    An exception is reported to the driver instead of the next message.
+    """
+    try:
+        _evolve_island(algorithm, seed, epoch_generations, migrants, inbox, outbox)
+    except BaseException:
+        outbox.put(_IslandFailure(traceback.format_exc()))
+    finally:
+        algorithm.close()
+
+
+def _evolve_island(algorithm: GeneticAlgorithm, seed: int, epoch_generations: List[int], migrants: int,
+                   inbox: multiprocessing.Queue, outbox: multiprocessing.Queue) -> None:
+    algorithm.reseed(seed)
+    encoding = algorithm.encoding
+    population = algorithm.initialize_population()
+    best: Optional[Chromosome] = None
+    history = []
+    generation = 0
+
+    def track_best(population: List[Chromosome]) -> None:
+        nonlocal best
+        current_best = max(population, key=lambda x: x.fitness)
+        if best is None or current_best.fitness > best.fitness:
+            best = current_best.clone()
+
+    epochs = len(epoch_generations)
+    for epoch, generations in enumerate(epoch_generations):
+        for _ in range(generations):
+            algorithm.evaluate_population(population)
+            track_best(population)
+            history.append(best.fitness)
+            population = algorithm.next_generation(population, generation)
+            generation += 1
+
+        algorithm.evaluate_population(population)
+        track_best(population)
+        population.sort(key=lambda x: x.fitness, reverse=True)
+
+        emigrants = [encoding.pack(chromosome) for chromosome in population[:migrants]]
+        outbox.put((encoding.pack(best), best.fitness, emigrants))
+        if epoch == epochs - 1:
+            break
+
+        # Replace the worst chromosomes, always keeping the elite
+        immigrants = inbox.get()[:len(population) - algorithm.elite_size]
+        for offset, packed in enumerate(immigrants):
+            population[len(population) - 1 - offset] = encoding.unpack(packed, algorithm.active_constraints)
+
+    outbox.put(history)
+
+
+class IslandModel:
+    """
+    Runs several GeneticAlgorithm populations ("islands") in separate processes and
+    periodically migrates the best chromosomes between them.
+
+    topology: 'ring' sends migrants to the next island, 'full' to every other island.
+    Migration happens every `migration_interval` generations; when that does not divide
+    `generations`, the remaining generations run as a shorter last epoch.
+    """
+
+    def __init__(self,
+                 sections: List[Section],
+                 subjects: List[Subject],
+                 professors: List[Professor],
+                 rooms: List[Room],
+                 islands: int = 4,
+                 topology: str = 'ring',
+                 migration_interval: int = 50,
+                 migrants: int = 2,
+                 generations: int = 1000,
+                 seed: Optional[int] = None,
+                 **algorithm_options):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology '{topology}', expected one of {TOPOLOGIES}")
+        if generations < 1 or migration_interval < 1:
+            raise ValueError("generations and migration_interval must be at least 1")
+
+        self.islands = islands
+        self.topology = topology
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        # Generations of every epoch, each followed by a migration (except the last)
+        full_epochs, remainder = divmod(generations, migration_interval)
+        self.epoch_generations = [migration_interval] * full_epochs + ([remainder] if remainder else [])
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+
+        # Every island gets its own copy of the same configured algorithm
+        self.algorithm = GeneticAlgorithm(sections, subjects, professors, rooms, **algorithm_options)
+
+    def _destinations(self, index: int) -> List[int]:
+        """Islands that receive the migrants of island `index`"""
+        if self.topology == 'ring':
+            return [(index + 1) % self.islands] if self.islands > 1 else []
+        return [other for other in range(self.islands) if other != index]
+
+    @staticmethod
+    def _receive(index: int, process: multiprocessing.Process, outbox: multiprocessing.Queue):
+        """The next message of island `index`; raises RuntimeError if the island failed or died"""
+        while True:
+            try:
+                message = outbox.get(timeout=ISLAND_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+            # The island exited; anything it sent before is still readable
+            try:
+                message = outbox.get(timeout=ISLAND_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                raise RuntimeError(f"Island {index} exited with code {process.exitcode} before finishing") from None
+        if isinstance(message, _IslandFailure):
+            raise RuntimeError(f"Island {index} failed:\n{message.details}")
+        return message
+
+    def evolve(self) -> Tuple[Chromosome, List[List[float]]]:
+        """
+        Evolve all islands and return the best chromosome found on any island
+        together with the best-fitness history of each island
+        """
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        outboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        processes = [
+            multiprocessing.Process(
+                target=_run_island,
+                args=(self.algorithm, self.seed + index, self.epoch_generations,
+                      self.migrants, inboxes[index], outboxes[index]))
+            for index in range(self.islands)
+        ]
+        for process in processes:
+            process.start()
+
+        encoding = self.algorithm.encoding
+        best_packed = None
+        best_fitness = -1.0
+        epochs = len(self.epoch_generations)
+        generation = 0
+        try:
+            for epoch in range(epochs):
+                arrivals: Dict[int, list] = {index: [] for index in range(self.islands)}
+                for index, outbox in enumerate(outboxes):
+                    packed, fitness, emigrants = self._receive(index, processes[index], outbox)
+                    if fitness > best_fitness:
+                        best_packed, best_fitness = packed, fitness
+                    for destination in self._destinations(index):
+                        arrivals[destination].extend(emigrants)
+
+                generation += self.epoch_generations[epoch]
+                print(f"Epoch {epoch}: generation {generation}, Best={best_fitness:.4f}")
+
+                if epoch < epochs - 1:
+                    for index, inbox in enumerate(inboxes):
+                        inbox.put(arrivals[index])
+
+            histories = [self._receive(index, processes[index], outbox) for index, outbox in enumerate(outboxes)]
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        best_chromosome = encoding.unpack(best_packed, self.algorithm.active_constraints)
+        best_chromosome.calculate_fitness(None)
+        print(f"Island evolution completed. Best fitness: {best_fitness:.4f}")
+        return best_chromosome, histories
@@ -0,0 +1,200 @@
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set
+
+from models.chromosome import Chromosome
+from models.constraints import count_overlapping_pairs
+from models.gene import Gene
+from models.resources import Day
+
+MOVES = ('shift_time', 'move_day', 'swap_days', 'swap_room', 'swap_professor')
+
+# Share of moves made on a gene involved in a hard conflict, when there is one
+CONFLICT_FOCUS = 0.8
+
+# Iterations of tabu search between two searches for the genes in conflict
+HOT_REFRESH_INTERVAL = 10
+
+
+def conflicting_genes(genes: List[Gene]) -> List[int]:
+    """Indices of genes that overlap another gene of their professor, room or section, or break the time window"""
+    groups = defaultdict(list)
+    hot: Set[int] = set()
+    for idx, gene in enumerate(genes):
+        groups[(0, gene.professor, gene.day)].append(idx)
+        groups[(1, gene.section, gene.day)].append(idx)
+        if gene.room:
+            groups[(2, gene.room, gene.day)].append(idx)
+        if gene.start_time < 7.0 or gene.start_time > 21.0:
+            hot.add(idx)
+
+    for (kind, _, _), members in groups.items():
+        if len(members) < 2:
+            continue
+        if kind == 1:
+            # Same subject twice on one day also counts as a section conflict
+            subjects = defaultdict(list)
+            for idx in members:
+                subjects[genes[idx].subject].append(idx)
+            for same in subjects.values():
+                if len(same) > 1:
+                    hot.update(same)
+        if count_overlapping_pairs([genes[idx] for idx in members]):
+            ordered = sorted(members, key=lambda idx: genes[idx].start_time)
+            for i, first in enumerate(ordered):
+                for second in ordered[i + 1:]:
+                    if genes[second].start_time >= genes[first].end_time:
+                        break
+                    hot.add(first)
+                    hot.add(second)
+    return sorted(hot)
+
+
+class Neighbourhood:
+    """
+    Draws random moves on one chromosome as {gene index: attribute changes}: shift a session's
+    start time, move it to another day, swap the days of two sessions of a section, change its
+    room, or give its subject another professor. Moves are drawn mostly from the genes in hard
+    conflicts as of the last refresh().
+    """
+
+    def __init__(self, algorithm, chromosome: Chromosome, moves: Sequence[str] = MOVES):
+        unknown = set(moves) - set(MOVES)
+        if unknown or not moves:
+            raise ValueError(f"Unknown moves {sorted(unknown)}, expected some of {MOVES}")
+        self.algorithm = algorithm
+        self.chromosome = chromosome
+        self.moves = tuple(moves)
+        self.hot: List[int] = []
+
+        self.by_section = defaultdict(list)
+        self.by_subject = defaultdict(list)
+        for idx, gene in enumerate(chromosome.genes):
+            self.by_section[gene.section].append(idx)
+            self.by_subject[(gene.section, gene.subject)].append(idx)
+
+    def refresh(self) -> None:
+        """Finds the genes in hard conflicts again"""
+        self.hot = conflicting_genes(self.chromosome.genes)
+
+    def random_move(self) -> Optional[Dict[int, Dict]]:
+        """A random move, or None if the drawn move is not possible"""
+        algorithm = self.algorithm
+        rng = algorithm.rng
+        genes = self.chromosome.genes
+        if self.hot and rng.random() < CONFLICT_FOCUS:
+            idx = rng.choice(self.hot)
+        else:
+            idx = rng.randrange(len(genes))
+        gene = genes[idx]
+        move = rng.choice(self.moves)
+
+        if move == 'shift_time':
+            start_time = algorithm._find_valid_start_time(gene.duration)
+            return {idx: {'start_time': start_time}} if start_time != gene.start_time else None
+
+        if move == 'move_day':
+            day = rng.choice(list(Day))
+            return {idx: {'day': day}} if day != gene.day else None
+
+        if move == 'swap_days':
+            other = rng.choice(self.by_section[gene.section])
+            other_day = genes[other].day
+            if other_day == gene.day:
+                return None
+            return {idx: {'day': other_day}, other: {'day': gene.day}}
+
+        if move == 'swap_room':
+            if not gene.room_id:
+                return None
+            course = algorithm.section_dict[gene.section_id].course
+            rooms = [room for room in algorithm._get_suitable_rooms(gene.session_type, course)
+                     if room.id != gene.room_id]
+            return {idx: {'room_id': rng.choice(rooms).id}} if rooms else None
+
+        # swap_professor: every session of the subject in this section changes professor together
+        if gene.professor_id == "TBA":
+            return None
+        alternatives = [professor for professor in algorithm._get_qualified_professors(gene.subject_id, gene.section_id)
+                        if professor.id != gene.professor_id]
+        if not alternatives:
+            return None
+        professor_id = rng.choice(alternatives).id
+        return {member: {'professor_id': professor_id} for member in self.by_subject[(gene.section, gene.subject)]}
+
+
+def apply_move(chromosome: Chromosome, moves: Dict[int, Dict]) -> None:
+    """Applies a move, updating genes with identical changes together"""
+    batches = defaultdict(list)
+    for idx, changes in moves.items():
+        batches[tuple(changes.items())].append(idx)
+    for changes, indices in batches.items():
+        chromosome.update_genes(indices, **dict(changes))
+
+
+class LocalSearch:
+    """
+    Tabu search used as the memetic step of the genetic algorithm. Each iteration samples a
+    neighbourhood of moves (see Neighbourhood), scores them by delta evaluation and applies
+    the best one that is not tabu, even if it is worse. Reverting a change is tabu for
+    `tabu_tenure` iterations unless it beats the best schedule found. The search stops after
+    `iterations` iterations or `time_budget` seconds.
+    """
+
+    def __init__(self, algorithm, iterations: int = 100, time_budget: Optional[float] = None,
+                 tabu_tenure: int = 10, neighbourhood_size: int = 20, moves: Sequence[str] = MOVES):
+        self.algorithm = algorithm
+        self.iterations = iterations
+        self.time_budget = time_budget  # Makes results depend on machine speed
+        self.tabu_tenure = tabu_tenure
+        self.neighbourhood_size = neighbourhood_size
+        self.moves = moves
+
+    def improve(self, chromosome: Chromosome, history: Optional[List[float]] = None) -> Chromosome:
+        """
+        Returns the best schedule found from `chromosome` (which is not modified).
+        With `history`, the best fitness after every iteration is appended to it.
+        """
+        current = chromosome.clone()
+        penalty = current.calculate_fitness(None)[1]
+        best, best_penalty = current.clone(), penalty
+        best.calculate_fitness(None)
+        deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else None
+        neighbourhood = Neighbourhood(self.algorithm, current, self.moves)
+
+        tabu: Dict[tuple, int] = {}  # (gene index, attribute, value) -> last tabu iteration
+        for iteration in range(self.iterations):
+            if best_penalty == 0 or (deadline is not None and time.perf_counter() > deadline):
+                break
+            if iteration % HOT_REFRESH_INTERVAL == 0:
+                neighbourhood.refresh()
+
+            chosen, chosen_delta = None, None
+            for _ in range(self.neighbourhood_size):
+                moves = neighbourhood.random_move()
+                if not moves:
+                    continue
+                delta = current.penalty_delta(moves)
+                if chosen_delta is not None and delta >= chosen_delta:
+                    continue
+                is_tabu = any(tabu.get((idx, attribute, value), -1) >= iteration
+                              for idx, changes in moves.items() for attribute, value in changes.items())
+                if is_tabu and penalty + delta >= best_penalty:
+                    continue  # Tabu, and not good enough to be allowed anyway
+                chosen, chosen_delta = moves, delta
+
+            if chosen is not None:
+                for idx, changes in chosen.items():
+                    gene = current.genes[idx]
+                    for attribute in changes:
+                        tabu[(idx, attribute, getattr(gene, attribute))] = iteration + self.tabu_tenure
+                apply_move(current, chosen)
+                penalty += chosen_delta
+
+                if penalty < best_penalty:
+                    best, best_penalty = current.clone(), penalty
+                    best.calculate_fitness(None)
+            if history is not None:
+                history.append(best.fitness)
+
+        return best
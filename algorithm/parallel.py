@@ -0,0 +1,219 @@
+import math
+import multiprocessing
+import pickle
+import random
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from models import constraints
+from models.chromosome import Chromosome
+from models.encoding import PackedBatch, ProblemEncoding
+
+# Encoding used to unpack chromosomes inside a worker process, and the constraints they are scored with
+_worker_encoding: Optional[ProblemEncoding] = None
+_worker_constraints: Optional[constraints.CompiledConstraints] = None
+
+# Copy of the genetic algorithm used to breed offspring inside a worker process
+_worker_algorithm = None
+
+# Name prefix of the shared memory blocks holding the parents of each breeding round
+_worker_round_prefix: Optional[str] = None
+
+# Parent population of the current breeding round and its gene table, unpacked once per worker
+_worker_population: Tuple[int, List[Chromosome], List] = (-1, [], [])
+
+# Score of a chromosome scored in a worker: fitness, penalty and violation counts
+WorkerScore = Tuple[float, float, Dict[str, int]]
+
+
+def _worker_score(chromosome: Chromosome) -> WorkerScore:
+    return chromosome.calculate_fitness(None) + (chromosome.fitness_counts(),)
+
+
+def _init_evaluation_worker(encoding: ProblemEncoding, active: constraints.CompiledConstraints) -> None:
+    global _worker_encoding, _worker_constraints
+    _worker_encoding = encoding
+    _worker_constraints = active
+
+
+def _evaluate_chunk(chunk: PackedBatch) -> List[WorkerScore]:
+    """Scores a chunk of packed chromosomes inside a worker process"""
+    chromosomes, _ = _worker_encoding.unpack_batch(chunk, active=_worker_constraints)
+    return [_worker_score(chromosome) for chromosome in chromosomes]
+
+
+class ParallelEvaluator:
+    """
+    Scores chromosomes on a persistent pool of worker processes. Chromosomes are sent in
+    chunks, each gene shared within a chunk packed once. The violation counts come back
+    with the scores and become the fitness counters of the chromosomes, so changing them
+    later is re-scored incrementally.
+    """
+
+    def __init__(self, encoding: ProblemEncoding, workers: int,
+                 active: Optional[constraints.CompiledConstraints] = None, chunks_per_worker: int = 4):
+        self.encoding = encoding
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self._pool = multiprocessing.Pool(workers,
+                                          initializer=_init_evaluation_worker,
+                                          initargs=(encoding, active if active is not None else constraints.ACTIVE))
+
+    def evaluate(self, chromosomes: List[Chromosome]) -> List[Tuple[float, float]]:
+        """Scores every chromosome and returns their (fitness, penalty), in order"""
+        if not chromosomes:
+            return []
+
+        chunk_size = math.ceil(len(chromosomes) / (self.workers * self.chunks_per_worker))
+        chunks = [self.encoding.pack_batch(chromosomes[i:i + chunk_size])[0]
+                  for i in range(0, len(chromosomes), chunk_size)]
+
+        results = []
+        for chunk_results in self._pool.map(_evaluate_chunk, chunks):
+            results.extend(chunk_results)
+        return [chromosome.restore_counts(counts) for chromosome, (_, _, counts) in zip(chromosomes, results)]
+
+    def close(self) -> None:
+        """Shuts down the worker processes"""
+        self._pool.close()
+        self._pool.join()
+
+
+def _init_breeding_worker(algorithm, round_prefix: Optional[str] = None) -> None:
+    global _worker_algorithm, _worker_round_prefix
+    _worker_algorithm = algorithm
+    _worker_round_prefix = round_prefix
+
+
+def _round_block_name(prefix: str, round_id: int) -> str:
+    return f"{prefix}_{round_id}"
+
+
+def _breed_batch(task: Tuple[int, int, int, float]) -> Tuple[PackedBatch, List[WorkerScore]]:
+    """
+    Breeds and scores one batch of offspring inside a worker process. The parents are read
+    from the round's shared memory block by the first batch of the round a worker gets.
+    Offspring are packed against the parents' gene table, so only the genes repair and
+    mutation changed are sent back.
+    """
+    global _worker_population
+    round_id, count, seed, mutation_rate = task
+    algorithm = _worker_algorithm
+    encoding = algorithm.encoding
+
+    if _worker_population[0] != round_id:
+        block = shared_memory.SharedMemory(name=_round_block_name(_worker_round_prefix, round_id))
+        try:
+            packed_population, fitnesses = pickle.loads(block.buf)
+        finally:
+            block.close()
+        population, table = encoding.unpack_batch(packed_population, active=algorithm.active_constraints)
+        for chromosome, fitness in zip(population, fitnesses):
+            chromosome.fitness = fitness
+        _worker_population = (round_id, population, table)
+    _, population, table = _worker_population
+
+    # Every batch draws from its own substream, seeded by the master generator
+    algorithm.rng = random.Random(seed)
+    algorithm.mutation_rate = mutation_rate
+    offspring = algorithm.breed(population, count)[:count]
+    scores = [_worker_score(child) for child in offspring]
+    return encoding.pack_batch(offspring, known=table)[0], scores
+
+
+class OffspringBreeder:
+    """
+    Runs selection, crossover, repair and mutation on a persistent pool of worker processes,
+    each holding its own copy of the genetic algorithm. Batches are seeded by the caller so
+    the offspring are reproducible whatever the number of workers. The parents of a round
+    are packed once into a shared memory block, so a batch task is only a few numbers.
+    """
+
+    def __init__(self, algorithm, workers: int):
+        self.encoding = algorithm.encoding
+        self.active = algorithm.active_constraints
+        self._round = 0
+        self._round_prefix = f"gsbreed_{uuid.uuid4().hex[:12]}"
+        # Workers must share this process's tracker of shared memory blocks: with their own,
+        # they would try to remove the blocks again when they exit
+        resource_tracker.ensure_running()
+        self._pool = multiprocessing.Pool(workers,
+                                          initializer=_init_breeding_worker,
+                                          initargs=(algorithm, self._round_prefix))
+
+    def breed(self, population: List[Chromosome], mutation_rate: float,
+              batch_sizes: Sequence[int], seeds: Sequence[int]) -> List[Chromosome]:
+        """Returns scored offspring of all batches, in batch order"""
+        packed_population, table = self.encoding.pack_batch(population)
+        fitnesses = [chromosome.fitness for chromosome in population]
+        payload = pickle.dumps((packed_population, fitnesses), protocol=pickle.HIGHEST_PROTOCOL)
+        self._round += 1
+        tasks = [(self._round, count, seed, mutation_rate) for count, seed in zip(batch_sizes, seeds)]
+
+        # The block only lives for the round: every worker has read it once map() returns
+        block = shared_memory.SharedMemory(name=_round_block_name(self._round_prefix, self._round),
+                                           create=True, size=len(payload))
+        try:
+            block.buf[:len(payload)] = payload
+            results = self._pool.map(_breed_batch, tasks, chunksize=1)
+        finally:
+            block.close()
+            block.unlink()
+
+        offspring = []
+        for packed, scores in results:
+            children, _ = self.encoding.unpack_batch(packed, known=table, active=self.active)
+            for child, (_, _, counts) in zip(children, scores):
+                child.restore_counts(counts)
+                offspring.append(child)
+        return offspring
+
+    def close(self) -> None:
+        """Shuts down the worker processes"""
+        self._pool.close()
+        self._pool.join()
+
+
+def _build_candidate(task: Tuple[bool, int]) -> Tuple[PackedBatch, WorkerScore]:
+    """Builds and scores one fresh chromosome inside a worker process"""
+    intelligent, seed = task
+    chromosome = _worker_algorithm.create_candidate(intelligent, seed)
+    return _worker_algorithm.encoding.pack_batch([chromosome])[0], _worker_score(chromosome)
+
+
+class CandidateBuilder:
+    """
+    Builds fresh chromosomes on a persistent pool of worker processes, each holding its own copy
+    of the genetic algorithm. A task is (intelligent, seed), so a candidate only depends on its seed.
+    """
+
+    def __init__(self, algorithm, workers: int):
+        self.encoding = algorithm.encoding
+        self.active = algorithm.active_constraints
+        self._pool = multiprocessing.Pool(workers,
+                                          initializer=_init_breeding_worker,
+                                          initargs=(algorithm,))
+
+    def _unpack(self, result: Tuple[PackedBatch, WorkerScore]) -> Chromosome:
+        packed, (_, _, counts) = result
+        chromosome = self.encoding.unpack_batch(packed, active=self.active)[0][0]
+        chromosome.restore_counts(counts)
+        return chromosome
+
+    def imap(self, tasks: Iterable[Tuple[bool, int]]) -> Iterator[Chromosome]:
+        """Yields scored chromosomes in task order, each as soon as it and those before it are built"""
+        for result in self._pool.imap(_build_candidate, tasks):
+            yield self._unpack(result)
+
+    def submit(self, task: Tuple[bool, int]):
+        """Starts building a chromosome in the background; collect it with result()"""
+        return self._pool.apply_async(_build_candidate, (task,))
+
+    def result(self, pending) -> Chromosome:
+        return self._unpack(pending.get())
+
+    def close(self) -> None:
+        """Shuts down the worker processes, dropping candidates that are still being built"""
+        self._pool.terminate()
+        self._pool.join()
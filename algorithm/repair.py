@@ -0,0 +1,150 @@
+import math
+from collections import defaultdict
+from typing import Dict, Optional, Set, Tuple
+
+from models.chromosome import Chromosome
+from models.gene import Gene, PROFESSORS, ROOMS
+from models.resources import Day
+
+# The occupancy grid splits each day into half-hour slots starting at 7:00
+DAY_START = 7.0
+SLOT_HOURS = 0.5
+
+TBA = PROFESSORS.intern("TBA")
+
+_slot_masks: Dict[Tuple[float, float], int] = {}
+
+
+def slot_mask(start_time: float, duration: float) -> int:
+    """Bitmask of the half-hour slots a session occupies (bit 0 is 7:00-7:30)"""
+    mask = _slot_masks.get((start_time, duration))
+    if mask is None:
+        first = max(0, int((start_time - DAY_START) // SLOT_HOURS))
+        last = max(first + 1, math.ceil((start_time + duration - DAY_START) / SLOT_HOURS))
+        mask = ((1 << (last - first)) - 1) << first
+        _slot_masks[(start_time, duration)] = mask
+    return mask
+
+
+class OccupancyGrid:
+    """
+    Busy half-hour slots per (professor, day), (room, day) and (section, day), plus the
+    subjects each section already has on each day. Resources are keyed by gene handle.
+    """
+
+    def __init__(self):
+        self.professors: Dict[Tuple[int, Day], int] = defaultdict(int)
+        self.rooms: Dict[Tuple[int, Day], int] = defaultdict(int)
+        self.sections: Dict[Tuple[int, Day], int] = defaultdict(int)
+        self.subjects: Dict[Tuple[int, Day], Set[int]] = defaultdict(set)
+
+    def is_free(self, gene: Gene, room: int, day: Day, mask: int) -> bool:
+        """
+        Whether the gene could be held in `room` on `day` in the slots of `mask` without
+        breaking a hard constraint: same subject on the same day, section, professor and
+        room conflicts (the slots of a mask cover every overlapping session)
+        """
+        if gene.subject in self.subjects[(gene.section, day)]:
+            return False
+        if self.sections[(gene.section, day)] & mask:
+            return False
+        if gene.professor != TBA and self.professors[(gene.professor, day)] & mask:
+            return False
+        if room and self.rooms[(room, day)] & mask:
+            return False
+        return True
+
+    def book(self, gene: Gene, room: int, day: Day, mask: int) -> None:
+        self.subjects[(gene.section, day)].add(gene.subject)
+        self.sections[(gene.section, day)] |= mask
+        if gene.professor != TBA:
+            self.professors[(gene.professor, day)] |= mask
+        if room:
+            self.rooms[(room, day)] |= mask
+
+
+class RepairEngine:
+    """
+    Repairs the hard constraints of a chromosome (professor, room and section conflicts,
+    time window and same subject on the same day) in one pass over a shared occupancy grid.
+    Genes are booked in chromosome order; a gene that can not be booked where it is gets
+    moved to a free (day, start time, room), which updates every resource it uses at once.
+    """
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+
+    def repair(self, chromosome: Chromosome) -> Chromosome:
+        repaired = self.algorithm._ensure_all_sessions_exist(chromosome.clone())
+
+        grid = OccupancyGrid()
+        displaced = []
+        for idx, gene in enumerate(repaired.genes):
+            mask = slot_mask(gene.start_time, gene.duration)
+            if 7.0 <= gene.start_time <= 21.0 and grid.is_free(gene, gene.room, gene.day, mask):
+                grid.book(gene, gene.room, gene.day, mask)
+            else:
+                displaced.append(idx)
+
+        relocated = 0
+        for idx in displaced:
+            relocated += self._relocate(repaired, idx, grid)
+
+        # Repair succeeds when every displaced gene found a free slot
+        instrumentation = self.algorithm.instrumentation
+        instrumentation.count('repair.displaced', len(displaced))
+        instrumentation.count('repair.relocated', relocated)
+        instrumentation.count('repair.succeeded' if relocated == len(displaced) else 'repair.failed')
+        return repaired
+
+    def _relocate(self, chromosome: Chromosome, idx: int, grid: OccupancyGrid) -> bool:
+        """
+        Move a displaced gene to a free slot, trying its own day first, and book it.
+        Returns whether a free slot was found.
+        """
+        gene = chromosome.genes[idx]
+        placement = self._find_free_placement(gene, grid)
+        found = placement is not None
+        if not found:
+            # Nothing is free: fall back to a random valid time, as the old repairers did
+            placement = (self.algorithm.rng.choice(list(Day)),
+                         self.algorithm._find_valid_start_time(gene.duration),
+                         gene.room)
+
+        day, start_time, room = placement
+        grid.book(gene, room, day, slot_mask(start_time, gene.duration))
+
+        changes = {}
+        if day != gene.day:
+            changes['day'] = day
+        if start_time != gene.start_time:
+            changes['start_time'] = start_time
+        if room != gene.room:
+            changes['room_id'] = ROOMS.ids[room]
+        if changes:
+            chromosome.update_gene(idx, **changes)
+        return found
+
+    def _find_free_placement(self, gene: Gene, grid: OccupancyGrid) -> Optional[Tuple[Day, float, int]]:
+        """Search (day, start time, room) candidates for one where every resource is free"""
+        start_times = list(self.algorithm.valid_start_times.get(gene.duration)
+                           or self.algorithm._scan_valid_start_times(gene.duration))
+        other_days = [day for day in Day if day != gene.day]
+        rng = self.algorithm.rng
+        rng.shuffle(other_days)
+
+        rooms = [gene.room]
+        if gene.room:
+            course = self.algorithm.section_dict[gene.section_id].course
+            rooms.extend(room_handle
+                         for room_handle in self.algorithm.suitable_room_handles(gene.session_type, course)
+                         if room_handle != gene.room)
+
+        for day in [gene.day] + other_days:
+            rng.shuffle(start_times)
+            for start_time in start_times:
+                mask = slot_mask(start_time, gene.duration)
+                for room in rooms:
+                    if grid.is_free(gene, room, day, mask):
+                        return day, start_time, room
+        return None
@@ -0,0 +1,140 @@
+# benchmarks/run.py
+#
+# Times the main stages of the scheduler on synthetic instances of increasing size.
+#
+#   python -m benchmarks.run                       # 1x, 10x and 50x, compared with baseline.json
+#   python -m benchmarks.run --scales 1 10 --save  # store the results as the new baseline
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from data.synthetic import create_synthetic_data
+from algorithm.genetic import GeneticAlgorithm
+from models.chromosome import Chromosome
+from sched_to_txt_file import write_schedule_reports
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Slowdown relative to the baseline that is reported as a regression
+REGRESSION_RATIO = 1.2
+
+
+def _timed(function: Callable, repeat: int = 1) -> float:
+    """Best wall time of `repeat` calls, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_scale(scale: int, seed: int, population_size: int, generations: int) -> Dict[str, float]:
+    """Runs every benchmark on one synthetic instance and returns the timings in seconds"""
+    sections, subjects, professors, rooms = create_synthetic_data(scale, seed)
+    results = {'sections': len(sections), 'professors': len(professors), 'rooms': len(rooms)}
+
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        start = time.perf_counter()
+        algorithm = GeneticAlgorithm(sections, subjects, professors, rooms,
+                                     population_size=population_size,
+                                     elite_size=max(1, population_size // 10),
+                                     seed=seed)
+        results['setup'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        population = algorithm.initialize_population()
+        results['initialize_population'] = time.perf_counter() - start
+    results['genes'] = len(population[0].genes)
+
+    # Full evaluation from scratch, as for a chromosome that has never been scored
+    results['fitness_evaluation'] = _timed(
+        lambda: [Chromosome(chromosome.genes, chromosome.active).calculate_fitness(None) for chromosome in population], repeat=3)
+
+    algorithm.reseed(seed)
+    results['repair'] = _timed(lambda: [algorithm._repair_chromosome(chromosome) for chromosome in population])
+
+    algorithm.reseed(seed)
+    with quiet:
+        start = time.perf_counter()
+        evolving = population
+        for generation in range(generations):
+            algorithm.evaluate_population(evolving)
+            evolving = algorithm.next_generation(evolving, generation)
+        algorithm.evaluate_population(evolving)
+        results['evolve'] = time.perf_counter() - start
+        algorithm.close()
+
+    best = max(evolving, key=lambda x: x.fitness)
+    results['best_fitness'] = best.fitness
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        results['reports'] = _timed(lambda: write_schedule_reports(
+            best, os.path.join(directory, "section.txt"), os.path.join(directory, "professor.txt"),
+            os.path.join(directory, "room.txt")))
+    return results
+
+
+TIMINGS = ('setup', 'initialize_population', 'fitness_evaluation', 'repair', 'evolve', 'reports')
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> List[str]:
+    """Prints each timing next to the baseline and returns the regressions"""
+    regressions = []
+    for scale, timings in results.items():
+        reference = baseline.get(scale)
+        print(f"\nScale {scale}x ({timings['sections']} sections, {timings['genes']} genes)")
+        for name in TIMINGS:
+            line = f"  {name:<22}{timings[name]:>10.4f}s"
+            if reference and reference.get(name):
+                ratio = timings[name] / reference[name]
+                line += f"  baseline {reference[name]:.4f}s  x{ratio:.2f}"
+                if ratio > REGRESSION_RATIO:
+                    line += "  REGRESSION"
+                    regressions.append(f"{scale}x {name}")
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler on synthetic data")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--population", type=int, default=20)
+    parser.add_argument("--generations", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for scale in args.scales:
+        print(f"Running scale {scale}x...")
+        results[str(scale)] = run_scale(scale, args.seed, args.population, args.generations)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline.get('scales', {}))
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'config': {'seed': args.seed, 'population': args.population, 'generations': args.generations},
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'scales': {**baseline.get('scales', {}), **results},
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressions:
+        print(f"\nSlower than baseline: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
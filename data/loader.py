@@ -0,0 +1,274 @@
+import csv
+import json
+import os
+import pickle
+import tempfile
+from typing import Dict, List, Tuple
+
+from models.resources import Room, Professor, Subject, Section, SessionType, SessionTemplate
+
+Instance = Tuple[List[Section], List[Subject], List[Professor], List[Room]]
+
+# Files of an instance directory; each may be .json (a list of objects) or .csv
+INSTANCE_FILES = ('rooms', 'professors', 'subjects', 'sessions', 'sections')
+
+# Separator of list values in CSV cells (e.g. "lecture;lab")
+CSV_LIST_SEPARATOR = ';'
+
+CACHE_MAGIC = b'GSINS'
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.cache'
+DIRECTORY_CACHE_NAME = '.instance.cache'
+
+# Validation errors listed in full before the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+
+def load_instance(path: str, use_cache: bool = True) -> Instance:
+    """
+    Loads a problem instance and returns (sections, subjects, professors, rooms), like
+    create_sample_data. `path` is either a JSON file with "rooms", "professors", "subjects"
+    and "sections" lists, or a directory holding rooms, professors, subjects, sessions and
+    sections files as .json or .csv (subject sessions are then listed in the sessions file).
+
+    The validated instance is cached in a binary file next to the source (<file>.cache, or
+    .instance.cache in the directory) and reused while the source files are unchanged. The
+    cache holds the model objects only (pickled); lookup tables such as the qualified
+    professors are still built by GeneticAlgorithm.
+    """
+    sources = _source_files(path)
+    cache_path = os.path.join(path, DIRECTORY_CACHE_NAME) if os.path.isdir(path) else path + CACHE_SUFFIX
+    stamp = [(os.path.basename(source), os.stat(source).st_mtime_ns, os.stat(source).st_size)
+             for source in sources]
+
+    if use_cache:
+        instance = _read_cache(cache_path, stamp)
+        if instance is not None:
+            return instance
+
+    if os.path.isdir(path):
+        tables = {os.path.splitext(os.path.basename(source))[0]: _read_table(source) for source in sources}
+    else:
+        with open(path) as f:
+            tables = json.load(f)
+    instance = build_instance(tables)
+    _share_values(instance)
+
+    if use_cache:
+        _write_cache(cache_path, stamp, instance)
+    return instance
+
+
+def _source_files(path: str) -> List[str]:
+    if not os.path.isdir(path):
+        return [path]
+    sources = []
+    for name in INSTANCE_FILES:
+        candidates = [os.path.join(path, name + extension) for extension in ('.json', '.csv')]
+        found = [candidate for candidate in candidates if os.path.exists(candidate)]
+        if not found:
+            if name == 'sessions':
+                continue  # Sessions may be listed inside the subjects
+            raise ValueError(f"{path} has no {name}.json or {name}.csv")
+        sources.append(found[0])
+    return sources
+
+
+def _read_table(path: str) -> List[Dict]:
+    if path.endswith('.json'):
+        with open(path) as f:
+            return json.load(f)
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def _as_list(value) -> List:
+    """List values are JSON lists, or CSV cells separated by CSV_LIST_SEPARATOR"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+    return list(value)
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+def _session_type(value: str) -> SessionType:
+    """Session types are given by value (e.g. "hardware lab") or by name (e.g. "HARDWARE_LAB")"""
+    try:
+        return SessionType(value)
+    except ValueError:
+        return SessionType[value]
+
+
+def build_instance(tables: Dict[str, List[Dict]]) -> Instance:
+    """
+    Builds and validates the model objects from rows of plain values (see load_instance).
+    Raises ValueError listing every problem found: malformed values, duplicate IDs and
+    references to subjects that do not exist.
+    """
+    if not isinstance(tables, dict):
+        raise ValueError(f"Invalid problem instance: expected an object of tables, got {type(tables).__name__}")
+    errors = []
+
+    def parse(kind: str, rows: List[Dict], build, key=lambda obj: obj.id) -> List:
+        objects = []
+        seen = set()
+        if not isinstance(rows, list):
+            errors.append(f"{kind}s: expected a list, got {type(rows).__name__}")
+            return objects
+        for number, row in enumerate(rows, 1):
+            if not isinstance(row, dict):
+                errors.append(f"{kind} {number}: expected an object, got {type(row).__name__}")
+                continue
+            try:
+                obj = build(row)
+            except (KeyError, ValueError, TypeError) as e:
+                errors.append(f"{kind} {number} ({row.get('id', '?')}): invalid value {e}")
+                continue
+            if key(obj) in seen:
+                errors.append(f"{kind} {number}: duplicate {key(obj)!r}")
+                continue
+            seen.add(key(obj))
+            objects.append(obj)
+        return objects
+
+    rooms = parse('room', tables.get('rooms', []), lambda row: Room(
+        str(row['id']),
+        int(row['capacity']),
+        [_session_type(value) for value in _as_list(row['room_type'])],
+        _as_list(row.get('preferred_courses')) or None))
+    professors = parse('professor', tables.get('professors', []), lambda row: Professor(
+        str(row['id']), _as_list(row['course']), _as_list(row['subjects'])))
+
+    def build_subject(row: Dict) -> Subject:
+        subject_id = str(row['id'])
+        sessions = [SessionTemplate(subject_id, int(session['session_number']),
+                                    _session_type(session['session_type']), float(session['duration_hours']))
+                    for session in row.get('sessions') or []]
+        return Subject(subject_id, _as_list(row['course']), sessions, _as_bool(row['requires_room']))
+    subjects = parse('subject', tables.get('subjects', []), build_subject)
+
+    sections = parse('section', tables.get('sections', []), lambda row: Section(
+        str(row['id']), str(row['course']), _as_list(row['subjects']), int(row['max_students'])))
+
+    # Sessions listed in their own table join their subject
+    subject_dict = {subject.id: subject for subject in subjects}
+    sessions = parse('session', tables.get('sessions', []), lambda row: SessionTemplate(
+        str(row['subject_id']), int(row['session_number']),
+        _session_type(row['session_type']), float(row['duration_hours'])),
+        key=lambda session: (session.subject_id, session.session_number))
+    for session in sessions:
+        if session.subject_id not in subject_dict:
+            errors.append(f"session {session.subject_id} ({session.session_number}): unknown subject")
+        else:
+            subject_dict[session.subject_id].sessions.append(session)
+
+    for room in rooms:
+        if room.capacity <= 0:
+            errors.append(f"room {room.id}: capacity must be positive")
+    for subject in subjects:
+        if not subject.sessions:
+            errors.append(f"subject {subject.id}: no sessions")
+        for session in subject.sessions:
+            if session.duration_hours <= 0:
+                errors.append(f"subject {subject.id} ({session.session_number}): duration must be positive")
+    for professor in professors:
+        for subject_id in professor.subjects:
+            if subject_id not in subject_dict:
+                errors.append(f"professor {professor.id}: unknown subject '{subject_id}'")
+    for section in sections:
+        if section.max_students <= 0:
+            errors.append(f"section {section.id}: max_students must be positive")
+        for subject_id in section.subjects:
+            if subject_id not in subject_dict:
+                errors.append(f"section {section.id}: unknown subject '{subject_id}'")
+
+    if errors:
+        listed = errors[:MAX_REPORTED_ERRORS]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            listed.append(f"... and {len(errors) - MAX_REPORTED_ERRORS} more")
+        raise ValueError("Invalid problem instance:\n  " + "\n  ".join(listed))
+
+    return sections, subjects, professors, rooms
+
+
+def _share_values(instance: Instance) -> None:
+    """
+    Makes equal ID strings the same objects, so the cache stores and loads each of them once.
+    Lists stay separate: every model object owns its own (mutable) lists.
+    """
+    strings: Dict[str, str] = {}
+
+    def shared(values: List[str]) -> List[str]:
+        return [strings.setdefault(value, value) for value in values]
+
+    sections, subjects, professors, rooms = instance
+    for room in rooms:
+        if room.preferred_courses is not None:
+            room.preferred_courses = shared(room.preferred_courses)
+    for professor in professors:
+        professor.course = shared(professor.course)
+        professor.subjects = shared(professor.subjects)
+    for subject in subjects:
+        subject.id = strings.setdefault(subject.id, subject.id)
+        subject.course = shared(subject.course)
+        for session in subject.sessions:
+            session.subject_id = subject.id
+    for section in sections:
+        section.course = strings.setdefault(section.course, section.course)
+        section.subjects = shared(section.subjects)
+
+
+def _read_cache(cache_path: str, stamp: List) -> Instance:
+    """The cached instance, or None if there is none or it is out of date"""
+    try:
+        with open(cache_path, 'rb') as f:
+            if f.read(len(CACHE_MAGIC) + 1) != CACHE_MAGIC + bytes([CACHE_VERSION]):
+                return None
+            cached_stamp, instance = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+        return None
+    return instance if cached_stamp == stamp else None
+
+
+def _write_cache(cache_path: str, stamp: List, instance: Instance) -> None:
+    """Writes the cache atomically; a directory that can not be written is left without one"""
+    directory = os.path.dirname(os.path.abspath(cache_path))
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.instance-')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(CACHE_MAGIC + bytes([CACHE_VERSION]))
+            pickle.dump((stamp, instance), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def save_instance(path: str, sections: List[Section], subjects: List[Subject],
+                  professors: List[Professor], rooms: List[Room]) -> None:
+    """Writes an instance as a JSON file that load_instance reads (e.g. to start from the sample data)"""
+    document = {
+        'rooms': [{'id': room.id, 'capacity': room.capacity,
+                   'room_type': [session_type.value for session_type in room.room_type],
+                   'preferred_courses': room.preferred_courses} for room in rooms],
+        'professors': [{'id': professor.id, 'course': professor.course, 'subjects': professor.subjects}
+                       for professor in professors],
+        'subjects': [{'id': subject.id, 'course': subject.course, 'requires_room': subject.requires_room,
+                      'sessions': [{'session_number': session.session_number,
+                                    'session_type': session.session_type.value,
+                                    'duration_hours': session.duration_hours} for session in subject.sessions]}
+                     for subject in subjects],
+        'sections': [{'id': section.id, 'course': section.course, 'subjects': section.subjects,
+                      'max_students': section.max_students} for section in sections],
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
@@ -0,0 +1,95 @@
+import random
+from typing import List, Tuple
+
+from data.data import create_sample_data
+from models.resources import Room, Professor, Subject, Section, SessionType, SessionTemplate
+
+# Online general education subjects, shared by every department
+SHARED_SUBJECTS = {"GEETH01X", "GENAT01R", "MNSTP02X", "MCFIT03X"}
+
+
+def create_synthetic_data(scale: int = 1, seed: int = 0) -> Tuple[List[Section], List[Subject],
+                                                                  List[Professor], List[Room]]:
+    """
+    Builds a problem instance `scale` times the size of the sample data.
+
+    Every department is a copy of the sample data (its own courses, rooms, professors,
+    subjects and sections); the general education subjects are shared by all departments
+    and so is the pool of professors teaching them. Copies after the first are varied with
+    a seeded generator: section sizes change, some sections are dropped or duplicated and
+    some professors qualify for one more subject of their department.
+    Scale 1 returns the sample data itself.
+    """
+    sections, subjects, professors, rooms = create_sample_data()
+    if scale <= 1:
+        return sections, subjects, professors, rooms
+
+    rng = random.Random(seed)
+    base_courses = sorted({section.course for section in sections})
+
+    def suffix(department: int) -> str:
+        return "" if department == 0 else f"-{department + 1}"
+
+    def rename_courses(courses: List[str], department: int) -> List[str]:
+        return [course + suffix(department) for course in courses]
+
+    all_courses = [course for department in range(scale) for course in rename_courses(base_courses, department)]
+
+    def rename_subject(subject_id: str, department: int) -> str:
+        return subject_id if subject_id in SHARED_SUBJECTS else subject_id + suffix(department)
+
+    new_subjects = []
+    for department in range(scale):
+        for subject in subjects:
+            if subject.id in SHARED_SUBJECTS:
+                if department == 0:
+                    new_subjects.append(Subject(subject.id, all_courses, subject.sessions, subject.requires_room))
+                continue
+            subject_id = rename_subject(subject.id, department)
+            new_subjects.append(Subject(
+                subject_id,
+                rename_courses(subject.course, department),
+                [SessionTemplate(subject_id, session.session_number, session.session_type, session.duration_hours)
+                 for session in subject.sessions],
+                subject.requires_room))
+
+    new_rooms = []
+    for department in range(scale):
+        for room in rooms:
+            preferred = None if room.preferred_courses is None else rename_courses(room.preferred_courses, department)
+            capacity = room.capacity if department == 0 else rng.choice([40, 45, 50, 60])
+            new_rooms.append(Room(room.id + suffix(department), capacity, list(room.room_type), preferred))
+
+    new_professors = []
+    for department in range(scale):
+        department_subjects = [rename_subject(subject.id, department) for subject in subjects
+                               if subject.id not in SHARED_SUBJECTS]
+        for professor in professors:
+            teaches_shared = all(subject_id in SHARED_SUBJECTS for subject_id in professor.subjects)
+            if teaches_shared:
+                courses = all_courses
+            else:
+                courses = rename_courses(professor.course, department)
+            qualified = [rename_subject(subject_id, department) for subject_id in professor.subjects]
+            if department > 0 and not teaches_shared and rng.random() < 0.2:
+                extra = rng.choice(department_subjects)
+                if extra not in qualified:
+                    qualified.append(extra)
+            new_professors.append(Professor(professor.id + suffix(department), courses, qualified))
+
+    new_sections = []
+    for department in range(scale):
+        for section in sections:
+            copies = 1
+            if department > 0:
+                copies = rng.choices([0, 1, 2], weights=[1, 8, 1])[0]
+            for copy in range(copies):
+                section_id = section.id + suffix(department) + ("" if copy == 0 else f"-{copy + 1}")
+                max_students = section.max_students if department == 0 else rng.choice([35, 40, 45, 50])
+                new_sections.append(Section(
+                    section_id,
+                    section.course + suffix(department),
+                    [rename_subject(subject_id, department) for subject_id in section.subjects],
+                    max_students))
+
+    return new_sections, new_subjects, new_professors, new_rooms
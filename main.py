@@ -1,10 +1,20 @@
 # main.py
+import os
+import sys
+
 from data.data import create_sample_data
+from data.loader import load_instance
 from algorithm.genetic import GeneticAlgorithm
-from sched_to_txt_file import print_schedule_to_file, print_schedule_by_professor_to_file, print_schedule_by_room_to_file
+from sched_to_txt_file import write_schedule_reports
+
+CHECKPOINT_PATH = "evolution_checkpoint.bin"
 
 if __name__ == "__main__":
-    sections, subjects, professors, rooms = create_sample_data()
+    # python main.py [instance.json | instance directory]
+    if len(sys.argv) > 1:
+        sections, subjects, professors, rooms = load_instance(sys.argv[1])
+    else:
+        sections, subjects, professors, rooms = create_sample_data()
 
     scheduler = GeneticAlgorithm(
         sections=sections,
@@ -14,14 +24,18 @@ if __name__ == "__main__":
         population_size=150,
         mutation_rate=0.03,
         crossover_rate=0.8,
-        generations=20000
+        generations=20000,
+        local_search_elites=2,
+        checkpoint_path=CHECKPOINT_PATH
     )
 
+    # Continue an interrupted run from its last checkpoint
+    resume_from = CHECKPOINT_PATH if os.path.exists(CHECKPOINT_PATH) else None
+    best_schedule, fitness_History = scheduler.evolve(resume_from=resume_from)
 
-
-    best_schedule, fitness_History = scheduler.evolve()
+    # The run finished, so the next one starts from scratch
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
 
     scheduler.print_schedule(best_schedule)
-    print_schedule_to_file(best_schedule)
-    print_schedule_by_room_to_file(best_schedule)
-    print_schedule_by_professor_to_file(best_schedule)
\ No newline at end of file
+    write_schedule_reports(best_schedule)
\ No newline at end of file
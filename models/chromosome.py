@@ -1,105 +1,203 @@
 from collections import defaultdict
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from models import constraints
+from models.constraints import count_overlapping_pairs
+from models.fitness_tracker import FitnessTracker
 from models.gene import Gene
 from models.resources import Day, Subject
 
+# Content digests are sums of per-position gene hashes modulo 2**64
+DIGEST_MASK = (1 << 64) - 1
+
+
+def _gene_digest(index: int, gene: Gene) -> int:
+    """Contribution of the gene at `index` to the content digest of its chromosome"""
+    return hash((index, gene.key()))
+
+
 class Chromosome:
 
-    def __init__(self, genes: List[Gene]):
+    # When enabled, every incremental fitness update is checked against a full recompute
+    verify_incremental = False
+
+    def __init__(self, genes: List[Gene], active: Optional[constraints.CompiledConstraints] = None):
         # A chromosome represents a full schedule (list of scheduled sessions/genes)
         self.genes = genes
+        # Fitness constraints it is scored with (the GA's own, or the registry's defaults)
+        self.active = active if active is not None else constraints.ACTIVE
         self.fitness = 0.0  # Fitness score (higher = better)
         self.penalty = 0
+        self._tracker: Optional[FitnessTracker] = None  # Built on first evaluation
+        self._owns_tracker = True  # False while the tracker is shared with a clone
+        self._digest: Optional[int] = None  # Computed on first use, then updated as genes change
+
+    def clone(self) -> 'Chromosome':
+        """
+        Returns a copy that shares genes and fitness counters with this chromosome.
+        Genes are replaced rather than modified, so sharing is safe; the counters are
+        copied by whichever chromosome changes first.
+        """
+        clone = Chromosome(list(self.genes), self.active)
+        clone.fitness = self.fitness
+        clone.penalty = self.penalty
+        clone._digest = self._digest
+        if self._tracker is not None:
+            clone._tracker = self._tracker
+            clone._owns_tracker = False
+            self._owns_tracker = False
+        return clone
+
+    @property
+    def tracked(self) -> bool:
+        """Whether the fitness counters are built, so that re-scoring is cheap"""
+        return self._tracker is not None
+
+    def content_digest(self) -> int:
+        """
+        Returns a hash of the schedule content. Chromosomes with identical genes have equal
+        digests (and identical fitness); compare the genes to rule out a collision. Computed
+        once, then updated by update_genes for the changed genes only, and kept by clone.
+        """
+        if self._digest is None:
+            self._digest = sum(map(_gene_digest, range(len(self.genes)), self.genes)) & DIGEST_MASK
+        return self._digest
+
+    def __getstate__(self):
+        # Fitness counters and content digest use process-local gene handles
+        state = self.__dict__.copy()
+        state['_tracker'] = None
+        state['_owns_tracker'] = True
+        state['_digest'] = None
+        return state
+
     def calculate_fitness(self, constraints)  -> tuple[float, float]:
         """
         Calculates the fitness of the chromosome based on several constraints
+        (see models.constraints). Violation counts are kept up to date by update_genes,
+        so only the first evaluation scans the whole schedule.
         """
+        if self._tracker is None:
+            self._tracker = FitnessTracker(self.genes, self.active)
 
-        self.penalty = 0
-
-        """ Hard constraints """
-        # An instructor must not be scheduled to teach more than one class at the same time
-        self.penalty += 100 * self._check_professor_conflicts()
-
-        # No two classes may be scheduled in the same room at the same time.
-        self.penalty += 100 * self._check_room_conflicts()
-
-        # Classes must be scheduled within the time window of 7:00 AM to 9:00 PM.
-        self.penalty += 100 * self._check_time_window()
+        self.penalty = self._tracker.penalty
 
-        # Sessions of the same subject should not be scheduled more than once on the same day.
-        self.penalty += 100 * self._check_same_subject_same_day()
-
-        """ Soft constraints """
-        # A lunch break should be included in the daily schedule, typically between classes
-        self.penalty += 50 * self._check_break_constraints()
-
-        # Sessions of the same subject should preferably be scheduled on non-consecutive days.
-        self.penalty += 50 * self.check_subject_spacing_violations()
+        # Perfect fitness is 1.0
+        self.fitness = 1000.0 / (1000.0 + self.penalty)
+        return self.fitness, self.penalty
 
-        # Sessions of the same subject should preferably be scheduled in the same rooms.
-        self.penalty +=20 * self._check_subject_room()
+    def fitness_counts(self) -> Dict[str, int]:
+        """Violation count of every enabled constraint, from the fitness counters"""
+        if self._tracker is None:
+            self._tracker = FitnessTracker(self.genes, self.active)
+        return dict(self._tracker.counts)
 
+    def restore_counts(self, counts: Dict[str, int]) -> Tuple[float, float]:
+        """
+        Scores the chromosome from violation counts computed elsewhere for the same genes
+        (see fitness_counts), keeping them as its fitness counters without a full scan
+        """
+        self._tracker = FitnessTracker.from_counts(counts, self.active)
+        self._owns_tracker = True
+        return self.calculate_fitness(None)
 
-        # Professor teaching schedules should be arranged to prevent consecutive lessons without breaks.
-        self.penalty += 50 * self._check_professor_breaks()
+    def penalty_breakdown(self) -> Dict[str, int]:
+        """
+        Returns the weighted penalty of every constraint, in report order. Uses the incremental
+        counters of an evaluated chromosome, so it is free after calculate_fitness.
+        """
+        if self._tracker is None:
+            self._tracker = FitnessTracker(self.genes, self.active)
+        return self._tracker.breakdown()
 
-        # Academic sessions should not be scheduled on Wednesdays and Saturdays.
-        self.penalty += 40 * self._check_wednesday_saturday_constraints()
+    def penalty_delta(self, moves: Dict[int, Dict]) -> int:
+        """
+        Returns the penalty change of giving the gene at each index of `moves` that index's
+        attribute changes (e.g. {3: {'day': Day.MONDAY}}), without changing the chromosome
+        """
+        if self._tracker is None:
+            self._tracker = FitnessTracker(self.genes, self.active)
+        return self._tracker.penalty_delta(self.genes, moves)
 
-        # Perfect fitness is 1.0
-        self.fitness = 1000.0 / (1000.0 + self.penalty)
-        return self.fitness, self.penalty
+    def update_gene(self, index: int, **changes) -> None:
+        """
+        Changes attributes of one gene (e.g. day, start_time, room_id, professor_id)
+        """
+        self.update_genes([index], **changes)
 
+    def update_genes(self, indices: List[int], **changes) -> None:
+        """
+        Applies the same attribute changes to several genes. Genes must only be modified
+        through this method: it replaces them with modified copies (genes may be shared
+        with other chromosomes) and keeps the incremental fitness counters correct.
+        """
+        digest = self._digest
+        if digest is not None:
+            changed = list(dict.fromkeys(indices))
+            digest -= sum(_gene_digest(idx, self.genes[idx]) for idx in changed)
+
+        if self._tracker is None:
+            for idx in indices:
+                self.genes[idx] = self.genes[idx].replace(**changes)
+        else:
+            if not self._owns_tracker:
+                self._tracker = self._tracker.copy()
+                self._owns_tracker = True
+            self._tracker.update(self.genes, indices, changes)
+
+        if digest is not None:
+            self._digest = (digest + sum(_gene_digest(idx, self.genes[idx]) for idx in changed)) & DIGEST_MASK
+
+        if Chromosome.verify_incremental and self._tracker is not None:
+            expected = self.violation_counts()
+            if self._tracker.counts != expected:
+                mismatches = {name: (count, expected[name])
+                              for name, count in self._tracker.counts.items()
+                              if count != expected[name]}
+                raise AssertionError(f"Incremental fitness diverged from full recompute: {mismatches}")
+
+    def violation_counts(self) -> Dict[str, int]:
+        """
+        Recomputes the violation count of every enabled fitness constraint from scratch
+        """
+        return {constraint.name: int(constraint.full(self)) for constraint in self.active.constraints}
 
     def _check_professor_conflicts(self) -> int:
         """
         Counts number of sessions where a professor has overlapping sessions
         """
-        conflicts = 0
-        for i, gene1 in enumerate(self.genes):
-            for j, gene2 in enumerate(self.genes):
-                if i >= j:
-                    continue
-                if (gene1.professor_id == gene2.professor_id
-                        and gene1.day == gene2.day):
-                    if gene1.overlaps_with(gene2):
-                        conflicts += 1
-        return conflicts
+        return self._count_resource_conflicts(lambda gene: gene.professor_id)
 
     def _check_room_conflicts(self) -> int:
         """
         Counts number of overlapping sessions in the same room
         """
-        conflicts = 0
-        for i, gene1 in enumerate(self.genes):
-            for j, gene2 in enumerate(self.genes):
-                if i >= j:
-                    continue
-                if (gene1.room_id == gene2.room_id
-                        and gene1.day == gene2.day
-                        and gene1.room_id is not None):
-                    if gene1.overlaps_with(gene2):
-                        conflicts += 1
-        return conflicts
+        return self._count_resource_conflicts(lambda gene: gene.room_id, skip_none=True)
 
     def _check_section_conflicts(self) -> int:
         """
         Counts number of overlapping sessions for the same student section
         """
+        return self._count_resource_conflicts(lambda gene: gene.section_id)
+
+    def _count_resource_conflicts(self, resource_of, skip_none: bool = False) -> int:
+        """
+        Counts overlapping pairs of sessions sharing a resource on the same day.
+        Genes are bucketed by (resource, day) so only sessions that can clash are compared.
+        """
+        buckets = defaultdict(list)
+        for gene in self.genes:
+            resource = resource_of(gene)
+            if skip_none and resource is None:
+                continue
+            buckets[(resource, gene.day)].append(gene)
+
         conflicts = 0
-        for i, gene1 in enumerate(self.genes):
-            for j, gene2 in enumerate(self.genes):
-                if i >= j:
-                    continue
-                if (gene1.section_id == gene2.section_id
-                        and gene1.day == gene2.day):
-                    if gene1.overlaps_with(gene2):
-                        conflicts += 1
+        for genes in buckets.values():
+            if len(genes) > 1:
+                conflicts += count_overlapping_pairs(genes)
         return conflicts
 
-
     def _check_wednesday_saturday_constraints(self) -> int:
         """
         Penalizes classes scheduled on Wednesdays and Saturdays
@@ -0,0 +1,287 @@
+import dataclasses
+from collections import defaultdict
+from dataclasses import dataclass
+from operator import methodcaller
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.gene import Gene
+from models.resources import Day
+
+
+def by_start_time(gene: Gene) -> float:
+    """Sort key of sessions in start time order"""
+    return gene.start_time
+
+
+def count_overlapping_pairs(genes: List[Gene]) -> int:
+    """
+    Counts overlapping pairs in a group of same-day sessions by sweeping them in start time order
+    """
+    return overlapping_pairs_in_order(sorted(genes, key=by_start_time))
+
+
+def overlapping_pairs_in_order(ordered: List[Gene]) -> int:
+    """count_overlapping_pairs of sessions already sorted by start time"""
+    conflicts = 0
+    for i in range(len(ordered) - 1):
+        first = ordered[i]
+        first_end = first.end_time
+        for j in range(i + 1, len(ordered)):
+            second = ordered[j]
+            # Later sessions start even later, so none of them can overlap `first`
+            if second.start_time >= first_end:
+                break
+            if first.start_time < second.end_time:
+                conflicts += 1
+    return conflicts
+
+
+def count_back_to_back(genes: List[Gene]) -> int:
+    """
+    Counts consecutive sessions (by start time) with no gap between them
+    """
+    return back_to_back_in_order(sorted(genes, key=by_start_time))
+
+
+def back_to_back_in_order(ordered: List[Gene]) -> int:
+    """count_back_to_back of sessions already sorted by start time"""
+    violations = 0
+    for i in range(len(ordered) - 1):
+        if ordered[i + 1].start_time - ordered[i].end_time == 0:
+            violations += 1
+    return violations
+
+
+def count_consecutive_days(genes: List[Gene]) -> int:
+    """
+    Counts pairs of sessions that fall on back-to-back days
+    """
+    days_values = sorted(gene.day_index for gene in genes)
+    conflicts = 0
+    for i in range(len(days_values) - 1):
+        if days_values[i + 1] - days_values[i] == 1:
+            conflicts += 1
+    return conflicts
+
+
+def count_room_changes(genes: List[Gene]) -> int:
+    """
+    Counts room inconsistencies between sessions of the same type of one section's subject
+    """
+    conflicts = 0
+    rooms_by_type = defaultdict(dict)
+    for gene in genes:
+        rooms_by_session = rooms_by_type[gene.session_type]
+        if gene.session_number in rooms_by_session:
+            if rooms_by_session[gene.session_number] != gene.room:
+                conflicts += 1
+        else:
+            rooms_by_session[gene.session_number] = gene.room
+
+    for rooms_by_session in rooms_by_type.values():
+        n = len(set(rooms_by_session.values()))
+        conflicts += n * (n - 1) // 2
+    return conflicts
+
+
+def count_repeated_subjects(genes: List[Gene]) -> int:
+    """
+    Counts sessions of a subject beyond the first in a group
+    """
+    return len(genes) - len({gene.subject for gene in genes})
+
+
+def count_uneven_days(genes: List[Gene]) -> int:
+    """
+    Returns 1 if the busiest and quietest days of a group differ by more than two sessions
+    """
+    day_counts = [0] * len(Day)
+    for gene in genes:
+        day_counts[gene.day_index] += 1
+    return int(max(day_counts) - min(day_counts) > 2)
+
+
+# Keys of the gene groupings group constraints are counted over (None: the gene is in no group)
+GROUPINGS: Dict[str, Callable[[Gene], Optional[tuple]]] = {
+    'professor_day': lambda gene: (gene.professor, gene.day_index),
+    'section_day': lambda gene: (gene.section, gene.day_index),
+    'section_subject': lambda gene: (gene.section, gene.subject),
+    'room_day': lambda gene: (gene.room, gene.day_index) if gene.room else None,
+    'section': lambda gene: (gene.section,),
+}
+
+# Grouping name of constraints counted on each gene on its own
+GENE = 'gene'
+
+
+@dataclass(frozen=True)
+class Constraint:
+    """
+    A fitness constraint. `count` is its delta evaluation: the violations of one gene (for
+    grouping GENE) or of one group of two or more genes of its grouping, so a change to a
+    chromosome only re-counts the genes and groups it touches. `full` is its full
+    evaluation: the violations of a whole chromosome, counted from scratch.
+    A weight of 0 disables the constraint. With `ordered`, `count` gets the group sorted by
+    start time, sorted once for all the constraints of the grouping.
+    """
+    name: str
+    weight: int
+    hard: bool
+    grouping: str
+    count: Callable
+    full: Callable
+    description: str = ''
+    ordered: bool = False
+
+
+class CompiledConstraints:
+    """
+    The enabled constraints arranged for the fitness tracker: the terms counted on every gene,
+    and per grouping the terms counted on every group, with whether any of them needs the
+    group sorted by start time. `registered` keeps the disabled constraints too.
+    """
+
+    def __init__(self, constraints: List[Constraint]):
+        self.registered = tuple(constraints)
+        self.constraints = tuple(constraint for constraint in constraints if constraint.weight)
+        self.weights: Dict[str, int] = {constraint.name: constraint.weight for constraint in self.constraints}
+        self.gene_terms: Tuple[Tuple[str, Callable], ...] = tuple(
+            (constraint.name, constraint.count) for constraint in self.constraints if constraint.grouping == GENE)
+
+        group_terms = defaultdict(list)
+        for constraint in self.constraints:
+            if constraint.grouping != GENE:
+                group_terms[constraint.grouping].append((constraint.name, constraint.count, constraint.ordered))
+        # grouping -> (sort the group?, terms). Groupings without an enabled constraint are not even indexed
+        self.group_terms: Dict[str, Tuple[bool, Tuple[Tuple[str, Callable, bool], ...]]] = {
+            grouping: (any(ordered for _, _, ordered in group_terms[grouping]), tuple(group_terms[grouping]))
+            for grouping in GROUPINGS if grouping in group_terms}
+        self.group_keys: Tuple[Tuple[str, Callable], ...] = tuple(
+            (grouping, GROUPINGS[grouping]) for grouping in self.group_terms)
+
+    def __reduce__(self):
+        # Count functions may be lambdas: a copy in another process is compiled again
+        # from the constraints registered there, with the same weights
+        return compile_constraints, (self.all_weights(),)
+
+    def all_weights(self) -> Dict[str, int]:
+        """Weight of every constraint, disabled ones included"""
+        return {constraint.name: constraint.weight for constraint in self.registered}
+
+    def keys_of(self, gene: Gene) -> List[Tuple[str, tuple]]:
+        """Returns the (grouping, key) pairs a gene belongs to"""
+        keys = []
+        for grouping, key_of in self.group_keys:
+            key = key_of(gene)
+            if key is not None:
+                keys.append((grouping, key))
+        return keys
+
+    def gene_counts(self, gene: Gene) -> List[Tuple[str, int]]:
+        """Violations of every gene term"""
+        return [(name, count(gene)) for name, count in self.gene_terms]
+
+    def group_counts(self, grouping: str, group: List[Gene]) -> List[Tuple[str, int]]:
+        """Violations of every term of a grouping in one group of two or more genes (in chromosome order)"""
+        needs_sort, terms = self.group_terms[grouping]
+        ordered = sorted(group, key=by_start_time) if needs_sort else group
+        return [(name, count(ordered if in_order else group)) for name, count, in_order in terms]
+
+    def gene_penalty(self, gene: Gene) -> int:
+        weights = self.weights
+        return sum(weights[name] * count for name, count in self.gene_counts(gene))
+
+    def group_penalty(self, grouping: str, group: List[Gene]) -> int:
+        if len(group) < 2:
+            return 0
+        weights = self.weights
+        return sum(weights[name] * count for name, count in self.group_counts(grouping, group))
+
+
+# Registered constraints, in report order
+CONSTRAINTS: Dict[str, Constraint] = {}
+
+# The enabled constraints, recompiled whenever the registry changes. Used by chromosomes and
+# trackers built without constraints of their own; a GeneticAlgorithm compiles its own set.
+ACTIVE = CompiledConstraints([])
+
+
+def _check_names(weights: Dict[str, int]) -> None:
+    unknown = set(weights) - set(CONSTRAINTS)
+    if unknown:
+        raise ValueError(f"Unknown constraints {sorted(unknown)}, expected some of {tuple(CONSTRAINTS)}")
+
+
+def register_constraint(constraint: Constraint) -> None:
+    """Adds a constraint to the fitness (or replaces the one with the same name)"""
+    global ACTIVE
+    if constraint.grouping != GENE and constraint.grouping not in GROUPINGS:
+        raise ValueError(f"Unknown grouping '{constraint.grouping}', expected '{GENE}' or one of {tuple(GROUPINGS)}")
+    CONSTRAINTS[constraint.name] = constraint
+    ACTIVE = CompiledConstraints(list(CONSTRAINTS.values()))
+
+
+def configure_constraints(weights: Dict[str, int]) -> None:
+    """Sets the default weight of the named constraints; 0 disables a constraint"""
+    _check_names(weights)
+    for name, weight in weights.items():
+        register_constraint(dataclasses.replace(CONSTRAINTS[name], weight=weight))
+
+
+def constraint_weights() -> Dict[str, int]:
+    """Default weight of every registered constraint, disabled ones included"""
+    return {name: constraint.weight for name, constraint in CONSTRAINTS.items()}
+
+
+def compile_constraints(weights: Optional[Dict[str, int]] = None) -> CompiledConstraints:
+    """
+    Compiles the registered constraints with the named ones reweighted (0 disables a
+    constraint), leaving the registry and ACTIVE unchanged
+    """
+    weights = weights or {}
+    _check_names(weights)
+    return CompiledConstraints([dataclasses.replace(constraint, weight=weights[name]) if name in weights else constraint
+                                for name, constraint in CONSTRAINTS.items()])
+
+
+for _constraint in (
+    # Hard constraints
+    Constraint('professor_conflicts', 100, True, 'professor_day', overlapping_pairs_in_order,
+               methodcaller('_check_professor_conflicts'),
+               "A professor must not teach more than one class at the same time", ordered=True),
+    Constraint('room_conflicts', 100, True, 'room_day', overlapping_pairs_in_order,
+               methodcaller('_check_room_conflicts'),
+               "No two classes may be scheduled in the same room at the same time", ordered=True),
+    Constraint('time_window', 100, True, GENE, lambda gene: gene.start_time < 7.0 or gene.start_time > 21.0,
+               methodcaller('_check_time_window'),
+               "Classes must be scheduled between 7:00 AM and 9:00 PM"),
+    Constraint('same_subject_same_day', 100, True, 'section_day', count_repeated_subjects,
+               methodcaller('_check_same_subject_same_day'),
+               "A subject should not be held more than once a day for a section"),
+    # Soft constraints
+    Constraint('break_constraints', 50, False, GENE,
+               lambda gene: 12.0 < gene.start_time < 13.0 or 12.0 < gene.end_time <= 13.0,
+               methodcaller('_check_break_constraints'),
+               "A lunch break should be kept free"),
+    Constraint('subject_spacing', 50, False, 'section_subject', count_consecutive_days,
+               methodcaller('check_subject_spacing_violations'),
+               "Sessions of a subject should be on non-consecutive days"),
+    Constraint('subject_room', 20, False, 'section_subject', count_room_changes,
+               methodcaller('_check_subject_room'),
+               "Sessions of a subject should be held in the same room"),
+    Constraint('professor_breaks', 50, False, 'professor_day', back_to_back_in_order,
+               methodcaller('_check_professor_breaks'),
+               "Professors should not teach back-to-back lessons", ordered=True),
+    Constraint('wed_sat_constraints', 40, False, GENE,
+               lambda gene: gene.day == Day.WEDNESDAY or gene.day == Day.SATURDAY,
+               methodcaller('_check_wednesday_saturday_constraints'),
+               "No sessions on Wednesdays and Saturdays"),
+    # Disabled by default
+    Constraint('section_conflicts', 0, True, 'section_day', overlapping_pairs_in_order,
+               methodcaller('_check_section_conflicts'),
+               "A section must not attend more than one class at the same time", ordered=True),
+    Constraint('subject_distribution', 0, False, 'section', count_uneven_days,
+               methodcaller('check_subject_distribution'),
+               "A section's classes should be spread evenly over the days"),
+):
+    register_constraint(_constraint)
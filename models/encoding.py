@@ -0,0 +1,163 @@
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models.chromosome import Chromosome
+from models.constraints import CompiledConstraints
+from models.gene import Gene
+from models.resources import Day, SessionType, Room, Professor, Subject, Section
+
+# Order of the fields in an encoded gene record
+GENE_COLUMNS = ('section', 'subject', 'session_number', 'session_type',
+                'professor', 'room', 'day', 'start_time', 'duration')
+
+GeneRecord = Tuple[int, int, int, int, int, int, int, float, float]
+
+# Packed chromosome: integer code columns and float time columns, gene by gene
+PackedChromosome = Tuple[bytes, bytes]
+
+# Packed batch of chromosomes: the code and time columns of the genes new to the receiver,
+# then per chromosome the indices of its genes in the gene table (see pack_batch)
+PackedBatch = Tuple[bytes, bytes, List[bytes]]
+
+_CODE_FIELDS = 7
+_TIME_FIELDS = 2
+
+
+class ProblemEncoding:
+    """
+    Interns the resource IDs of a problem instance as dense integer codes so genes
+    can be stored as plain numeric records (and as array columns).
+    Room code 0 stands for "no room" and day codes are the Day enum values.
+    """
+
+    def __init__(self,
+                 sections: List[Section],
+                 subjects: List[Subject],
+                 professors: List[Professor],
+                 rooms: List[Room]):
+        self.section_ids: List[str] = [s.id for s in sections]
+        self.subject_ids: List[str] = [s.id for s in subjects]
+        self.professor_ids: List[str] = [p.id for p in professors] + ["TBA"]
+        self.room_ids: List[Optional[str]] = [None] + [r.id for r in rooms]
+        self.session_types: List[SessionType] = list(SessionType)
+
+        self.section_codes = self._codes(self.section_ids)
+        self.subject_codes = self._codes(self.subject_ids)
+        self.professor_codes = self._codes(self.professor_ids)
+        self.room_codes = self._codes(self.room_ids)
+        self.session_type_codes = self._codes(self.session_types)
+
+    @staticmethod
+    def _codes(values: Sequence) -> Dict:
+        codes = {}
+        for code, value in enumerate(values):
+            codes.setdefault(value, code)
+        return codes
+
+    def encode_gene(self, gene: Gene) -> GeneRecord:
+        """Encodes a gene as a record of integer codes and float times (see GENE_COLUMNS)"""
+        return (self.section_codes[gene.section_id],
+                self.subject_codes[gene.subject_id],
+                gene.session_number,
+                self.session_type_codes[gene.session_type],
+                self.professor_codes[gene.professor_id],
+                self.room_codes[gene.room_id],
+                gene.day.value,
+                gene.start_time,
+                gene.duration)
+
+    def decode_gene(self, record: GeneRecord) -> Gene:
+        section, subject, session_number, session_type, professor, room, day, start_time, duration = record
+        return Gene(
+            section_id=self.section_ids[section],
+            subject_id=self.subject_ids[subject],
+            session_number=session_number,
+            session_type=self.session_types[session_type],
+            professor_id=self.professor_ids[professor],
+            room_id=self.room_ids[room],
+            day=Day(day),
+            start_time=start_time,
+            duration=duration
+        )
+
+    def encode(self, chromosome: Chromosome) -> List[GeneRecord]:
+        """Encodes every gene of a chromosome, keeping gene order"""
+        return [self.encode_gene(gene) for gene in chromosome.genes]
+
+    def decode(self, records: Sequence[GeneRecord], active: Optional[CompiledConstraints] = None) -> Chromosome:
+        """Builds a chromosome scored with `active` (default: the registry's) from encoded gene records"""
+        return Chromosome([self.decode_gene(record) for record in records], active)
+
+    def pack(self, chromosome: Chromosome) -> PackedChromosome:
+        """
+        Packs a chromosome into two compact byte strings (16-bit codes and float times),
+        suitable for sending to other processes
+        """
+        codes = array('H')
+        times = array('d')
+        for gene in chromosome.genes:
+            record = self.encode_gene(gene)
+            codes.extend(record[:_CODE_FIELDS])
+            times.extend(record[_CODE_FIELDS:])
+        return codes.tobytes(), times.tobytes()
+
+    def unpack(self, packed: PackedChromosome, active: Optional[CompiledConstraints] = None) -> Chromosome:
+        """Rebuilds a chromosome packed with pack()"""
+        codes = array('H')
+        codes.frombytes(packed[0])
+        times = array('d')
+        times.frombytes(packed[1])
+        return self.decode([
+            tuple(codes[i * _CODE_FIELDS:(i + 1) * _CODE_FIELDS]) + tuple(times[i * _TIME_FIELDS:(i + 1) * _TIME_FIELDS])
+            for i in range(len(times) // _TIME_FIELDS)
+        ], active)
+
+    def pack_batch(self, chromosomes: Sequence[Chromosome],
+                   known: Sequence[Gene] = ()) -> Tuple[PackedBatch, List[Gene]]:
+        """
+        Packs chromosomes for another process, encoding every distinct gene once: genes are
+        shared between chromosomes (clones, crossover), and only those missing from `known`
+        (a gene table the receiver already holds, in the same order) are sent. Returns the
+        batch and its gene table: the known genes followed by the new ones.
+        """
+        table = list(known)
+        index_of = {id(gene): index for index, gene in enumerate(table)}
+        codes = array('H')
+        times = array('d')
+        chromosome_indices = []
+        for chromosome in chromosomes:
+            indices = array('I')
+            for gene in chromosome.genes:
+                index = index_of.get(id(gene))
+                if index is None:
+                    index = index_of[id(gene)] = len(table)
+                    table.append(gene)
+                    record = self.encode_gene(gene)
+                    codes.extend(record[:_CODE_FIELDS])
+                    times.extend(record[_CODE_FIELDS:])
+                indices.append(index)
+            chromosome_indices.append(indices.tobytes())
+        return (codes.tobytes(), times.tobytes(), chromosome_indices), table
+
+    def unpack_batch(self, batch: PackedBatch, known: Sequence[Gene] = (),
+                     active: Optional[CompiledConstraints] = None) -> Tuple[List[Chromosome], List[Gene]]:
+        """
+        Rebuilds the chromosomes of a batch packed with pack_batch against the same `known`
+        genes, and returns them with the batch's gene table. Chromosomes share gene objects.
+        """
+        packed_codes, packed_times, chromosome_indices = batch
+        codes = array('H')
+        codes.frombytes(packed_codes)
+        times = array('d')
+        times.frombytes(packed_times)
+        table = list(known)
+        table.extend(self.decode_gene(tuple(codes[i * _CODE_FIELDS:(i + 1) * _CODE_FIELDS])
+                                      + tuple(times[i * _TIME_FIELDS:(i + 1) * _TIME_FIELDS]))
+                     for i in range(len(times) // _TIME_FIELDS))
+
+        chromosomes = []
+        for packed_indices in chromosome_indices:
+            indices = array('I')
+            indices.frombytes(packed_indices)
+            chromosomes.append(Chromosome(list(map(table.__getitem__, indices)), active))
+        return chromosomes, table
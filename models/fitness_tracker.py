@@ -0,0 +1,181 @@
+import bisect
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from models import constraints
+from models.constraints import by_start_time
+from models.gene import Gene
+
+
+class FitnessTracker:
+    """
+    Keeps the violation count of every enabled constraint of a chromosome up to date as its
+    genes change. Genes are indexed by the groupings the constraints are counted over
+    (professor-day, room-day, section-day, section-subject, ...) so that a change only
+    re-scores the groups it touches. It scores with the given compiled constraints
+    (by default models.constraints.ACTIVE at construction) for its whole life.
+    """
+
+    def __init__(self, genes: List[Gene], active: Optional[constraints.CompiledConstraints] = None):
+        self.active = active = active if active is not None else constraints.ACTIVE
+        # grouping name -> group key -> indices of member genes, in chromosome order.
+        # Member tuples are never modified, so copies of the tracker can share them.
+        # None until first needed in a tracker made with from_counts.
+        self.groups: Optional[Dict[str, Dict[tuple, Tuple[int, ...]]]] = {}
+        self.counts: Dict[str, int] = dict.fromkeys(active.weights, 0)
+
+        for name, members_by_key in self._index(genes, count_genes=True).items():
+            self.groups[name] = {key: tuple(members) for key, members in members_by_key.items()}
+            for members in members_by_key.values():
+                self._add_group_terms(name, genes, members, 1)
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, int],
+                    active: Optional[constraints.CompiledConstraints] = None) -> 'FitnessTracker':
+        """
+        A tracker of a chromosome already scored elsewhere (e.g. in a worker process): the
+        violation counts are taken as given and the genes are only indexed on the first change
+        """
+        tracker = object.__new__(cls)
+        tracker.active = active if active is not None else constraints.ACTIVE
+        tracker.groups = None
+        tracker.counts = {name: counts[name] for name in tracker.active.weights}
+        return tracker
+
+    def _index(self, genes: List[Gene], count_genes: bool) -> Dict[str, Dict[tuple, List[int]]]:
+        """A single sweep over the genes that fills every grouping and, with count_genes, scores the gene terms"""
+        groups = {name: defaultdict(list) for name in self.active.group_terms}
+        group_keys = [(groups[name], key_of) for name, key_of in self.active.group_keys]
+        for idx, gene in enumerate(genes):
+            if count_genes:
+                self._add_gene_terms(gene, 1)
+            for members_by_key, key_of in group_keys:
+                key = key_of(gene)
+                if key is not None:
+                    members_by_key[key].append(idx)
+        return groups
+
+    def _ensure_groups(self, genes: List[Gene]) -> None:
+        if self.groups is None:
+            self.groups = {name: {key: tuple(members) for key, members in members_by_key.items()}
+                           for name, members_by_key in self._index(genes, count_genes=False).items()}
+
+    def copy(self) -> 'FitnessTracker':
+        """Returns an independent tracker; costs one dict copy per grouping"""
+        clone = object.__new__(FitnessTracker)
+        clone.active = self.active
+        clone.groups = None if self.groups is None else {
+            name: dict(members_by_key) for name, members_by_key in self.groups.items()}
+        clone.counts = dict(self.counts)
+        return clone
+
+    @property
+    def penalty(self) -> int:
+        weights = self.active.weights
+        return sum(weights[name] * count for name, count in self.counts.items())
+
+    def update(self, genes: List[Gene], indices: List[int], changes: Dict) -> None:
+        """
+        Replaces the genes at the given indices with copies carrying the attribute changes
+        and re-scores only the groups those genes leave or join
+        """
+        self._ensure_groups(genes)
+        keys_of = self.active.keys_of
+        touched = set()
+        for idx in indices:
+            touched.update(keys_of(genes[idx]))
+
+        # Take the old groups out of the totals before their members change
+        for name, key in touched:
+            self._add_group_terms(name, genes, self.groups[name][key], -1)
+
+        for idx in indices:
+            gene = genes[idx]
+            self._add_gene_terms(gene, -1)
+            for name, key in keys_of(gene):
+                members = tuple(member for member in self.groups[name][key] if member != idx)
+                if members:
+                    self.groups[name][key] = members
+                else:
+                    del self.groups[name][key]
+            gene = gene.replace(**changes)
+            genes[idx] = gene
+            self._add_gene_terms(gene, 1)
+
+        joined = set()
+        for idx in indices:
+            joined.update(keys_of(genes[idx]))
+
+        # Groups that are only being joined have not been taken out of the totals yet
+        for name, key in joined - touched:
+            self._add_group_terms(name, genes, self.groups[name].get(key, ()), -1)
+
+        for idx in indices:
+            for name, key in keys_of(genes[idx]):
+                members = self.groups[name].get(key, ())
+                position = bisect.bisect(members, idx)
+                self.groups[name][key] = members[:position] + (idx,) + members[position:]
+
+        for name, key in touched | joined:
+            self._add_group_terms(name, genes, self.groups[name].get(key, ()), 1)
+
+    def penalty_delta(self, genes: List[Gene], moves: Dict[int, Dict]) -> int:
+        """
+        Returns how much the penalty would change if the gene at each index of `moves` got
+        that index's attribute changes, without applying them
+        """
+        self._ensure_groups(genes)
+        active = self.active
+        moved = {idx: genes[idx].replace(**changes) for idx, changes in moves.items()}
+        moved_keys = {idx: set(active.keys_of(gene)) for idx, gene in moved.items()}
+
+        delta = 0
+        touched = set()
+        for idx, gene in moved.items():
+            delta += active.gene_penalty(gene) - active.gene_penalty(genes[idx])
+            touched.update(active.keys_of(genes[idx]))
+            touched.update(moved_keys[idx])
+
+        for name, key in touched:
+            members = self.groups[name].get(key, ())
+            # Members stay in chromosome order, which the room consistency count depends on
+            after = sorted({idx for idx in members if idx not in moved}
+                           | {idx for idx, keys in moved_keys.items() if (name, key) in keys})
+            delta += (active.group_penalty(name, [moved.get(idx) or genes[idx] for idx in after])
+                      - active.group_penalty(name, [genes[idx] for idx in members]))
+        return delta
+
+    def breakdown(self) -> Dict[str, int]:
+        """Weighted penalty of every enabled constraint, in report order"""
+        weights = self.active.weights
+        return {name: weights[name] * count for name, count in self.counts.items()}
+
+    def _add_gene_terms(self, gene: Gene, sign: int) -> None:
+        counts = self.counts
+        for constraint, count_of in self.active.gene_terms:
+            count = count_of(gene)
+            if count:
+                counts[constraint] += sign * count
+
+    def _add_group_terms(self, name: str, genes: List[Gene], members: Sequence[int], sign: int) -> None:
+        if len(members) < 2:
+            return  # Group constraints are only counted on two sessions or more
+        group = [genes[idx] for idx in members]
+        # Every term of the grouping is derived from the same group, sorted at most once
+        needs_sort, terms = self.active.group_terms[name]
+        ordered = sorted(group, key=by_start_time) if needs_sort else group
+        counts = self.counts
+        for constraint, count_of, in_order in terms:
+            count = count_of(ordered if in_order else group)
+            if count:
+                counts[constraint] += sign * count
+
+
+def evaluate(genes: List[Gene],
+             active: Optional[constraints.CompiledConstraints] = None) -> Tuple[int, Dict[str, int]]:
+    """
+    Scores a schedule from scratch in one pass over its genes, returning the total penalty
+    and the weighted penalty of every enabled constraint
+    """
+    tracker = FitnessTracker(genes, active)
+    return tracker.penalty, tracker.breakdown()
@@ -1,27 +1,164 @@
-from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Hashable, List, Optional
 
 from models.resources import Day, Subject, SessionType
 
-@dataclass
+
+class ResourceTable:
+    """Append-only lookup table that interns resource IDs as small integer handles"""
+
+    __slots__ = ('ids', 'handles')
+
+    def __init__(self, *initial_ids: Hashable):
+        self.ids: List[Hashable] = []
+        self.handles: Dict[Hashable, int] = {}
+        for resource_id in initial_ids:
+            self.intern(resource_id)
+
+    def intern(self, resource_id: Hashable) -> int:
+        handle = self.handles.get(resource_id)
+        if handle is None:
+            handle = len(self.ids)
+            self.ids.append(resource_id)
+            self.handles[resource_id] = handle
+        return handle
+
+
+# Lookup tables shared by all genes of this process. Room handle 0 means "no room".
+SECTIONS = ResourceTable()
+SUBJECTS = ResourceTable()
+PROFESSORS = ResourceTable("TBA")
+ROOMS = ResourceTable(None)
+
+
+def register_resources(sections, subjects, professors, rooms) -> None:
+    """Interns the IDs of a problem instance up front so their handles are dense"""
+    for section in sections:
+        SECTIONS.intern(section.id)
+    for subject in subjects:
+        SUBJECTS.intern(subject.id)
+    for professor in professors:
+        PROFESSORS.intern(professor.id)
+    for room in rooms:
+        ROOMS.intern(room.id)
+
+
 class Gene:
-    # Represents a single scheduled session (a "gene" in the chromosome)
-    section_id: str          # ID of the student section (e.g., "COM231")
-    subject_id: str          # ID of the subject (e.g., "CCPHYS2L")
-    session_number: int      # Which session of the subject this gene represents (e.g., 1 or 2)
-    session_type: SessionType
-    professor_id: str        # ID of the assigned professor
-    room_id: str             # ID of the assigned room
-    day: Day                 # Day of the week the session is scheduled
-    start_time: float        # Start time of the session in 24-hour format (e.g., 13.5 for 1:30 PM)
-    duration: float          # Duration of the session in hours
+    # Represents a single scheduled session (a "gene" in the chromosome).
+    # Resource IDs are stored as integer handles into the lookup tables above and exposed
+    # again as *_id properties. Genes are shared between chromosomes and must not be
+    # modified in place; Chromosome.update_genes replaces them with modified copies.
+    __slots__ = ('section',         # Handle of the student section (e.g., "COM231")
+                 'subject',         # Handle of the subject (e.g., "CCPHYS2L")
+                 'session_number',  # Which session of the subject this gene represents (e.g., 1 or 2)
+                 'session_type',
+                 'professor',       # Handle of the assigned professor
+                 'room',            # Handle of the assigned room (0 for online sessions)
+                 'day',             # Day of the week the session is scheduled
+                 'day_index',       # day.value, kept in sync on assignment (cheaper to hash than the enum)
+                 'start_time',      # Start time of the session in 24-hour format (e.g., 13.5 for 1:30 PM)
+                 'duration',        # Duration of the session in hours
+                 'end_time')        # start_time + duration, kept in sync on assignment
+
+    def __init__(self,
+                 section_id: str,
+                 subject_id: str,
+                 session_number: int,
+                 session_type: SessionType,
+                 professor_id: str,
+                 room_id: Optional[str],
+                 day: Day,
+                 start_time: float,
+                 duration: float):
+        set_slot = object.__setattr__
+        set_slot(self, 'section', SECTIONS.intern(section_id))
+        set_slot(self, 'subject', SUBJECTS.intern(subject_id))
+        set_slot(self, 'session_number', session_number)
+        set_slot(self, 'session_type', session_type)
+        set_slot(self, 'professor', PROFESSORS.intern(professor_id))
+        set_slot(self, 'room', ROOMS.intern(room_id))
+        set_slot(self, 'day', day)
+        set_slot(self, 'day_index', day.value)
+        set_slot(self, 'start_time', start_time)
+        set_slot(self, 'duration', duration)
+        set_slot(self, 'end_time', start_time + duration)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == 'start_time' or name == 'duration':
+            object.__setattr__(self, 'end_time', self.start_time + self.duration)
+        elif name == 'day':
+            object.__setattr__(self, 'day_index', value.value)
+
+    @property
+    def section_id(self) -> str:
+        return SECTIONS.ids[self.section]
+
+    @section_id.setter
+    def section_id(self, value: str):
+        self.section = SECTIONS.intern(value)
 
     @property
-    def end_time(self) -> float:
+    def subject_id(self) -> str:
+        return SUBJECTS.ids[self.subject]
+
+    @subject_id.setter
+    def subject_id(self, value: str):
+        self.subject = SUBJECTS.intern(value)
+
+    @property
+    def professor_id(self) -> str:
+        return PROFESSORS.ids[self.professor]
+
+    @professor_id.setter
+    def professor_id(self, value: str):
+        self.professor = PROFESSORS.intern(value)
+
+    @property
+    def room_id(self) -> Optional[str]:
+        return ROOMS.ids[self.room]
+
+    @room_id.setter
+    def room_id(self, value: Optional[str]):
+        self.room = ROOMS.intern(value)
+
+    def replace(self, **changes) -> 'Gene':
         """
-        Returns the end time of the session by adding duration to start time.
+        Returns a copy of this gene with some attributes changed (e.g. day, start_time, room_id)
         """
-        return self.start_time + self.duration
+        gene = object.__new__(Gene)
+        set_slot = object.__setattr__
+        for slot in Gene.__slots__:
+            set_slot(gene, slot, getattr(self, slot))
+        for name, value in changes.items():
+            setattr(gene, name, value)
+        return gene
+
+    def key(self) -> tuple:
+        """Hashable tuple of all attributes; handles are only meaningful within this process"""
+        return (self.section, self.subject, self.session_number, self.session_type,
+                self.professor, self.room, self.day, self.start_time, self.duration)
+
+    def __eq__(self, other):
+        if other.__class__ is not Gene:
+            return NotImplemented
+        return (self.start_time == other.start_time and self.day is other.day
+                and self.professor == other.professor and self.room == other.room
+                and self.section == other.section and self.subject == other.subject
+                and self.session_number == other.session_number
+                and self.session_type is other.session_type and self.duration == other.duration)
+
+    __hash__ = None  # Genes compare by value
+
+    def __reduce__(self):
+        # Pickle by ID so genes can move between processes with different handles
+        return Gene, (self.section_id, self.subject_id, self.session_number, self.session_type,
+                      self.professor_id, self.room_id, self.day, self.start_time, self.duration)
+
+    def __repr__(self):
+        return (f"Gene(section_id={self.section_id!r}, subject_id={self.subject_id!r}, "
+                f"session_number={self.session_number!r}, session_type={self.session_type!r}, "
+                f"professor_id={self.professor_id!r}, room_id={self.room_id!r}, day={self.day!r}, "
+                f"start_time={self.start_time!r}, duration={self.duration!r})")
 
     def overlaps_with(self, other: 'Gene') -> bool:
         """
@@ -31,4 +168,3 @@ class Gene:
             return False
         return (self.start_time < other.end_time and
                 other.start_time < self.end_time)
-
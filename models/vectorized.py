@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models.chromosome import Chromosome
+from models.encoding import ProblemEncoding
+from models import constraints
+from models.resources import Day
+
+
+# Constraints penalty_terms can count: the defaults and the optional ones it counts on request
+VECTORIZED_CONSTRAINTS = ('professor_conflicts', 'room_conflicts', 'time_window', 'same_subject_same_day',
+                          'break_constraints', 'subject_spacing', 'subject_room', 'professor_breaks',
+                          'wed_sat_constraints', 'section_conflicts', 'subject_distribution')
+
+
+class PopulationArrays:
+    """
+    Structure-of-arrays view of a population: one (population, genes) column per gene field.
+    Row p holds chromosome p, with genes kept in chromosome order.
+    """
+
+    def __init__(self, encoding: ProblemEncoding, population: List[Chromosome]):
+        gene_counts = {len(chromosome.genes) for chromosome in population}
+        if len(gene_counts) > 1:
+            raise ValueError(f"Chromosomes must have the same number of genes, got {sorted(gene_counts)}")
+
+        self.encoding = encoding
+        records = np.array([encoding.encode(chromosome) for chromosome in population], dtype=np.float64)
+        if records.ndim != 3:
+            records = records.reshape(len(population), 0, 9)
+
+        codes = records[:, :, :7].astype(np.int64)
+        self.section = codes[:, :, 0]
+        self.subject = codes[:, :, 1]
+        self.session_number = codes[:, :, 2]
+        self.session_type = codes[:, :, 3]
+        self.professor = codes[:, :, 4]
+        self.room = codes[:, :, 5]
+        self.day = codes[:, :, 6]
+        self.start_time = records[:, :, 7]
+        self.duration = records[:, :, 8]
+
+    def __len__(self) -> int:
+        return self.start_time.shape[0]
+
+    def rows(self, start: int, stop: int) -> 'PopulationArrays':
+        """Returns a view of chromosomes start..stop-1"""
+        view = object.__new__(PopulationArrays)
+        for name, value in vars(self).items():
+            setattr(view, name, value[start:stop] if isinstance(value, np.ndarray) else value)
+        return view
+
+
+def _sort_rows(order: np.ndarray, *columns: np.ndarray) -> List[np.ndarray]:
+    """Reorders every row of the columns by `order` (e.g. from np.lexsort(..., axis=-1))"""
+    return [np.take_along_axis(column, order, axis=1) for column in columns]
+
+
+def _runs(sorted_key: np.ndarray):
+    """
+    For rows sorted by key: whether each position starts a run of equal keys,
+    and the position at which its run starts
+    """
+    first = np.ones(sorted_key.shape, dtype=bool)
+    first[:, 1:] = sorted_key[:, 1:] != sorted_key[:, :-1]
+    positions = np.broadcast_to(np.arange(sorted_key.shape[1]), sorted_key.shape)
+    run_start = np.maximum.accumulate(np.where(first, positions, 0), axis=1)
+    return first, run_start
+
+
+def _overlapping_pairs(key: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """
+    Number of overlapping session pairs sharing a (resource, day) key, per chromosome.
+    Sessions are sorted by (key, start time) and compared with the neighbours `offset`
+    places ahead, for growing offsets, until no session reaches that far (as the sweep
+    of count_overlapping_pairs stops at the first later session starting after it ends).
+    """
+    key, start, end = _sort_rows(np.lexsort((start, key), axis=-1), key, start, end)
+    conflicts = np.zeros(key.shape[0], dtype=np.int64)
+    for offset in range(1, key.shape[1]):
+        reaches = (key[:, offset:] == key[:, :-offset]) & (start[:, offset:] < end[:, :-offset])
+        if not reaches.any():
+            break
+        conflicts += (reaches & (start[:, :-offset] < end[:, offset:])).sum(axis=1)
+    return conflicts
+
+
+def _room_changes(session_group: np.ndarray, session_key: np.ndarray, room: np.ndarray,
+                  gene_index: np.ndarray) -> np.ndarray:
+    """
+    count_room_changes summed over the (section, subject, session type) groups, per chromosome:
+    sessions whose room differs from the first session with the same number, plus the pairs
+    of distinct rooms among those first sessions
+    """
+    # Same session key in chromosome order: the first of each run is the first seen
+    session_group, session_key, room = _sort_rows(np.lexsort((gene_index, session_key), axis=-1),
+                                                  session_group, session_key, room)
+    is_first, run_start = _runs(session_key)
+    mismatches = (room != np.take_along_axis(room, run_start, axis=1)).sum(axis=1)
+
+    # Distinct (group, room) pairs among the first sessions; later sessions get group -1
+    group = np.where(is_first, session_group, -1)
+    group, room = _sort_rows(np.lexsort((room, group), axis=-1), group, room)
+    new_group, group_start = _runs(group)
+    distinct = (new_group | _runs(room)[0]) & (group >= 0)
+    # Every distinct room pairs with the distinct rooms before it in its group
+    seen = np.cumsum(distinct, axis=1)
+    before_group = np.take_along_axis(seen - distinct, group_start, axis=1)
+    return mismatches + (distinct * (seen - 1 - before_group)).sum(axis=1)
+
+
+def penalty_terms(arrays: PopulationArrays, names: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+    """
+    Vectorized violation counts of the default fitness constraints, plus those of `names`
+    among the optional ones, one value per chromosome. Gives the same counts as
+    Chromosome.violation_counts.
+    """
+    encoding = arrays.encoding
+    day = arrays.day
+    start = arrays.start_time
+    end = start + arrays.duration
+    n_days = len(Day)
+    gene_index = np.broadcast_to(np.arange(start.shape[1]), start.shape)
+
+    section_subject = arrays.section * len(encoding.subject_ids) + arrays.subject
+    professor_day = arrays.professor * n_days + day
+    # Genes without a room get a negative key of their own so they never pair up
+    room_day = np.where(arrays.room > 0, arrays.room * n_days + day, -1 - gene_index)
+
+    # Sessions sorted by (section, subject, day)
+    subject_days = np.sort(section_subject * n_days + day, axis=1)
+
+    # Same subject on the same day: genes beyond the first of each (section, subject, day)
+    same_subject_same_day = (subject_days[:, 1:] == subject_days[:, :-1]).sum(axis=1)
+
+    # Subject spacing: sessions of a section's subject on back-to-back days
+    same_group = (subject_days[:, 1:] // n_days) == (subject_days[:, :-1] // n_days)
+    subject_spacing = (same_group & (np.diff(subject_days, axis=1) == 1)).sum(axis=1)
+
+    # Subject room: per (section, subject, session type), the first room seen for each
+    # session number must be shared by every session
+    session_group = section_subject * len(encoding.session_types) + arrays.session_type
+    session_key = session_group * (int(arrays.session_number.max(initial=0)) + 1) + arrays.session_number
+    subject_room = _room_changes(session_group, session_key, arrays.room, gene_index)
+
+    # Professor breaks: back-to-back sessions of a professor's day, ordered by start time
+    sorted_key, sorted_start, sorted_end = _sort_rows(np.lexsort((gene_index, start, professor_day), axis=-1),
+                                                      professor_day, start, end)
+    back_to_back = (sorted_key[:, 1:] == sorted_key[:, :-1]) & (sorted_start[:, 1:] - sorted_end[:, :-1] == 0)
+
+    terms = {
+        'professor_conflicts': _overlapping_pairs(professor_day, start, end),
+        'room_conflicts': _overlapping_pairs(room_day, start, end),
+        'time_window': ((start < 7.0) | (start > 21.0)).sum(axis=1),
+        'same_subject_same_day': same_subject_same_day,
+        'break_constraints': (((12.0 < start) & (start < 13.0)) | ((12.0 < end) & (end <= 13.0))).sum(axis=1),
+        'subject_spacing': subject_spacing,
+        'subject_room': subject_room,
+        'professor_breaks': back_to_back.sum(axis=1),
+        'wed_sat_constraints': ((day == Day.WEDNESDAY.value) | (day == Day.SATURDAY.value)).sum(axis=1),
+    }
+
+    section_day = arrays.section * n_days + day
+    if 'section_conflicts' in names:
+        terms['section_conflicts'] = _overlapping_pairs(section_day, start, end)
+    if 'subject_distribution' in names:
+        # Sessions per (chromosome, section, day); sections without sessions are never uneven
+        cells = len(encoding.section_ids) * n_days
+        row_offset = np.arange(len(arrays))[:, None] * cells
+        day_counts = np.bincount((row_offset + section_day).ravel(), minlength=len(arrays) * cells)
+        day_counts = day_counts.reshape(len(arrays), len(encoding.section_ids), n_days)
+        terms['subject_distribution'] = (day_counts.max(axis=2) - day_counts.min(axis=2) > 2).sum(axis=1)
+    return terms
+
+
+def population_penalties(arrays: PopulationArrays, chunk_size: int = 64,
+                         active: Optional[constraints.CompiledConstraints] = None) -> np.ndarray:
+    """
+    Scores a whole population at once with `active` (default: the registry's constraints),
+    returning the penalty of each chromosome.
+    Chromosomes are processed in chunks to bound the size of the temporary (P, G) arrays.
+    """
+    weights = (active if active is not None else constraints.ACTIVE).weights
+    penalties = np.zeros(len(arrays), dtype=np.int64)
+    for first in range(0, len(arrays), chunk_size):
+        chunk = arrays.rows(first, first + chunk_size)
+        terms = penalty_terms(chunk, tuple(weights))
+        missing = set(weights) - set(terms)
+        if missing:
+            raise ValueError(f"Constraints {sorted(missing)} have no vectorized evaluation")
+        for name, weight in weights.items():
+            penalties[first:first + chunk_size] += weight * terms[name]
+    return penalties
+
+
+def population_fitness(arrays: PopulationArrays, chunk_size: int = 64,
+                       active: Optional[constraints.CompiledConstraints] = None) -> np.ndarray:
+    """Fitness of each chromosome, as in Chromosome.calculate_fitness"""
+    return 1000.0 / (1000.0 + population_penalties(arrays, chunk_size, active))
@@ -0,0 +1,208 @@
+import csv
+import json
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Columns of a session record, in export order
+SESSION_FIELDS = ('section_id', 'subject_id', 'session_number', 'session_type', 'professor_id',
+                  'room_id', 'day', 'start_time', 'end_time', 'duration')
+
+# Array type of every column in the columnar file; 'I' columns are codes into a dictionary
+COLUMN_TYPES = {
+    'section_id': 'I', 'subject_id': 'I', 'session_number': 'i', 'session_type': 'I',
+    'professor_id': 'I', 'room_id': 'I', 'day': 'I',
+    'start_time': 'd', 'end_time': 'd', 'duration': 'd',
+}
+DICTIONARY_COLUMNS = tuple(name for name in SESSION_FIELDS if COLUMN_TYPES[name] == 'I')
+
+COLUMNAR_MAGIC = b'GSCOL'
+COLUMNAR_VERSION = 1
+ROW_GROUP_SIZE = 65536  # Sessions held in memory at once by the columnar writer
+
+_FOOTER_LENGTH = struct.Struct('<Q')
+
+
+def session_records(chromosome) -> Iterator[Dict]:
+    """Yields one record per scheduled session, with plain string and number values"""
+    for gene in chromosome.genes:
+        yield {
+            'section_id': gene.section_id,
+            'subject_id': gene.subject_id,
+            'session_number': gene.session_number,
+            'session_type': gene.session_type.value,
+            'professor_id': gene.professor_id,
+            'room_id': gene.room_id,
+            'day': gene.day.name,
+            'start_time': gene.start_time,
+            'end_time': gene.end_time,
+            'duration': gene.duration,
+        }
+
+
+def schedule_metadata(chromosome, run: Optional[Dict] = None) -> Dict:
+    """Fitness, penalty breakdown and size of the schedule, plus the caller's run metadata (e.g. seed)"""
+    breakdown = chromosome.penalty_breakdown()
+    return {
+        'generated_on': datetime.now().isoformat(timespec='seconds'),
+        'fitness': chromosome.fitness,
+        'total_penalty': sum(breakdown.values()),
+        'penalty_breakdown': breakdown,
+        'sessions': len(chromosome.genes),
+        'run': dict(run or {}),
+    }
+
+
+def export_jsonl(chromosome, path: str, run: Optional[Dict] = None) -> None:
+    """
+    Writes the schedule as JSON lines: a {"type": "metadata"} record first,
+    then one {"type": "session"} record per session
+    """
+    with open(path, 'w') as f:
+        f.write(json.dumps({'type': 'metadata', **schedule_metadata(chromosome, run)}) + '\n')
+        for record in session_records(chromosome):
+            f.write(json.dumps({'type': 'session', **record}) + '\n')
+
+
+def export_csv(chromosome, path: str, run: Optional[Dict] = None) -> str:
+    """
+    Writes one CSV row per session, and the metadata to a JSON file next to it
+    (same name with a '.meta.json' extension), whose path is returned
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SESSION_FIELDS)
+        writer.writeheader()
+        writer.writerows(session_records(chromosome))
+
+    metadata_path = os.path.splitext(path)[0] + '.meta.json'
+    with open(metadata_path, 'w') as f:
+        json.dump(schedule_metadata(chromosome, run), f, indent=2)
+    return metadata_path
+
+
+def _to_little_endian(column: array) -> bytes:
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+def export_columnar(chromosome, path: str, run: Optional[Dict] = None,
+                    row_group_size: int = ROW_GROUP_SIZE) -> None:
+    """
+    Writes the sessions in a compact column-oriented binary file, in row groups of
+    `row_group_size` sessions. Strings are stored as codes into per-column dictionaries.
+
+    Layout: magic and version, then the column arrays of every row group one after the
+    other (little-endian), then a JSON footer holding the metadata, the column types,
+    the dictionaries and the row counts and byte offsets of each row group, then the
+    footer length (8 bytes) and the magic again. read_columnar reads it back.
+    """
+    dictionaries: Dict[str, Dict] = {name: {} for name in DICTIONARY_COLUMNS}
+    row_groups = []
+
+    with open(path, 'wb') as f:
+        f.write(COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION]))
+
+        def flush(columns: Dict[str, array], rows: int) -> None:
+            offsets = []
+            for name in SESSION_FIELDS:
+                offsets.append(f.tell())
+                f.write(_to_little_endian(columns[name]))
+            row_groups.append({'rows': rows, 'offsets': offsets})
+
+        columns = {name: array(COLUMN_TYPES[name]) for name in SESSION_FIELDS}
+        rows = 0
+        for record in session_records(chromosome):
+            for name in SESSION_FIELDS:
+                value = record[name]
+                if name in dictionaries:
+                    codes = dictionaries[name]
+                    code = codes.get(value)
+                    if code is None:
+                        code = codes[value] = len(codes)
+                    value = code
+                columns[name].append(value)
+            rows += 1
+            if rows == row_group_size:
+                flush(columns, rows)
+                columns = {name: array(COLUMN_TYPES[name]) for name in SESSION_FIELDS}
+                rows = 0
+        if rows or not row_groups:
+            flush(columns, rows)
+
+        footer = json.dumps({
+            'metadata': schedule_metadata(chromosome, run),
+            'columns': [[name, COLUMN_TYPES[name]] for name in SESSION_FIELDS],
+            'dictionaries': {name: list(codes) for name, codes in dictionaries.items()},
+            'row_groups': row_groups,
+        }).encode()
+        f.write(footer)
+        f.write(_FOOTER_LENGTH.pack(len(footer)))
+        f.write(COLUMNAR_MAGIC)
+
+
+def read_columnar(path: str, columns: Optional[List[str]] = None) -> Tuple[Dict, Dict[str, list]]:
+    """
+    Reads a file written by export_columnar and returns (metadata, {column: values}),
+    with dictionary codes decoded. With `columns`, only those columns are read.
+    Raises ValueError if the file is not one, or is truncated or corrupt.
+    """
+    header_size = len(COLUMNAR_MAGIC) + 1
+    trailer_size = _FOOTER_LENGTH.size + len(COLUMNAR_MAGIC)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        header = f.read(header_size)
+        if len(header) < header_size or header[:-1] != COLUMNAR_MAGIC or header[-1] != COLUMNAR_VERSION:
+            raise ValueError(f"{path} is not a version {COLUMNAR_VERSION} columnar schedule file")
+        if size < header_size + trailer_size:
+            raise ValueError(f"{path} is truncated")
+        f.seek(-trailer_size, os.SEEK_END)
+        footer_length = _FOOTER_LENGTH.unpack(f.read(_FOOTER_LENGTH.size))[0]
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC or footer_length > size - header_size - trailer_size:
+            raise ValueError(f"{path} is truncated")
+        # Column data lies between the header and the footer
+        data_end = size - trailer_size - footer_length
+        f.seek(data_end)
+        try:
+            footer = json.loads(f.read(footer_length))
+            types = dict(footer['columns'])
+            names = [name for name, _ in footer['columns']]
+            row_groups = footer['row_groups']
+            dictionaries, metadata = footer['dictionaries'], footer['metadata']
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Corrupt columnar schedule file {path}: {e}") from e
+
+        wanted = names if columns is None else columns
+        unknown = set(wanted) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown columns {sorted(unknown)}, expected some of {names}")
+
+        result = {}
+        for name in wanted:
+            position = names.index(name)
+            typecode = types[name]
+            itemsize = array(typecode).itemsize
+            values = array(typecode)
+            for group in row_groups:
+                offset, length = group['offsets'][position], group['rows'] * itemsize
+                if offset < header_size or offset + length > data_end:
+                    raise ValueError(f"Corrupt columnar schedule file {path}: column {name} "
+                                     f"lies outside the data")
+                f.seek(offset)
+                values.extend(_from_little_endian(typecode, f.read(length)))
+            dictionary = dictionaries.get(name)
+            result[name] = [dictionary[code] for code in values] if dictionary is not None else values.tolist()
+
+    return metadata, result
@@ -3,245 +3,250 @@ from typing import List, Dict
 from collections import defaultdict
 from datetime import datetime
 
+# Write buffer of each report file
+REPORT_BUFFER_SIZE = 1 << 16
 
-def print_schedule_to_file(chromosome, output_filename="schedule_output.txt"):
-    if not chromosome:
-        with open(output_filename, 'w') as f:
-            f.write("No valid schedule found\n")
-        return
 
-    # Calculate penalty breakdown
-    penalty_breakdown = {
-        'professor_conflicts': 100 * chromosome._check_professor_conflicts(),
-        'room_conflicts': 100 * chromosome._check_room_conflicts(),
-        'time_window': 100 * chromosome._check_time_window(),
-        'same_subject_same_day': 100 * chromosome._check_same_subject_same_day(),
-        'break_constraints': 50 * chromosome._check_break_constraints(),
-        'subject_spacing': 50 * chromosome.check_subject_spacing_violations(),
-        'subject_room': 20 * chromosome._check_subject_room(),
-        'professor_breaks': 50 * chromosome._check_professor_breaks(),
-        'wed_sat_constraints': 40 * chromosome._check_wednesday_saturday_constraints()
-    }
-    total_penalty = sum(penalty_breakdown.values())
-
-    # Track TBA assignments
-    tba_subjects = set()
-
-    # Group genes by section
-    schedule_by_section = defaultdict(list)
-    for gene in chromosome.genes:
-        schedule_by_section[gene.section_id].append(gene)
-        if gene.professor_id == "TBA":
-            tba_subjects.add(gene.subject_id)
-
-    # Write to file
-    with open(output_filename, 'w') as f:
-        # Write header with timestamp
-        f.write("=" * 60 + "\n")
-        f.write("AUTOMATED SCHEDULE REPORT\n")
-        f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("=" * 60 + "\n\n")
-
-        # Write schedule summary
-        f.write("SCHEDULE SUMMARY\n")
-        f.write("-" * 20 + "\n")
-        f.write(f"Fitness Score: {chromosome.fitness:.4f}\n")
-        f.write(f"Total Penalty: {total_penalty}\n\n")
-
-        # Write penalty breakdown
-        f.write("PENALTY BREAKDOWN\n")
-        f.write("-" * 20 + "\n")
-        for constraint, value in penalty_breakdown.items():
-            constraint_name = constraint.replace('_', ' ').title()
-            f.write(f"{constraint_name:<25}: {value}\n")
-        f.write("\n")
+def _clock(hours: float) -> str:
+    return f"{int(hours):02d}:{int((hours % 1) * 60):02d}"
 
-        # Write detailed schedule by section
-        f.write("DETAILED SCHEDULE BY SECTION\n")
-        f.write("=" * 40 + "\n\n")
 
-        for section_id in sorted(schedule_by_section.keys()):
-            f.write(f"Section {section_id}\n")
-            f.write("-" * (len(section_id) + 8) + "\n")
+def _by_day_and_time(entry) -> tuple:
+    gene = entry[0]
+    return gene.day.value, gene.start_time
 
-            # Sort by day and then by time
-            section_genes = sorted(schedule_by_section[section_id],
-                                   key=lambda g: (g.day.value, g.start_time))
 
-            if not section_genes:
-                f.write("  No classes scheduled\n\n")
-                continue
+class ScheduleIndex:
+    """
+    Everything the reports need from a chromosome, gathered in a single pass over its genes:
+    the penalty breakdown (from the chromosome's fitness counters), the classes of every
+    section, professor and room in day and time order, and the formatted time of every class.
+    Build it once and pass it to each report to avoid regrouping the genes for every view.
+    """
 
-            for gene in section_genes:
-                start_time = f"{int(gene.start_time):02d}:{int((gene.start_time % 1) * 60):02d}"
-                end_time = f"{int(gene.end_time):02d}:{int((gene.end_time % 1) * 60):02d}"
-                room_info = f"Room: {gene.room_id}" if gene.room_id else "Online"
+    def __init__(self, chromosome):
+        self.chromosome = chromosome
+        self.penalty_breakdown = chromosome.penalty_breakdown()
+        self.total_penalty = sum(self.penalty_breakdown.values())
+        self.generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-                prof_display = gene.professor_id if gene.professor_id != "TBA" else "TBA (No qualified professor)"
+        # Entries are (gene, "HH:MM-HH:MM")
+        by_section = defaultdict(list)
+        by_professor = defaultdict(list)
+        by_room = defaultdict(list)
+        self.tba_assignments = []
+        self.online_classes = []
+        self.tba_subjects = set()
+        self.classes_by_day = defaultdict(int)
+        for gene in chromosome.genes:
+            entry = (gene, f"{_clock(gene.start_time)}-{_clock(gene.end_time)}")
+            by_section[gene.section_id].append(entry)
+            if gene.professor_id == "TBA":
+                self.tba_subjects.add(gene.subject_id)
+                self.tba_assignments.append(entry)
+            elif gene.professor_id:
+                by_professor[gene.professor_id].append(entry)
+            if gene.room_id:
+                by_room[gene.room_id].append(entry)
+            else:
+                self.online_classes.append(entry)
+            self.classes_by_day[gene.day.name] += 1
+
+        self.by_section = {section_id: sorted(by_section[section_id], key=_by_day_and_time)
+                           for section_id in sorted(by_section)}
+        self.by_professor = {professor_id: sorted(by_professor[professor_id], key=_by_day_and_time)
+                             for professor_id in sorted(by_professor)}
+        self.by_room = {room_id: sorted(by_room[room_id], key=_by_day_and_time)
+                        for room_id in sorted(by_room)}
+        self.tba_assignments.sort(key=lambda entry: (entry[0].section_id, entry[0].subject_id))
+        self.online_classes.sort(key=_by_day_and_time)
+
+
+def _write_missing_schedule(output_filename):
+    with open(output_filename, 'w') as f:
+        f.write("No valid schedule found\n")
 
-                f.write(f"  {gene.day.name:<9} | {start_time}-{end_time} | {gene.subject_id:<12} "
-                        f"({gene.session_number}) | Prof: {prof_display:<20} | {room_info}\n")
 
-            f.write("\n")
+def _write_header(f, title, index):
+    f.write("=" * 60 + "\n")
+    f.write(f"{title}\n")
+    f.write(f"Generated on: {index.generated_on}\n")
+    f.write("=" * 60 + "\n\n")
 
-        # Write TBA assignments summary
-        if tba_subjects:
-            f.write("SUBJECTS REQUIRING PROFESSOR ASSIGNMENT\n")
-            f.write("=" * 40 + "\n")
-            f.write("The following subjects have been scheduled but need professors to be assigned:\n\n")
-            for subject_id in sorted(tba_subjects):
-                f.write(f"  - {subject_id}\n")
-            f.write(f"\nTotal subjects needing professors: {len(tba_subjects)}\n\n")
 
-        # Write additional statistics
-        f.write("SCHEDULE STATISTICS\n")
-        f.write("-" * 20 + "\n")
-        total_classes = len(chromosome.genes)
-        total_sections = len(schedule_by_section)
-        classes_per_section = total_classes / total_sections if total_sections > 0 else 0
+def write_section_report(f, index: ScheduleIndex):
+    """Writes the schedule of every section, with the penalty breakdown and statistics"""
+    _write_header(f, "AUTOMATED SCHEDULE REPORT", index)
 
-        f.write(f"Total Classes Scheduled: {total_classes}\n")
-        f.write(f"Total Sections: {total_sections}\n")
-        f.write(f"Average Classes per Section: {classes_per_section:.1f}\n")
+    # Write schedule summary
+    f.write("SCHEDULE SUMMARY\n")
+    f.write("-" * 20 + "\n")
+    f.write(f"Fitness Score: {index.chromosome.fitness:.4f}\n")
+    f.write(f"Total Penalty: {index.total_penalty}\n\n")
 
-        # Count classes by day
-        classes_by_day = defaultdict(int)
-        for gene in chromosome.genes:
-            classes_by_day[gene.day.name] += 1
+    # Write penalty breakdown
+    f.write("PENALTY BREAKDOWN\n")
+    f.write("-" * 20 + "\n")
+    for constraint, value in index.penalty_breakdown.items():
+        constraint_name = constraint.replace('_', ' ').title()
+        f.write(f"{constraint_name:<25}: {value}\n")
+    f.write("\n")
 
-        f.write("\nClasses by Day:\n")
-        for day, count in sorted(classes_by_day.items()):
-            f.write(f"  {day}: {count} classes\n")
+    # Write detailed schedule by section
+    f.write("DETAILED SCHEDULE BY SECTION\n")
+    f.write("=" * 40 + "\n\n")
 
-    print(f"Schedule has been written to: {output_filename}")
-    print(f"File location: {os.path.abspath(output_filename)}")
+    for section_id, section_genes in index.by_section.items():
+        f.write(f"Section {section_id}\n")
+        f.write("-" * (len(section_id) + 8) + "\n")
 
+        for gene, time_range in section_genes:
+            room_info = f"Room: {gene.room_id}" if gene.room_id else "Online"
+            prof_display = gene.professor_id if gene.professor_id != "TBA" else "TBA (No qualified professor)"
 
-def print_schedule_by_professor_to_file(chromosome, output_filename="professor_schedule.txt"):
+            f.write(f"  {gene.day.name:<9} | {time_range} | {gene.subject_id:<12} "
+                    f"({gene.session_number}) | Prof: {prof_display:<20} | {room_info}\n")
 
-    if not chromosome:
-        with open(output_filename, 'w') as f:
-            f.write("No valid schedule found\n")
-        return
+        f.write("\n")
 
-    # Group genes by professor
-    schedule_by_professor = defaultdict(list)
-    for gene in chromosome.genes:
-        if gene.professor_id and gene.professor_id != "TBA":
-            schedule_by_professor[gene.professor_id].append(gene)
+    # Write TBA assignments summary
+    tba_subjects = index.tba_subjects
+    if tba_subjects:
+        f.write("SUBJECTS REQUIRING PROFESSOR ASSIGNMENT\n")
+        f.write("=" * 40 + "\n")
+        f.write("The following subjects have been scheduled but need professors to be assigned:\n\n")
+        for subject_id in sorted(tba_subjects):
+            f.write(f"  - {subject_id}\n")
+        f.write(f"\nTotal subjects needing professors: {len(tba_subjects)}\n\n")
+
+    # Write additional statistics
+    f.write("SCHEDULE STATISTICS\n")
+    f.write("-" * 20 + "\n")
+    total_classes = len(index.chromosome.genes)
+    total_sections = len(index.by_section)
+    classes_per_section = total_classes / total_sections if total_sections > 0 else 0
+
+    f.write(f"Total Classes Scheduled: {total_classes}\n")
+    f.write(f"Total Sections: {total_sections}\n")
+    f.write(f"Average Classes per Section: {classes_per_section:.1f}\n")
+
+    f.write("\nClasses by Day:\n")
+    for day, count in sorted(index.classes_by_day.items()):
+        f.write(f"  {day}: {count} classes\n")
+
+
+def write_professor_report(f, index: ScheduleIndex):
+    """Writes the schedule of every professor, then the classes without one"""
+    _write_header(f, "PROFESSOR SCHEDULE REPORT", index)
+
+    for professor_id, professor_genes in index.by_professor.items():
+        f.write(f"Professor: {professor_id}\n")
+        f.write("-" * (len(professor_id) + 11) + "\n")
+
+        # Calculate total hours for this professor
+        total_hours = sum(gene.duration for gene, _ in professor_genes)
+        f.write(f"Total Weekly Hours: {total_hours:.1f}\n\n")
+
+        for gene, time_range in professor_genes:
+            room_info = f"Room: {gene.room_id}" if gene.room_id else "Online"
+            f.write(f"  {gene.day.name:<9} | {time_range} | {gene.subject_id:<12} "
+                    f"| Section: {gene.section_id:<8} | {room_info}\n")
 
-    # Separate TBA assignments
-    tba_assignments = [gene for gene in chromosome.genes if gene.professor_id == "TBA"]
+        f.write("\n")
 
-    with open(output_filename, 'w') as f:
-        # Write header
-        f.write("=" * 60 + "\n")
-        f.write("PROFESSOR SCHEDULE REPORT\n")
-        f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("=" * 60 + "\n\n")
+    # Write TBA assignments
+    if index.tba_assignments:
+        f.write("UNASSIGNED CLASSES (TBA)\n")
+        f.write("=" * 25 + "\n")
+        f.write("The following classes need professor assignment:\n\n")
 
-        # Write schedule by professor
-        for professor_id in sorted(schedule_by_professor.keys()):
-            f.write(f"Professor: {professor_id}\n")
-            f.write("-" * (len(professor_id) + 11) + "\n")
+        for gene, time_range in index.tba_assignments:
+            room_info = f"Room: {gene.room_id}" if gene.room_id else "Online"
+            f.write(f"  {gene.day.name:<9} | {time_range} | {gene.subject_id:<12} "
+                    f"| Section: {gene.section_id:<8} | {room_info}\n")
 
-            # Sort by day and then by time
-            professor_genes = sorted(schedule_by_professor[professor_id],
-                                     key=lambda g: (g.day.value, g.start_time))
 
-            # Calculate total hours for this professor
-            total_hours = sum(gene.duration for gene in professor_genes)
-            f.write(f"Total Weekly Hours: {total_hours:.1f}\n\n")
+def write_room_report(f, index: ScheduleIndex):
+    """Writes the schedule and utilization of every room, then the online classes"""
+    _write_header(f, "ROOM UTILIZATION REPORT", index)
 
-            for gene in professor_genes:
-                start_time = f"{int(gene.start_time):02d}:{int((gene.start_time % 1) * 60):02d}"
-                end_time = f"{int(gene.end_time):02d}:{int((gene.end_time % 1) * 60):02d}"
-                room_info = f"Room: {gene.room_id}" if gene.room_id else "Online"
+    for room_id, room_genes in index.by_room.items():
+        f.write(f"Room: {room_id}\n")
+        f.write("-" * (len(room_id) + 6) + "\n")
 
-                f.write(f"  {gene.day.name:<9} | {start_time}-{end_time} | {gene.subject_id:<12} "
-                        f"| Section: {gene.section_id:<8} | {room_info}\n")
+        # Calculate utilization
+        total_hours = sum(gene.duration for gene, _ in room_genes)
+        f.write(f"Total Weekly Hours: {total_hours:.1f}\n")
+        f.write(f"Number of Classes: {len(room_genes)}\n\n")
 
-            f.write("\n")
+        for gene, time_range in room_genes:
+            prof_display = gene.professor_id if gene.professor_id != "TBA" else "TBA"
+            f.write(f"  {gene.day.name:<9} | {time_range} | {gene.subject_id:<12} "
+                    f"| Section: {gene.section_id:<8} | Prof: {prof_display}\n")
 
-        # Write TBA assignments
-        if tba_assignments:
-            f.write("UNASSIGNED CLASSES (TBA)\n")
-            f.write("=" * 25 + "\n")
-            f.write("The following classes need professor assignment:\n\n")
+        f.write("\n")
 
-            for gene in sorted(tba_assignments, key=lambda g: (g.section_id, g.subject_id)):
-                start_time = f"{int(gene.start_time):02d}:{int((gene.start_time % 1) * 60):02d}"
-                end_time = f"{int(gene.end_time):02d}:{int((gene.end_time % 1) * 60):02d}"
-                room_info = f"Room: {gene.room_id}" if gene.room_id else "Online"
+    # Write online classes
+    if index.online_classes:
+        f.write("ONLINE CLASSES\n")
+        f.write("=" * 15 + "\n")
+        f.write("Classes that don't require a physical room:\n\n")
+
+        for gene, time_range in index.online_classes:
+            prof_display = gene.professor_id if gene.professor_id != "TBA" else "TBA"
+            f.write(f"  {gene.day.name:<9} | {time_range} | {gene.subject_id:<12} "
+                    f"| Section: {gene.section_id:<8} | Prof: {prof_display}\n")
+
+
+def write_schedule_reports(chromosome, section_filename="schedule_output.txt",
+                           professor_filename="professor_schedule.txt",
+                           room_filename="room_schedule.txt"):
+    """Writes the section, professor and room reports from a single index of the chromosome"""
+    index = ScheduleIndex(chromosome) if chromosome else None
+    for writer, output_filename, label in ((write_section_report, section_filename, "Schedule"),
+                                           (write_professor_report, professor_filename, "Professor schedule"),
+                                           (write_room_report, room_filename, "Room schedule")):
+        if index is None:
+            _write_missing_schedule(output_filename)
+            continue
+        with open(output_filename, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+            writer(f, index)
+        print(f"{label} has been written to: {output_filename}")
+        print(f"File location: {os.path.abspath(output_filename)}")
+
+
+def print_schedule_to_file(chromosome, output_filename="schedule_output.txt", index: ScheduleIndex = None):
+    if not chromosome:
+        _write_missing_schedule(output_filename)
+        return
 
-                f.write(f"  {gene.day.name:<9} | {start_time}-{end_time} | {gene.subject_id:<12} "
-                        f"| Section: {gene.section_id:<8} | {room_info}\n")
+    with open(output_filename, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+        write_section_report(f, index or ScheduleIndex(chromosome))
 
-    print(f"Professor schedule has been written to: {output_filename}")
+    print(f"Schedule has been written to: {output_filename}")
     print(f"File location: {os.path.abspath(output_filename)}")
 
 
-def print_schedule_by_room_to_file(chromosome, output_filename="room_schedule.txt"):
-
+def print_schedule_by_professor_to_file(chromosome, output_filename="professor_schedule.txt",
+                                        index: ScheduleIndex = None):
     if not chromosome:
-        with open(output_filename, 'w') as f:
-            f.write("No valid schedule found\n")
+        _write_missing_schedule(output_filename)
         return
 
-    # Group genes by room
-    schedule_by_room = defaultdict(list)
-    online_classes = []
+    with open(output_filename, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+        write_professor_report(f, index or ScheduleIndex(chromosome))
 
-    for gene in chromosome.genes:
-        if gene.room_id:
-            schedule_by_room[gene.room_id].append(gene)
-        else:
-            online_classes.append(gene)
+    print(f"Professor schedule has been written to: {output_filename}")
+    print(f"File location: {os.path.abspath(output_filename)}")
 
-    with open(output_filename, 'w') as f:
-        # Write header
-        f.write("=" * 60 + "\n")
-        f.write("ROOM UTILIZATION REPORT\n")
-        f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("=" * 60 + "\n\n")
-
-        # Write schedule by room
-        for room_id in sorted(schedule_by_room.keys()):
-            f.write(f"Room: {room_id}\n")
-            f.write("-" * (len(room_id) + 6) + "\n")
-
-            # Sort by day and then by time
-            room_genes = sorted(schedule_by_room[room_id],
-                                key=lambda g: (g.day.value, g.start_time))
-
-            # Calculate utilization
-            total_hours = sum(gene.duration for gene in room_genes)
-            f.write(f"Total Weekly Hours: {total_hours:.1f}\n")
-            f.write(f"Number of Classes: {len(room_genes)}\n\n")
-
-            for gene in room_genes:
-                start_time = f"{int(gene.start_time):02d}:{int((gene.start_time % 1) * 60):02d}"
-                end_time = f"{int(gene.end_time):02d}:{int((gene.end_time % 1) * 60):02d}"
-                prof_display = gene.professor_id if gene.professor_id != "TBA" else "TBA"
-
-                f.write(f"  {gene.day.name:<9} | {start_time}-{end_time} | {gene.subject_id:<12} "
-                        f"| Section: {gene.section_id:<8} | Prof: {prof_display}\n")
-
-            f.write("\n")
-
-        # Write online classes
-        if online_classes:
-            f.write("ONLINE CLASSES\n")
-            f.write("=" * 15 + "\n")
-            f.write("Classes that don't require a physical room:\n\n")
-
-            for gene in sorted(online_classes, key=lambda g: (g.day.value, g.start_time)):
-                start_time = f"{int(gene.start_time):02d}:{int((gene.start_time % 1) * 60):02d}"
-                end_time = f"{int(gene.end_time):02d}:{int((gene.end_time % 1) * 60):02d}"
-                prof_display = gene.professor_id if gene.professor_id != "TBA" else "TBA"
-
-                f.write(f"  {gene.day.name:<9} | {start_time}-{end_time} | {gene.subject_id:<12} "
-                        f"| Section: {gene.section_id:<8} | Prof: {prof_display}\n")
+
+def print_schedule_by_room_to_file(chromosome, output_filename="room_schedule.txt", index: ScheduleIndex = None):
+    if not chromosome:
+        _write_missing_schedule(output_filename)
+        return
+
+    with open(output_filename, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+        write_room_report(f, index or ScheduleIndex(chromosome))
 
     print(f"Room schedule has been written to: {output_filename}")
     print(f"File location: {os.path.abspath(output_filename)}")
@@ -249,9 +254,10 @@ def print_schedule_by_room_to_file(chromosome, output_filename="room_schedule.tx
 
 def generate_all_schedule_reports(chromosome, base_filename="schedule"):
 
-    print_schedule_to_file(chromosome, f"{base_filename}_by_section.txt")
-    print_schedule_by_professor_to_file(chromosome, f"{base_filename}_by_professor.txt")
-    print_schedule_by_room_to_file(chromosome, f"{base_filename}_by_room.txt")
+    write_schedule_reports(chromosome,
+                           f"{base_filename}_by_section.txt",
+                           f"{base_filename}_by_professor.txt",
+                           f"{base_filename}_by_room.txt")
 
     print("\nAll schedule reports have been generated:")
     print(f"  - {base_filename}_by_section.txt")
@@ -0,0 +1,54 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithm.genetic import GeneticAlgorithm
+from data.data import create_sample_data
+
+
+@pytest.fixture
+def instance():
+    """The sample data: (sections, subjects, professors, rooms)"""
+    return create_sample_data()
+
+
+@pytest.fixture
+def make_ga(instance):
+    """Builds small, seeded algorithms on the sample data; their workers are shut down afterwards"""
+    algorithms = []
+
+    def make(**options):
+        options = {'population_size': 20, 'elite_size': 2, 'seed': 1, **options}
+        # The constraint analysis printed on construction is not of interest here
+        with contextlib.redirect_stdout(io.StringIO()):
+            ga = GeneticAlgorithm(*instance, **options)
+        algorithms.append(ga)
+        return ga
+
+    yield make
+    for ga in algorithms:
+        ga.close()
+
+
+@pytest.fixture
+def population(make_ga):
+    """Random and constructed chromosomes of a default algorithm, not yet evaluated"""
+    ga = make_ga()
+    return ([ga.create_random_chromosome() for _ in range(5)]
+            + [ga.create_intelligent_chromosome() for _ in range(5)])
+
+
+@pytest.fixture
+def required_sessions(instance):
+    """(section, subject, session number) of every session a complete schedule holds, sorted"""
+    sections, subjects, professors, rooms = instance
+    subject_dict = {subject.id: subject for subject in subjects}
+    return sorted((section.id, subject_id, template.session_number)
+                  for section in sections
+                  for subject_id in section.subjects
+                  for template in subject_dict[subject_id].sessions)
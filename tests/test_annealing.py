@@ -0,0 +1,54 @@
+import contextlib
+import io
+
+import pytest
+
+from algorithm.annealing import COOLING_SCHEDULES, AnnealingSolver
+from models.chromosome import Chromosome
+
+
+def make_solver(instance, **options):
+    options = {'iterations': 300, 'seed': 2, **options}
+    # The constraint analysis printed on construction is not of interest here
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AnnealingSolver(*instance, **options)
+
+
+def sessions(chromosome):
+    return sorted((gene.section_id, gene.subject_id, gene.session_number) for gene in chromosome.genes)
+
+
+@pytest.mark.parametrize('options', [{'cooling': cooling} for cooling in COOLING_SCHEDULES]
+                         + [{'cooling': 'lundy_mees', 'initial_temperature': 50.0, 'final_temperature': 0.01},
+                            {'method': 'tabu'}])
+def test_search_never_ends_worse_than_it_started(instance, options):
+    solver = make_solver(instance, **options)
+    initial = solver.algorithm.create_random_chromosome()
+    fitness, _ = initial.calculate_fitness(None)
+
+    best, history = solver.evolve(initial)
+    assert 0 < len(history) <= 300
+    assert history == sorted(history) and history[-1] == best.fitness
+    assert best.fitness >= fitness
+    assert sessions(best) == sessions(initial)
+    assert (best.fitness, best.penalty) == Chromosome(list(best.genes), best.active).calculate_fitness(None)
+
+
+def test_search_is_deterministic_for_a_seed(instance):
+    def run():
+        best, history = make_solver(instance).evolve()
+        return [gene.key() for gene in best.genes], history
+
+    assert run() == run()
+
+
+@pytest.mark.parametrize('options', [
+    {'method': 'descent'},
+    {'cooling': 'exponential'},
+    {'iterations': 0},
+    {'final_temperature': 0},
+    {'initial_temperature': -1.0},
+])
+def test_invalid_settings_are_rejected(instance, options):
+    with pytest.raises(ValueError):
+        make_solver(instance, **options)
@@ -0,0 +1,108 @@
+import zlib
+
+import pytest
+
+from algorithm.checkpoint import MAGIC, VERSION, load_checkpoint, save_checkpoint
+from algorithm.instrumentation import Instrumentation
+
+
+class Interrupted(Exception):
+    pass
+
+
+class StopAt(Instrumentation):
+    """Records the best fitness of every generation and interrupts evolution at `generation`"""
+
+    def __init__(self, generation: int):
+        self.stop = generation
+        self.generation = None
+        self.history = {}
+
+    def start_generation(self, generation: int) -> None:
+        if generation == self.stop:
+            raise Interrupted
+        self.generation = generation
+
+    def record(self, **values) -> None:
+        if 'best_fitness' in values:
+            self.history[self.generation] = (values['best_fitness'], values['current_best_fitness'])
+
+
+def run_until(make_ga, generation, checkpoint_path=None, resume_from=None):
+    recorder = StopAt(generation)
+    ga = make_ga(instrumentation=recorder, checkpoint_path=checkpoint_path, checkpoint_interval=5,
+                 stagnation_limit=10)
+    with pytest.raises(Interrupted):
+        ga.evolve(resume_from)
+    return recorder.history, ga
+
+
+def test_resume_reproduces_uninterrupted_run(make_ga, tmp_path):
+    expected, uninterrupted = run_until(make_ga, 30)
+
+    path = str(tmp_path / 'run.chk')
+    run_until(make_ga, 17, checkpoint_path=path)  # Killed after the checkpoint of generation 15
+    assert load_checkpoint(path)['generation'] == 15
+
+    history, resumed = run_until(make_ga, 30, resume_from=path)
+    assert min(history) == 15
+    assert history == {generation: values for generation, values in expected.items() if generation >= 15}
+    assert resumed.rng.getstate() == uninterrupted.rng.getstate()
+    # The fitness cache starts empty again, so only the number of lookups is the same
+    assert resumed.cache_hits + resumed.cache_misses == uninterrupted.cache_hits + uninterrupted.cache_misses
+    assert resumed.restart_count == uninterrupted.restart_count
+
+
+def test_checkpoints_hold_the_state_at_the_start_of_a_generation(make_ga, tmp_path):
+    path = str(tmp_path / 'run.chk')
+    history, ga = run_until(make_ga, 12, checkpoint_path=path)  # Checkpoints at generations 5 and 10
+
+    state = load_checkpoint(path)
+    assert state['generation'] == 10
+    assert state['fitness_history'] == [history[generation][0] for generation in range(10)]
+    assert state['best_fitness'] == history[9][0]
+    assert len(state['population']) == ga.population_size
+    assert [p.name for p in tmp_path.iterdir()] == ['run.chk']
+
+
+def test_checkpoint_of_other_problem_is_rejected(make_ga, tmp_path, instance):
+    path = str(tmp_path / 'run.chk')
+    run_until(make_ga, 7, checkpoint_path=path)
+    sections, subjects, professors, rooms = instance
+    del sections[0]
+    with pytest.raises(ValueError, match='different problem'):
+        run_until(make_ga, 10, resume_from=path)
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    path = str(tmp_path / 'state.chk')
+    save_checkpoint(path, {'generation': 3, 'history': [0.1, 0.2]})
+    assert load_checkpoint(path) == {'generation': 3, 'history': [0.1, 0.2]}
+    assert [p.name for p in tmp_path.iterdir()] == ['state.chk']  # No temporary files left behind
+
+
+@pytest.mark.parametrize('content', [
+    b'',
+    MAGIC[:3],
+    MAGIC,
+    b'NOTCK' + bytes([VERSION]),
+    MAGIC + bytes([VERSION + 1]),
+    MAGIC + bytes([VERSION]),
+    MAGIC + bytes([VERSION]) + b'not zlib data',
+    MAGIC + bytes([VERSION]) + zlib.compress(b'not a pickle'),
+], ids=['empty', 'short magic', 'no version', 'other magic', 'other version', 'no payload',
+        'corrupt payload', 'not a pickle'])
+def test_invalid_checkpoint_raises_value_error(tmp_path, content):
+    path = tmp_path / 'bad.chk'
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
+
+
+def test_truncated_checkpoint_raises_value_error(tmp_path):
+    path = tmp_path / 'state.chk'
+    save_checkpoint(str(path), {'population': list(range(1000))})
+    content = path.read_bytes()
+    path.write_bytes(content[:len(content) // 2])
+    with pytest.raises(ValueError, match='Corrupt checkpoint'):
+        load_checkpoint(str(path))
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from models import constraints
+from models.chromosome import Chromosome
+from models.gene import Gene
+from models.resources import Day, SessionType
+
+
+def all_pairs_conflicts(genes, resource_of, skip_none=False):
+    """Overlapping pairs sharing a resource, compared pair by pair like the original scan"""
+    conflicts = 0
+    for i, first in enumerate(genes):
+        for second in genes[i + 1:]:
+            resource = resource_of(first)
+            if skip_none and resource is None:
+                continue
+            if resource == resource_of(second) and first.overlaps_with(second):
+                conflicts += 1
+    return conflicts
+
+
+def random_schedule(rng, size):
+    """Genes crowded onto few resources, days and half-hour slots, so many of them touch or overlap"""
+    return [Gene(rng.choice(['S1', 'S2', 'S3']), f'SUBJ{rng.randrange(4)}', 1, SessionType.LECTURE,
+                 rng.choice(['P1', 'P2', 'TBA']), rng.choice([None, 'R1', 'R2']),
+                 rng.choice([Day.MONDAY, Day.TUESDAY]), rng.randrange(14, 42) / 2,
+                 rng.choice([0.5, 1.0, 1.5, 3.0]))
+            for _ in range(size)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_sweep_matches_all_pairs(seed):
+    rng = random.Random(seed)
+    chromosome = Chromosome(random_schedule(rng, rng.randrange(2, 80)),
+                            constraints.compile_constraints({'section_conflicts': 100}))
+    genes = chromosome.genes
+    expected = {
+        'professor_conflicts': all_pairs_conflicts(genes, lambda gene: gene.professor_id),
+        'room_conflicts': all_pairs_conflicts(genes, lambda gene: gene.room_id, skip_none=True),
+        'section_conflicts': all_pairs_conflicts(genes, lambda gene: gene.section_id),
+    }
+    assert chromosome._check_professor_conflicts() == expected['professor_conflicts']
+    assert chromosome._check_room_conflicts() == expected['room_conflicts']
+    assert chromosome._check_section_conflicts() == expected['section_conflicts']
+
+    counts = chromosome.fitness_counts()
+    assert {name: counts[name] for name in expected} == expected
@@ -0,0 +1,81 @@
+import dataclasses
+
+import pytest
+
+from models import constraints
+from models.chromosome import Chromosome
+from models.resources import Day
+
+# Enables both optional constraints and disables a default one
+REWEIGHTED = {'section_conflicts': 100, 'subject_distribution': 30, 'professor_breaks': 0}
+
+SATURDAY_CLASSES = constraints.Constraint(
+    'saturday_classes', 7, False, constraints.GENE, lambda gene: gene.day == Day.SATURDAY,
+    lambda chromosome: sum(gene.day == Day.SATURDAY for gene in chromosome.genes),
+    "Classes should not be held on Saturday")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """The constraint registry, restored after the test"""
+    monkeypatch.setattr(constraints, 'CONSTRAINTS', dict(constraints.CONSTRAINTS))
+    monkeypatch.setattr(constraints, 'ACTIVE', constraints.ACTIVE)
+    return constraints.CONSTRAINTS
+
+
+def test_constraint_weights_are_per_algorithm(make_ga):
+    defaults = constraints.constraint_weights()
+    reweighted = make_ga(constraint_weights=REWEIGHTED)
+    default = make_ga()
+
+    assert constraints.constraint_weights() == defaults
+    assert 'section_conflicts' not in constraints.ACTIVE.weights
+    assert reweighted.active_constraints.weights['section_conflicts'] == 100
+    assert 'professor_breaks' not in reweighted.active_constraints.weights
+    assert default.active_constraints.weights == constraints.ACTIVE.weights
+
+    chromosome = reweighted.create_random_chromosome()
+    assert chromosome.active is reweighted.active_constraints
+    assert set(chromosome.fitness_counts()) == set(reweighted.active_constraints.weights)
+    assert default.create_random_chromosome().active is default.active_constraints
+
+
+def test_unknown_constraint_weight_is_rejected(make_ga):
+    with pytest.raises(ValueError, match='Unknown constraints'):
+        make_ga(constraint_weights={'no_such_constraint': 1})
+
+
+
+def test_registered_constraint_joins_the_fitness(registry, population):
+    constraints.register_constraint(SATURDAY_CLASSES)
+    assert list(registry)[-1] == 'saturday_classes'
+    assert constraints.ACTIVE.weights['saturday_classes'] == 7
+
+    for chromosome in population:
+        saturdays = sum(gene.day == Day.SATURDAY for gene in chromosome.genes)
+        with_saturdays = Chromosome(list(chromosome.genes))
+        _, penalty = with_saturdays.calculate_fitness(None)
+        assert with_saturdays.penalty_breakdown()['saturday_classes'] == 7 * saturdays
+        assert penalty == chromosome.calculate_fitness(None)[1] + 7 * saturdays
+
+        # Delta evaluation counts the new constraint too
+        index = next(i for i, gene in enumerate(with_saturdays.genes) if gene.day != Day.SATURDAY)
+        moved = list(with_saturdays.genes)
+        moved[index] = moved[index].replace(day=Day.SATURDAY)
+        assert with_saturdays.penalty_delta({index: {'day': Day.SATURDAY}}) == \
+            Chromosome(moved).calculate_fitness(None)[1] - penalty
+
+
+def test_configured_weights_become_the_defaults(registry, make_ga):
+    constraints.configure_constraints({'subject_room': 5, 'professor_breaks': 0})
+    assert constraints.constraint_weights()['subject_room'] == 5
+    assert 'professor_breaks' not in constraints.ACTIVE.weights
+    assert make_ga().active_constraints.weights == constraints.ACTIVE.weights
+    with pytest.raises(ValueError, match='Unknown constraints'):
+        constraints.configure_constraints({'no_such_constraint': 1})
+
+
+def test_unknown_grouping_is_rejected(registry):
+    with pytest.raises(ValueError, match='Unknown grouping'):
+        constraints.register_constraint(dataclasses.replace(SATURDAY_CLASSES, grouping='week'))
+    assert 'saturday_classes' not in registry
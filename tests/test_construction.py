@@ -0,0 +1,49 @@
+from models.chromosome import Chromosome
+from models.gene import ROOMS
+
+
+def sessions(chromosome):
+    return sorted((gene.section_id, gene.subject_id, gene.session_number) for gene in chromosome.genes)
+
+
+def hard_violations(ga, chromosome):
+    """Violations of every registered hard constraint; sessions without a professor share no one"""
+    scheduled = Chromosome(chromosome.genes, ga.active_constraints)
+    staffed = Chromosome([gene for gene in chromosome.genes if gene.professor_id != 'TBA'], ga.active_constraints)
+    return {constraint.name: constraint.full(staffed if constraint.name == 'professor_conflicts' else scheduled)
+            for constraint in ga.active_constraints.registered if constraint.hard}
+
+
+def test_constructed_chromosomes_hold_every_session(make_ga, required_sessions):
+    ga = make_ga()
+    for _ in range(5):
+        chromosome = ga.construction_engine.build()
+        assert sessions(chromosome) == required_sessions
+        for gene in chromosome.genes:
+            if ga.subject_dict[gene.subject_id].requires_room:
+                course = ga.section_dict[gene.section_id].course
+                assert gene.room in ga.suitable_room_handles(gene.session_type, course)
+
+
+def test_constructed_chromosomes_have_no_hard_conflicts(make_ga, instance):
+    # The whole sample data needs more lab hours than its labs have, so take a few sections
+    sections = instance[0]
+    del sections[3:]
+    ga = make_ga()
+    for _ in range(20):
+        violations = hard_violations(ga, ga.construction_engine.build())
+        assert not any(violations.values()), violations
+
+
+def test_construction_beats_random_placement(make_ga):
+    ga = make_ga()
+    built = [sum(hard_violations(ga, ga.construction_engine.build()).values()) for _ in range(5)]
+    drawn = [sum(hard_violations(ga, ga.create_random_chromosome()).values()) for _ in range(5)]
+    assert max(built) < min(drawn)
+
+
+def test_room_handles_follow_the_suitable_rooms(make_ga):
+    ga = make_ga()
+    for (session_type, course), rooms in ga.suitable_rooms.items():
+        handles = ga.suitable_room_handles(session_type, course)
+        assert [ROOMS.ids[handle] for handle in handles] == [room.id for room in rooms]
@@ -0,0 +1,41 @@
+import pytest
+
+from models.chromosome import Chromosome
+
+
+def diversity(make_ga, population, method, **options):
+    return make_ga(diversity_method=method, **options)._calculate_population_diversity(population)
+
+
+@pytest.fixture
+def converging(population):
+    """The population with clones, some of them slightly changed, as after a few generations"""
+    clones = []
+    for index, chromosome in enumerate(population[:6]):
+        clone = chromosome.clone()
+        for position in range(index):
+            clone.update_gene(position * 11, start_time=clone.genes[position * 11].start_time + 0.5 * (index % 3))
+        clones.append(clone)
+    return population + clones
+
+
+def test_frequency_equals_exact(make_ga, converging):
+    exact = diversity(make_ga, converging, 'exact')
+    assert 0.0 < exact < 1.0
+    assert diversity(make_ga, converging, 'frequency') == pytest.approx(exact, abs=1e-12)
+
+
+def test_sampled_stays_close_to_exact(make_ga, converging):
+    exact = diversity(make_ga, converging, 'exact')
+    for seed in range(5):
+        sampled = diversity(make_ga, converging, 'sampled', seed=seed, diversity_confidence=0.01)
+        assert sampled == pytest.approx(exact, abs=0.05)
+
+
+@pytest.mark.parametrize('lengths', [[0, 0], [0, 0, 0, 3], [2, 3], [3, 3, 0], [1]])
+def test_methods_agree_on_edge_cases(make_ga, population, lengths):
+    chromosomes = [Chromosome(population[index].genes[:length]) for index, length in enumerate(lengths)]
+    exact = diversity(make_ga, chromosomes, 'exact')
+    assert diversity(make_ga, chromosomes, 'frequency') == pytest.approx(exact, abs=1e-12)
+    if len(set(lengths)) == 1:  # Every pair is at the same distance, so samples are exact too
+        assert diversity(make_ga, chromosomes, 'sampled') == pytest.approx(exact, abs=1e-12)
@@ -0,0 +1,99 @@
+import csv
+import json
+
+import pytest
+
+from sched_export import SESSION_FIELDS, export_columnar, export_csv, export_jsonl, read_columnar, session_records
+
+RUN = {'seed': 1, 'generations': 0}
+
+
+@pytest.fixture
+def chromosome(make_ga):
+    chromosome = make_ga().create_intelligent_chromosome()
+    chromosome.calculate_fitness(None)
+    return chromosome
+
+
+def check_metadata(metadata, chromosome):
+    assert metadata['fitness'] == chromosome.fitness
+    assert metadata['penalty_breakdown'] == chromosome.penalty_breakdown()
+    assert metadata['total_penalty'] == chromosome.penalty
+    assert metadata['sessions'] == len(chromosome.genes)
+    assert metadata['run'] == RUN
+
+
+def test_jsonl_round_trip(chromosome, tmp_path):
+    path = tmp_path / 'schedule.jsonl'
+    export_jsonl(chromosome, str(path), RUN)
+    metadata, *sessions = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert metadata.pop('type') == 'metadata'
+    check_metadata(metadata, chromosome)
+    assert all(session.pop('type') == 'session' for session in sessions)
+    assert sessions == list(session_records(chromosome))
+
+
+def test_csv_round_trip(chromosome, tmp_path):
+    path = tmp_path / 'schedule.csv'
+    metadata_path = export_csv(chromosome, str(path), RUN)
+    assert metadata_path == str(tmp_path / 'schedule.meta.json')
+    with open(metadata_path) as f:
+        check_metadata(json.load(f), chromosome)
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [{name: '' if value is None else str(value) for name, value in record.items()}
+                    for record in session_records(chromosome)]
+
+
+@pytest.mark.parametrize('row_group_size', [7, 65536])
+def test_columnar_round_trip(chromosome, tmp_path, row_group_size):
+    path = tmp_path / 'schedule.col'
+    export_columnar(chromosome, str(path), RUN, row_group_size=row_group_size)
+    metadata, columns = read_columnar(str(path))
+    check_metadata(metadata, chromosome)
+
+    records = list(session_records(chromosome))
+    assert list(columns) == list(SESSION_FIELDS)
+    assert [dict(zip(columns, row)) for row in zip(*columns.values())] == records
+
+    metadata, columns = read_columnar(str(path), ['day', 'start_time'])
+    assert columns == {'day': [record['day'] for record in records],
+                       'start_time': [record['start_time'] for record in records]}
+    with pytest.raises(ValueError, match='Unknown columns'):
+        read_columnar(str(path), ['weekday'])
+
+
+def test_empty_schedule_round_trip(chromosome, tmp_path):
+    chromosome.genes = []
+    path = tmp_path / 'schedule.col'
+    export_columnar(chromosome, str(path), RUN)
+    _, columns = read_columnar(str(path))
+    assert columns == {name: [] for name in SESSION_FIELDS}
+
+
+def test_damaged_columnar_files_are_rejected(chromosome, tmp_path):
+    path = tmp_path / 'schedule.col'
+    export_columnar(chromosome, str(path), RUN, row_group_size=7)
+    data = path.read_bytes()
+
+    damaged = tmp_path / 'damaged.col'
+    for length in [0, 3, 6, 10, 200, len(data) // 2, len(data) - 20, len(data) - 1]:
+        damaged.write_bytes(data[:length])
+        with pytest.raises(ValueError):
+            read_columnar(str(damaged))
+
+    # A footer length pointing before the start of the file
+    damaged.write_bytes(data[:-13] + (len(data) * 2).to_bytes(8, 'little') + data[-5:])
+    with pytest.raises(ValueError, match='truncated'):
+        read_columnar(str(damaged))
+
+    # Column data missing from the middle, with the footer intact
+    damaged.write_bytes(data[:100] + data[200:])
+    with pytest.raises(ValueError):
+        read_columnar(str(damaged))
+
+    damaged.write_text('section_id,subject_id\n')
+    with pytest.raises(ValueError, match='not a version'):
+        read_columnar(str(damaged))
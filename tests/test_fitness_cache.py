@@ -0,0 +1,85 @@
+import random
+
+from models.chromosome import Chromosome
+from models.resources import Day
+
+
+def scratch_score(chromosome):
+    return Chromosome(list(chromosome.genes), chromosome.active).calculate_fitness(None)
+
+
+def test_digest_follows_gene_changes(population):
+    rng = random.Random(0)
+    for chromosome in population:
+        chromosome.content_digest()
+        if rng.random() < 0.5:
+            chromosome.calculate_fitness(None)  # Changes then go through the fitness counters
+        clone = chromosome.clone()
+        assert clone.content_digest() == chromosome.content_digest()
+        for _ in range(20):
+            indices = [rng.randrange(len(clone.genes)) for _ in range(rng.choice([1, 2, 3]))]
+            clone.update_genes(indices, day=rng.choice(list(Day)), start_time=rng.choice([7.0, 9.5, 13.0]))
+            assert clone.content_digest() == Chromosome(list(clone.genes)).content_digest()
+        assert chromosome.content_digest() == Chromosome(list(chromosome.genes)).content_digest()
+
+        # Changing a gene back restores the digest
+        original = chromosome.genes[0]
+        copy = chromosome.clone()
+        copy.update_gene(0, start_time=original.start_time + 1)
+        assert copy.content_digest() != chromosome.content_digest()
+        copy.update_gene(0, start_time=original.start_time)
+        assert copy.content_digest() == chromosome.content_digest()
+
+
+def test_fitness_cache_scores_identical_schedules_once(make_ga, population):
+    ga = make_ga()
+    ga.evaluate_population(population)
+    assert (ga.cache_hits, ga.cache_misses) == (0, len(population))
+    for chromosome in population:
+        assert (chromosome.fitness, chromosome.penalty) == scratch_score(chromosome)
+
+    # Clones are cache hits, and so is a rebuilt copy of the same schedule
+    copies = [chromosome.clone() for chromosome in population]
+    copies.append(Chromosome(list(population[0].genes), ga.active_constraints))
+    ga.evaluate_population(copies)
+    assert (ga.cache_hits, ga.cache_misses) == (len(copies), len(population))
+    assert [c.fitness for c in copies] == [c.fitness for c in population] + [population[0].fitness]
+
+    # A changed gene makes a new schedule
+    changed = population[0].clone()
+    changed.update_gene(0, start_time=changed.genes[0].start_time + 0.5)
+    ga.evaluate_population([changed])
+    assert ga.cache_misses == len(population) + 1
+    assert (changed.fitness, changed.penalty) == scratch_score(changed)
+
+
+def test_duplicates_in_one_population_are_scored_once(make_ga, population):
+    ga = make_ga()
+    ga.evaluate_population(population + [chromosome.clone() for chromosome in population])
+    assert (ga.cache_hits, ga.cache_misses) == (len(population), len(population))
+
+
+def test_digest_collisions_are_not_cache_hits(make_ga, population):
+    ga = make_ga()
+    first, second = population[:2]
+    ga.evaluate_population([first])
+
+    second._digest = first.content_digest()  # Same digest, different genes
+    ga.evaluate_population([second])
+    assert (ga.cache_hits, ga.cache_misses) == (0, 2)
+    assert (second.fitness, second.penalty) == scratch_score(second)
+
+    # Three schedules with one digest; only the clone of `third` is a hit
+    third = population[2]
+    third._digest = first.content_digest()
+    batch = [third, third.clone(), first.clone()]
+    ga.evaluate_population(batch)
+    assert (ga.cache_hits, ga.cache_misses) == (1, 4)
+    for chromosome in batch:
+        assert (chromosome.fitness, chromosome.penalty) == scratch_score(chromosome)
+
+
+def test_fitness_cache_evicts_least_recently_used(make_ga, population):
+    ga = make_ga(fitness_cache_size=4)
+    ga.evaluate_population(population)
+    assert list(ga.fitness_cache) == [c.content_digest() for c in population[-4:]]
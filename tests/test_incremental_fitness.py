@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from models import constraints
+from models.chromosome import Chromosome
+from models.fitness_tracker import evaluate
+from models.resources import Day
+
+# Enables both optional constraints and disables a default one
+REWEIGHTED = {'section_conflicts': 100, 'subject_distribution': 30, 'professor_breaks': 0}
+
+
+def random_moves(rng, chromosome, instance):
+    """Attribute changes for one to three random genes, hard constraint violations included"""
+    sections, subjects, professors, rooms = instance
+    moves = {}
+    for _ in range(rng.choice([1, 1, 2, 3])):
+        index = rng.randrange(len(chromosome.genes))
+        attribute = rng.choice(['day', 'start_time', 'room_id', 'professor_id'])
+        value = {
+            'day': lambda: rng.choice(list(Day)),
+            'start_time': lambda: rng.choice([6.5, 7.0, 9.5, 13.0, 17.5, 20.0, 22.0]),
+            'room_id': lambda: rng.choice([None] + [room.id for room in rooms]),
+            'professor_id': lambda: rng.choice(['TBA'] + [professor.id for professor in professors]),
+        }[attribute]()
+        moves.setdefault(index, {})[attribute] = value
+    return moves
+
+
+@pytest.fixture
+def verify_incremental(monkeypatch):
+    monkeypatch.setattr(Chromosome, 'verify_incremental', True)
+
+
+def test_first_evaluation_matches_full_recompute(population):
+    for chromosome in population:
+        fitness, penalty = chromosome.calculate_fitness(None)
+        counts = chromosome.violation_counts()
+        assert chromosome.fitness_counts() == counts
+        assert penalty == sum(constraints.ACTIVE.weights[name] * count for name, count in counts.items())
+        assert fitness == 1000.0 / (1000.0 + penalty)
+        assert evaluate(chromosome.genes) == (penalty, chromosome.penalty_breakdown())
+
+
+@pytest.mark.parametrize('weights', [None, REWEIGHTED])
+def test_incremental_updates_match_full_recompute(make_ga, instance, verify_incremental, weights):
+    ga = make_ga(constraint_weights=weights)
+    rng = random.Random(0)
+    for _ in range(6):
+        chromosome = ga.create_random_chromosome()
+        chromosome.calculate_fitness(None)
+        for _ in range(50):
+            # update_genes raises AssertionError as soon as the counters diverge
+            for index, changes in random_moves(rng, chromosome, instance).items():
+                chromosome.update_gene(index, **changes)
+        assert chromosome.fitness_counts() == chromosome.violation_counts()
+
+
+def test_clones_keep_their_own_counters(population, instance, verify_incremental):
+    rng = random.Random(1)
+    for chromosome in population:
+        fitness, penalty = chromosome.calculate_fitness(None)
+        clone = chromosome.clone()
+        for index, changes in random_moves(rng, clone, instance).items():
+            clone.update_gene(index, **changes)
+        assert chromosome.calculate_fitness(None) == (fitness, penalty)
+        assert chromosome.fitness_counts() == chromosome.violation_counts()
+        assert clone.fitness_counts() == clone.violation_counts()
+
+
+@pytest.mark.parametrize('weights', [None, REWEIGHTED])
+def test_penalty_delta_matches_recompute(make_ga, instance, weights):
+    ga = make_ga(constraint_weights=weights)
+    rng = random.Random(2)
+    chromosome = ga.create_intelligent_chromosome()
+    for _ in range(200):
+        moves = random_moves(rng, chromosome, instance)
+        before = chromosome.calculate_fitness(None)[1]
+        delta = chromosome.penalty_delta(moves)
+        assert chromosome.calculate_fitness(None)[1] == before  # No change until applied
+        for index, changes in moves.items():
+            chromosome.update_gene(index, **changes)
+        rescored = Chromosome(list(chromosome.genes), ga.active_constraints)
+        assert rescored.calculate_fitness(None)[1] == before + delta
+
@@ -0,0 +1,72 @@
+import csv
+import json
+
+from algorithm.instrumentation import INITIALIZATION, PhaseRecorder
+
+
+def run(ga, recorder, generations=3):
+    population = ga.initialize_population()
+    for generation in range(generations):
+        recorder.start_generation(generation)
+        with recorder.phase('evaluate_population'):
+            ga.evaluate_population(population)
+        population = ga.next_generation(population, generation)
+    ga.close()
+
+
+def test_work_before_the_first_generation_has_its_own_record():
+    recorder = PhaseRecorder()
+    recorder.count('repair.displaced', 5)
+    with recorder.phase('initialize'):
+        pass
+    recorder.start_generation(0)
+    recorder.count('repair.displaced', 2)
+    recorder.finish()
+
+    initialization, generation = recorder.rows
+    assert initialization['generation'] == INITIALIZATION
+    assert initialization['repair.displaced'] == 5
+    assert initialization['initialize_calls'] == 1
+    assert generation['generation'] == 0
+    assert generation['repair.displaced'] == 2
+    assert 'initialize_calls' not in generation
+
+
+def test_no_initialization_record_without_work():
+    recorder = PhaseRecorder()
+    recorder.start_generation(0)
+    recorder.start_generation(1)
+    recorder.finish()
+    assert [row['generation'] for row in recorder.rows] == [0, 1]
+
+
+def test_algorithm_phases_are_recorded_per_generation(make_ga):
+    recorder = PhaseRecorder()
+    run(make_ga(instrumentation=recorder), recorder)
+
+    assert [row['generation'] for row in recorder.rows] == [INITIALIZATION, 0, 1, 2]
+    initialization = recorder.rows[0]
+    assert initialization['repair.succeeded'] + initialization['repair.failed'] > 0
+    for row in recorder.rows[1:]:
+        assert row['evaluate_population_calls'] == 1
+        assert row['crossover_calls'] > 0
+        assert row['seconds'] >= row['evaluate_population_seconds']
+
+    summary = recorder.summary()
+    assert summary['evaluate_population'][1] == 3
+    assert summary['crossover'][1] == sum(row['crossover_calls'] for row in recorder.rows[1:])
+
+
+def test_rows_are_exported(make_ga, tmp_path):
+    for name in ('phases.csv', 'phases.jsonl'):
+        path = tmp_path / name
+        recorder = PhaseRecorder(str(path))
+        run(make_ga(instrumentation=recorder), recorder, generations=2)
+        if name.endswith('.csv'):
+            with open(path, newline='') as f:
+                rows = list(csv.DictReader(f))
+            assert [row['generation'] for row in rows] == [INITIALIZATION, '0', '1']
+            assert float(rows[1]['seconds']) == recorder.rows[1]['seconds']
+        else:
+            rows = [json.loads(line) for line in path.read_text().splitlines()]
+            assert rows == recorder.rows
@@ -0,0 +1,56 @@
+import multiprocessing
+import os
+
+import pytest
+
+from algorithm.genetic import GeneticAlgorithm
+from algorithm.islands import IslandModel
+
+# Island processes must see the algorithm patched in this process
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason='islands only inherit patches when forked')
+
+
+def make_model(instance, **options):
+    options = {'islands': 2, 'migration_interval': 3, 'generations': 7, 'seed': 4,
+               'population_size': 10, 'elite_size': 2, **options}
+    return IslandModel(*instance, **options)
+
+
+def test_two_islands_run_every_generation(instance):
+    model = make_model(instance)
+    assert model.epoch_generations == [3, 3, 1]
+
+    best, histories = model.evolve()
+    assert len(histories) == 2
+    for history in histories:
+        assert len(history) == 7
+        assert history == sorted(history)
+    assert best.fitness >= max(history[-1] for history in histories)
+    assert best.calculate_fitness(None) == (best.fitness, best.penalty)
+
+
+@pytest.mark.parametrize('generations, migration_interval', [(0, 3), (5, 0)])
+def test_invalid_epochs_are_rejected(instance, generations, migration_interval):
+    with pytest.raises(ValueError):
+        make_model(instance, generations=generations, migration_interval=migration_interval)
+
+
+@needs_fork
+def test_island_exception_is_raised_in_the_driver(instance, monkeypatch):
+    def fail(self, population, generation):
+        raise KeyError('broken island')
+    monkeypatch.setattr(GeneticAlgorithm, 'next_generation', fail)
+
+    with pytest.raises(RuntimeError, match="Island 0 failed:(.|\n)*KeyError: 'broken island'"):
+        make_model(instance).evolve()
+
+
+@needs_fork
+def test_killed_island_is_reported(instance, monkeypatch):
+    def die(self, population, generation):
+        os._exit(3)
+    monkeypatch.setattr(GeneticAlgorithm, 'next_generation', die)
+
+    with pytest.raises(RuntimeError, match='Island 0 exited with code 3'):
+        make_model(instance).evolve()
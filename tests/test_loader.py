@@ -0,0 +1,137 @@
+import csv
+import json
+import os
+
+import pytest
+
+from data.loader import DIRECTORY_CACHE_NAME, build_instance, load_instance, save_instance
+
+
+def valid_tables():
+    return {
+        'rooms': [{'id': '501', 'capacity': 40, 'room_type': ['lecture'], 'preferred_courses': ['CS']}],
+        'professors': [{'id': 'P1', 'course': ['CS'], 'subjects': ['MATH1']},
+                       {'id': 'P2', 'course': ['CS'], 'subjects': ['MATH1']}],
+        'subjects': [{'id': 'MATH1', 'course': ['CS'], 'requires_room': True,
+                      'sessions': [{'session_number': 1, 'session_type': 'lecture', 'duration_hours': 1.5}]}],
+        'sections': [{'id': 'CS1', 'course': 'CS', 'subjects': ['MATH1'], 'max_students': 35},
+                     {'id': 'CS2', 'course': 'CS', 'subjects': ['MATH1'], 'max_students': 30}],
+    }
+
+
+def write_csv(path, rows, fields):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({field: ';'.join(row[field]) if isinstance(row[field], list) else row[field]
+                             for field in fields})
+
+
+def test_json_instance_roundtrip_and_cache(tmp_path, instance):
+    path = str(tmp_path / 'instance.json')
+    save_instance(path, *instance)
+    assert load_instance(path) == instance
+    assert os.path.exists(path + '.cache')
+    assert load_instance(path) == instance  # From the cache
+
+    # A changed source is parsed again
+    document = json.load(open(path))
+    document['rooms'][0]['capacity'] += 1
+    with open(path, 'w') as f:
+        json.dump(document, f)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert load_instance(path)[3][0].capacity == instance[3][0].capacity + 1
+
+
+def test_csv_directory(tmp_path):
+    tables = valid_tables()
+    write_csv(tmp_path / 'rooms.csv', tables['rooms'], ['id', 'capacity', 'room_type', 'preferred_courses'])
+    write_csv(tmp_path / 'professors.csv', tables['professors'], ['id', 'course', 'subjects'])
+    write_csv(tmp_path / 'subjects.csv', tables['subjects'], ['id', 'course', 'requires_room'])
+    write_csv(tmp_path / 'sessions.csv', [dict(subject_id='MATH1', **session)
+                                          for session in tables['subjects'][0]['sessions']],
+              ['subject_id', 'session_number', 'session_type', 'duration_hours'])
+    write_csv(tmp_path / 'sections.csv', tables['sections'], ['id', 'course', 'subjects', 'max_students'])
+
+    loaded = load_instance(str(tmp_path))
+    assert loaded == build_instance(tables)
+    assert os.path.exists(tmp_path / DIRECTORY_CACHE_NAME)
+    assert load_instance(str(tmp_path)) == loaded
+
+
+def test_loaded_objects_own_their_lists(tmp_path):
+    path = str(tmp_path / 'instance.json')
+    with open(path, 'w') as f:
+        json.dump(valid_tables(), f)
+    for use_cache in (True, True, False):
+        sections, subjects, professors, rooms = load_instance(path, use_cache)
+        sections[0].subjects.append('OTHER')
+        professors[0].course.append('IT')
+        assert sections[1].subjects == ['MATH1']
+        assert professors[1].course == ['CS']
+        assert subjects[0].course == ['CS']
+
+
+def test_missing_directory_file(tmp_path):
+    with pytest.raises(ValueError, match='no rooms.json or rooms.csv'):
+        load_instance(str(tmp_path))
+
+
+@pytest.mark.parametrize('change, message', [
+    (lambda t: t['rooms'].append(dict(t['rooms'][0])), "room 2: duplicate '501'"),
+    (lambda t: t['rooms'][0].update(capacity=0), 'capacity must be positive'),
+    (lambda t: t['rooms'][0].update(room_type=['bogus']), r"room 1 \(501\): invalid value"),
+    (lambda t: t['rooms'][0].pop('capacity'), r"room 1 \(501\): invalid value"),
+    (lambda t: t['professors'][0].update(subjects=['NOPE']), "professor P1: unknown subject 'NOPE'"),
+    (lambda t: t['sections'][0].update(subjects=['NOPE']), "section CS1: unknown subject 'NOPE'"),
+    (lambda t: t['sections'][0].update(max_students='many'), r'section 1 \(CS1\): invalid value'),
+    (lambda t: t['subjects'][0].update(sessions=[]), 'subject MATH1: no sessions'),
+    (lambda t: t.update(sessions=[{'subject_id': 'NOPE', 'session_number': 1, 'session_type': 'lecture',
+                                   'duration_hours': 1}]), r'session NOPE \(1\): unknown subject'),
+    (lambda t: t['sections'].append('CS3'), 'section 3: expected an object, got str'),
+    (lambda t: t['professors'].append(None), 'professor 3: expected an object, got NoneType'),
+    (lambda t: t.update(rooms={'id': '501'}), 'rooms: expected a list, got dict'),
+])
+def test_invalid_instance_is_rejected(change, message):
+    tables = valid_tables()
+    change(tables)
+    with pytest.raises(ValueError, match=message):
+        build_instance(tables)
+
+
+def test_every_error_is_reported():
+    tables = valid_tables()
+    tables['rooms'][0]['capacity'] = -1
+    tables['sections'][1]['subjects'] = ['NOPE']
+    tables['sections'].append(5)
+    with pytest.raises(ValueError) as error:
+        build_instance(tables)
+    assert str(error.value).count('\n') == 3
+
+
+def test_instance_must_be_an_object(tmp_path):
+    path = tmp_path / 'instance.json'
+    path.write_text('[]')
+    with pytest.raises(ValueError, match='expected an object of tables, got list'):
+        load_instance(str(path))
+
+
+@pytest.mark.parametrize('cache', [b'', b'GSINS', b'GSINS\x01garbage', b'OTHER\x01', b'GSINS\x99'])
+def test_unreadable_cache_is_rebuilt(tmp_path, instance, cache):
+    path = str(tmp_path / 'instance.json')
+    save_instance(path, *instance)
+    with open(path + '.cache', 'wb') as f:
+        f.write(cache)
+
+    assert load_instance(path) == instance
+    with open(path + '.cache', 'rb') as f:
+        assert f.read(6) == b'GSINS\x01'  # Written again
+    assert load_instance(path) == instance
+
+
+def test_cache_can_be_disabled(tmp_path, instance):
+    path = str(tmp_path / 'instance.json')
+    save_instance(path, *instance)
+    assert load_instance(path, use_cache=False) == instance
+    assert not os.path.exists(path + '.cache')
@@ -0,0 +1,90 @@
+import pytest
+
+from algorithm.instrumentation import PhaseRecorder
+from algorithm.local_search import MOVES, LocalSearch, Neighbourhood, conflicting_genes
+from models.chromosome import Chromosome
+
+
+def schedule(chromosome):
+    return [gene.key() for gene in chromosome.genes]
+
+
+def sessions(chromosome):
+    return sorted((gene.section_id, gene.subject_id, gene.session_number) for gene in chromosome.genes)
+
+
+def scratch_score(chromosome):
+    return Chromosome(list(chromosome.genes), chromosome.active).calculate_fitness(None)
+
+
+def overlapping_genes(genes):
+    """Indices of the genes in a hard conflict, pair by pair"""
+    hot = set()
+    for i, first in enumerate(genes):
+        if not 7.0 <= first.start_time <= 21.0:
+            hot.add(i)
+        for j in range(i + 1, len(genes)):
+            second = genes[j]
+            if first.day != second.day:
+                continue
+            shared = (first.professor == second.professor or first.section == second.section
+                      or (first.room and first.room == second.room))
+            overlap = first.start_time < second.end_time and second.start_time < first.end_time
+            same_subject = first.section == second.section and first.subject == second.subject
+            if shared and overlap or same_subject:
+                hot.update((i, j))
+    return sorted(hot)
+
+
+def test_conflicting_genes_match_pairwise_overlaps(population):
+    for chromosome in population:
+        assert conflicting_genes(chromosome.genes) == overlapping_genes(chromosome.genes)
+
+
+@pytest.mark.parametrize('moves', [MOVES, ('shift_time',), ('swap_days', 'swap_professor')])
+def test_improve_never_returns_a_worse_schedule(make_ga, moves):
+    ga = make_ga()
+    search = LocalSearch(ga, iterations=30, moves=moves)
+    for chromosome in [ga.create_random_chromosome(), ga.create_intelligent_chromosome()]:
+        fitness, _ = chromosome.calculate_fitness(None)
+        original = schedule(chromosome)
+        history = []
+        improved = search.improve(chromosome, history)
+
+        assert schedule(chromosome) == original
+        assert sessions(improved) == sessions(chromosome)
+        assert improved.fitness >= fitness
+        assert (improved.fitness, improved.penalty) == scratch_score(improved)
+        assert len(history) == 30 and history == sorted(history) and history[-1] == improved.fitness
+
+
+def test_improve_is_deterministic_for_a_seed(make_ga):
+    def run(seed):
+        ga = make_ga(seed=seed)
+        return schedule(LocalSearch(ga, iterations=20).improve(ga.create_random_chromosome()))
+
+    assert run(3) == run(3)
+    assert run(3) != run(4)
+
+
+def test_unknown_moves_are_rejected(make_ga, population):
+    with pytest.raises(ValueError):
+        Neighbourhood(make_ga(), population[0], ('shift_time', 'teleport'))
+    with pytest.raises(ValueError):
+        Neighbourhood(make_ga(), population[0], ())
+
+
+def test_memetic_step_searches_the_elites(make_ga):
+    recorder = PhaseRecorder()
+    ga = make_ga(local_search_elites=2, local_search_iterations=20, instrumentation=recorder)
+    population = ga.initialize_population()
+    for generation in range(2):
+        recorder.start_generation(generation)
+        ga.evaluate_population(population)
+        population = ga.next_generation(population, generation)
+    recorder.finish()
+
+    assert [row.get('local_search_calls') for row in recorder.rows[1:]] == [1, 1]
+    ga.evaluate_population(population)
+    for chromosome in population:
+        assert (chromosome.fitness, chromosome.penalty) == scratch_score(chromosome)
@@ -0,0 +1,129 @@
+import glob
+import os
+import random
+
+import pytest
+
+from models.chromosome import Chromosome
+from models.resources import Day
+
+
+def schedule(chromosome):
+    return [gene.key() for gene in chromosome.genes]
+
+
+def scratch_score(chromosome):
+    return Chromosome(list(chromosome.genes), chromosome.active).calculate_fitness(None)
+
+
+def run_generations(ga, generations=3):
+    population = ga.initialize_population()
+    for generation in range(generations):
+        ga.evaluate_population(population)
+        population = ga.next_generation(population, generation)
+    ga.evaluate_population(population)
+    return population
+
+
+def test_pack_batch_shares_genes_once(make_ga, population):
+    ga = make_ga()
+    encoding = ga.encoding
+    clones = [chromosome.clone() for chromosome in population]
+    batch, table = encoding.pack_batch(population + clones)
+    assert len(table) == len({id(gene) for chromosome in population for gene in chromosome.genes})
+
+    unpacked, unpacked_table = encoding.unpack_batch(batch, active=ga.active_constraints)
+    assert len(unpacked_table) == len(table)
+    for original, copy in zip(population + clones, unpacked):
+        assert schedule(copy) == schedule(original)
+        assert copy.active is ga.active_constraints
+
+    # Against a known table, only the new genes are sent
+    child = population[0].clone()
+    child.update_gene(0, start_time=child.genes[0].start_time + 0.5)
+    child_batch, child_table = encoding.pack_batch([child], known=table)
+    assert len(child_table) == len(table) + 1
+    (copy,), _ = encoding.unpack_batch(child_batch, known=unpacked_table)
+    assert schedule(copy) == schedule(child)
+
+
+@pytest.mark.parametrize('options', [
+    {'workers': 2},
+    {'workers': 3},
+])
+def test_evaluation_does_not_depend_on_workers(make_ga, options):
+    expected = run_generations(make_ga())
+    population = run_generations(make_ga(**options))
+    assert list(map(schedule, population)) == list(map(schedule, expected))
+    assert [(c.fitness, c.penalty) for c in population] == [(c.fitness, c.penalty) for c in expected]
+    for chromosome in population:
+        assert (chromosome.fitness, chromosome.penalty) == scratch_score(chromosome)
+
+
+def test_parallel_offspring_do_not_depend_on_worker_count(make_ga):
+    expected = run_generations(make_ga(workers=2, parallel_offspring=True, offspring_batch_size=5))
+    population = run_generations(make_ga(workers=3, parallel_offspring=True, offspring_batch_size=5,
+                                         parallel_initialization=True))
+    assert list(map(schedule, population)) == list(map(schedule, expected))
+    for chromosome in population:
+        assert chromosome.tracked  # Workers send back the violation counts
+        assert chromosome.fitness_counts() == chromosome.violation_counts()
+        assert (chromosome.fitness, chromosome.penalty) == scratch_score(chromosome)
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='shared memory blocks are not listed in /dev/shm')
+def test_breeding_rounds_remove_their_shared_memory(make_ga):
+    ga = make_ga(workers=2, parallel_offspring=True, offspring_batch_size=5)
+    run_generations(ga, 2)
+    assert ga._breeder._round > 0
+    assert glob.glob(f'/dev/shm/{ga._breeder._round_prefix}_*') == []
+
+
+def test_worker_scores_keep_counts(make_ga, population):
+    ga = make_ga(workers=2)
+    ga.evaluate_population(population)
+    for chromosome in population:
+        assert chromosome.tracked
+        assert chromosome.fitness_counts() == chromosome.violation_counts()
+
+
+def test_restored_counts_stay_incremental(population, monkeypatch):
+    monkeypatch.setattr(Chromosome, 'verify_incremental', True)
+    rng = random.Random(3)
+    for chromosome in population:
+        copy = Chromosome(list(chromosome.genes))
+        assert copy.restore_counts(chromosome.fitness_counts()) == chromosome.calculate_fitness(None)
+        assert copy.tracked
+        for _ in range(10):
+            # update_gene raises AssertionError if the restored counters are off
+            copy.update_gene(rng.randrange(len(copy.genes)), day=rng.choice(list(Day)),
+                             start_time=rng.choice([7.0, 9.5, 12.5, 21.5]))
+        assert copy.fitness_counts() == copy.violation_counts()
+
+
+def test_parallel_initialization_builds_the_serial_population(make_ga):
+    expected = make_ga().initialize_population()
+    ga = make_ga(workers=2, parallel_initialization=True)
+    chromosomes = ga.iter_initial_population()
+    first = next(chromosomes)
+    assert schedule(first) == schedule(expected[0])
+    population = [first] + list(chromosomes)
+    assert list(map(schedule, population)) == list(map(schedule, expected))
+
+    # Workers scored every chromosome, so evaluation only reads the cache
+    ga.evaluate_population(population)
+    assert (ga.cache_hits, ga.cache_misses) == (len(population), 0)
+    for chromosome in population:
+        assert (chromosome.fitness, chromosome.penalty) == scratch_score(chromosome)
+
+
+def test_restarts_draw_prewarmed_candidates(make_ga):
+    def draw(ga):
+        ga.initialize_population()
+        ga._prewarm()
+        assert len(ga._fresh_candidates[True]) + len(ga._fresh_candidates[False]) == ga.prewarm_size
+        return [ga._take_fresh(intelligent) for intelligent in [True, False, True, True]]
+
+    expected = draw(make_ga())
+    fresh = draw(make_ga(workers=2, parallel_initialization=True))
+    assert list(map(schedule, fresh)) == list(map(schedule, expected))
@@ -0,0 +1,84 @@
+import pickle
+from collections import Counter
+
+from algorithm.instrumentation import Instrumentation
+from algorithm.repair import OccupancyGrid, slot_mask
+from models.chromosome import Chromosome
+
+
+class RepairCounts(Instrumentation):
+    def __init__(self):
+        self.counts = Counter()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counts[name] += amount
+
+
+def schedule(chromosome):
+    return [gene.key() for gene in chromosome.genes]
+
+
+def sessions(chromosome):
+    return sorted((gene.section_id, gene.subject_id, gene.session_number) for gene in chromosome.genes)
+
+
+def hard_violations(ga, chromosome):
+    """
+    Violations of every registered hard constraint, those disabled in the fitness included.
+    Repair does not book TBA professors, so their sessions are left out of professor conflicts.
+    """
+    scheduled = Chromosome(chromosome.genes, ga.active_constraints)
+    staffed = Chromosome([gene for gene in chromosome.genes if gene.professor_id != 'TBA'], ga.active_constraints)
+    return {constraint.name: constraint.full(staffed if constraint.name == 'professor_conflicts' else scheduled)
+            for constraint in ga.active_constraints.registered if constraint.hard}
+
+
+def test_repair_removes_every_hard_violation(make_ga, instance):
+    # A few sections, so that most displaced sessions have somewhere to go
+    sections = instance[0]
+    del sections[4:]
+    recorder = RepairCounts()
+    ga = make_ga(instrumentation=recorder)
+    assert 'section_conflicts' in hard_violations(ga, ga.create_random_chromosome())
+
+    for _ in range(20):
+        broken = ga.create_random_chromosome()
+        complete = sessions(broken)
+        del broken.genes[::7]  # Missing sessions are added back
+        assert any(hard_violations(ga, broken).values())
+
+        succeeded = recorder.counts['repair.succeeded']
+        repaired = ga.repair_engine.repair(broken)
+        assert sessions(repaired) == complete
+        if recorder.counts['repair.succeeded'] > succeeded:
+            assert not any(hard_violations(ga, repaired).values())
+    assert recorder.counts['repair.succeeded'] >= 10
+
+
+def test_grid_rejects_overlapping_sessions_of_a_section(make_ga):
+    ga = make_ga()
+    genes = ga.create_random_chromosome().genes
+    gene = genes[0]
+    other = next(other for other in genes if other.section == gene.section and other.subject != gene.subject)
+    other = other.replace(day=gene.day, start_time=gene.start_time + 0.5, room_id=None, professor_id='TBA')
+
+    grid = OccupancyGrid()
+    grid.book(gene, gene.room, gene.day, slot_mask(gene.start_time, gene.duration))
+    assert not grid.is_free(other, 0, other.day, slot_mask(other.start_time, other.duration))
+    later = other.replace(start_time=gene.end_time + 1)
+    assert grid.is_free(later, 0, later.day, slot_mask(later.start_time, later.duration))
+
+
+def test_room_handle_cache_is_not_pickled(make_ga):
+    ga = make_ga(constraint_weights={'section_conflicts': 100})
+    ga.repair_engine.repair(ga.create_random_chromosome())
+    assert ga._suitable_room_handles
+    chromosome = ga.create_random_chromosome()
+    copy = pickle.loads(pickle.dumps(ga))
+    assert copy.active_constraints.weights == ga.active_constraints.weights
+    assert copy.qualified_professors == ga.qualified_professors
+    assert not copy._suitable_room_handles
+
+    # The copy continues exactly as the original
+    assert schedule(copy.repair_engine.repair(chromosome)) == schedule(ga.repair_engine.repair(chromosome))
+    assert schedule(copy.create_random_chromosome()) == schedule(ga.create_random_chromosome())
@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+from models.chromosome import Chromosome
+from sched_to_txt_file import (ScheduleIndex, generate_all_schedule_reports, print_schedule_by_professor_to_file,
+                               print_schedule_by_room_to_file, print_schedule_to_file, write_schedule_reports)
+
+GROUP_HEADERS = ('Section ', 'Professor: ', 'Room: ')
+TRAILING_GROUPS = {'UNASSIGNED CLASSES (TBA)': 'TBA', 'ONLINE CLASSES': 'online'}
+
+
+def clock(hours):
+    return f"{int(hours):02d}:{round(hours % 1 * 60):02d}"
+
+
+def entry(gene):
+    return gene.day.name, f"{clock(gene.start_time)}-{clock(gene.end_time)}", gene.subject_id, gene.section_id
+
+
+def read_view(path):
+    """{group: [(day, time range, subject, section)]} of a report, in the order written"""
+    groups = defaultdict(list)
+    group = None
+    for line in path.read_text().splitlines():
+        if line in TRAILING_GROUPS:
+            group = TRAILING_GROUPS[line]
+        elif line.startswith(GROUP_HEADERS):
+            group = line.split(' ', 1)[1].lstrip(': ').strip()
+        elif line.startswith('  ') and ' | ' in line:
+            fields = [field.strip() for field in line.split(' | ')]
+            day, time_range, subject = fields[0], fields[1], fields[2].split(' (')[0].strip()
+            section = next((field.split(': ')[1] for field in fields if field.startswith('Section: ')), group)
+            groups[group].append((day, time_range, subject, section))
+    return dict(groups)
+
+
+def expected_view(genes, key):
+    groups = defaultdict(list)
+    for gene in sorted(genes, key=lambda gene: (gene.day.value, gene.start_time)):
+        group = key(gene)
+        if group is not None:
+            groups[group].append(entry(gene))
+    return dict(groups)
+
+
+def test_reports_hold_every_view(make_ga, tmp_path):
+    ga = make_ga()
+    chromosome = ga.create_intelligent_chromosome()
+    chromosome.calculate_fitness(None)
+    genes = chromosome.genes
+    write_schedule_reports(chromosome, tmp_path / 'sections.txt', tmp_path / 'professors.txt', tmp_path / 'rooms.txt')
+
+    assert read_view(tmp_path / 'sections.txt') == expected_view(genes, lambda gene: gene.section_id)
+    professors = read_view(tmp_path / 'professors.txt')
+    tba = professors.pop('TBA', [])
+    assert professors == expected_view(genes, lambda gene: gene.professor_id if gene.professor_id != 'TBA' else None)
+    assert sorted(tba) == sorted(entry(gene) for gene in genes if gene.professor_id == 'TBA')
+    rooms = read_view(tmp_path / 'rooms.txt')
+    assert rooms.pop('online', []) == expected_view(genes, lambda gene: None if gene.room_id else 'online').get('online', [])
+    assert rooms == expected_view(genes, lambda gene: gene.room_id or None)
+
+
+def test_penalty_breakdown_matches_the_constraints(make_ga):
+    ga = make_ga()
+    for chromosome in [ga.create_random_chromosome(), ga.create_intelligent_chromosome()]:
+        _, penalty = chromosome.calculate_fitness(None)
+        tracker = chromosome._tracker
+        index = ScheduleIndex(chromosome)
+        assert chromosome._tracker is tracker  # The evaluated counters are reused
+
+        scratch = Chromosome(list(chromosome.genes), chromosome.active)
+        assert index.penalty_breakdown == {constraint.name: constraint.weight * constraint.full(scratch)
+                                           for constraint in chromosome.active.constraints}
+        assert index.total_penalty == penalty
+
+
+def test_single_reports_match_the_combined_writer(make_ga, tmp_path):
+    chromosome = make_ga().create_intelligent_chromosome()
+    index = ScheduleIndex(chromosome)
+    print_schedule_to_file(chromosome, tmp_path / 'sections.txt', index)
+    print_schedule_by_professor_to_file(chromosome, tmp_path / 'professors.txt', index)
+    print_schedule_by_room_to_file(chromosome, tmp_path / 'rooms.txt', index)
+
+    generate_all_schedule_reports(chromosome, str(tmp_path / 'all'))
+    for view, single in (('section', 'sections'), ('professor', 'professors'), ('room', 'rooms')):
+        combined = (tmp_path / f'all_by_{view}.txt').read_text().splitlines()
+        expected = (tmp_path / f'{single}.txt').read_text().splitlines()
+        # Only the timestamps may differ
+        assert [line for line in combined if not line.startswith('Generated on')] == \
+               [line for line in expected if not line.startswith('Generated on')]
+
+
+def test_missing_schedule_is_reported(tmp_path):
+    write_schedule_reports(None, tmp_path / 'sections.txt', tmp_path / 'professors.txt', tmp_path / 'rooms.txt')
+    for name in ('sections.txt', 'professors.txt', 'rooms.txt'):
+        assert (tmp_path / name).read_text() == "No valid schedule found\n"
@@ -0,0 +1,72 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from models import constraints
+from models.chromosome import Chromosome
+from models.vectorized import VECTORIZED_CONSTRAINTS, PopulationArrays, penalty_terms, population_penalties
+
+# Every constraint penalty_terms counts, the optional ones included
+ALL_ENABLED = {'section_conflicts': 100, 'subject_distribution': 30}
+
+
+def schedule(chromosome):
+    return [gene.key() for gene in chromosome.genes]
+
+
+def scratch_score(chromosome):
+    return Chromosome(list(chromosome.genes), chromosome.active).calculate_fitness(None)
+
+
+@pytest.fixture
+def crowded(population):
+    """The population with some genes moved onto the times and rooms of others, or out of hours"""
+    for chromosome in population[:4]:
+        genes = chromosome.genes
+        for index, start_time in enumerate([6.5, 12.5, 21.5, 11.5]):
+            chromosome.update_gene(index + 1, start_time=start_time)
+        for index in range(0, len(genes), 5):
+            chromosome.update_gene(index, day=genes[index * 3 % len(genes)].day,
+                                   start_time=genes[index * 3 % len(genes)].start_time,
+                                   room_id=genes[index * 7 % len(genes)].room_id)
+    return population
+
+
+def test_terms_match_violation_counts(make_ga, crowded):
+    active = constraints.compile_constraints(ALL_ENABLED)
+    assert set(active.weights) == set(VECTORIZED_CONSTRAINTS)
+    terms = penalty_terms(PopulationArrays(make_ga().encoding, crowded), tuple(active.weights))
+    for row, chromosome in enumerate(crowded):
+        counts = Chromosome(chromosome.genes, active).violation_counts()
+        assert {name: int(terms[name][row]) for name in counts} == counts
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+def test_penalties_match_scalar_fitness(make_ga, crowded, chunk_size):
+    active = constraints.compile_constraints({**ALL_ENABLED, 'professor_breaks': 0})
+    penalties = population_penalties(PopulationArrays(make_ga().encoding, crowded), chunk_size, active)
+    assert penalties.tolist() == [Chromosome(c.genes, active).calculate_fitness(None)[1] for c in crowded]
+
+
+def test_algorithm_scores_new_chromosomes_in_batches(make_ga):
+    def run(ga):
+        population = ga.initialize_population()
+        for generation in range(3):
+            ga.evaluate_population(population)
+            population = ga.next_generation(population, generation)
+        ga.evaluate_population(population)
+        return population
+
+    expected = run(make_ga())
+    population = run(make_ga(vectorized_evaluation=True))
+    assert list(map(schedule, population)) == list(map(schedule, expected))
+    assert [(c.fitness, c.penalty) for c in population] == [(c.fitness, c.penalty) for c in expected]
+
+
+def test_vectorized_scores_optional_constraints(make_ga):
+    ga = make_ga(vectorized_evaluation=True, constraint_weights={**ALL_ENABLED, 'professor_breaks': 0})
+    population = ga.initialize_population()
+    ga.evaluate_population(population)
+    for chromosome in population:
+        assert not chromosome.tracked
+        assert (chromosome.fitness, chromosome.penalty) == scratch_score(chromosome)